@@ -1,45 +1,193 @@
+"""
+Tk window for the To-Do app
+
+A thin layer over todo_core: it builds the widgets, keeps the view state
+(saved view, sort column, search text, selection) and turns clicks into
+TodoList calls, then redraws. Timers (debounced search and autosave, the
+journal fsync, the midnight roll-over) run through root.after.
+"""
+import csv
+import sys
 import tkinter as tk
-from tkinter import ttk, messagebox
-from dataclasses import dataclass, field
-from datetime import date, datetime
-
-# ───── data model ───────────────────────────────────────────────
-@dataclass
-class Task:
-    text: str
-    done: bool = False
-    priority: int = 2              # 1=High,2=Med,3=Low
-    due: date | None = None
-    category: str = ""
-    est_min: int = 0               # estimated minutes
-    hard: bool = False              # New: hard vs soft deadline checkbox
-
-    # for Treeview we expose a tuple representation
-    def display(self) -> tuple[str, str, str, str, str]:
-        status = "✅" if self.done else " "
-        due_str = self.due.isoformat() if self.due else ""
-        hard_flag= "H" if self.hard else ""   # flag for hard vs soft deadline
-        return (
-            status,
-            self.text,
-            str(self.priority),
-            due_str,
-            hard_flag,
-            self.category or "",
-        )
+from dataclasses import replace
+from tkinter import ttk, messagebox, filedialog, simpledialog
+from datetime import date, datetime, timedelta
+
+from todo_core import (
+    REPEATS, SAVED_VIEWS, IdView, IndexView, PagedTaskRows, SavedView, Task, TaskAutosave, TaskJournal, TaskStore,
+    TodoList, parse_iso_date
+)
+
+# ───── virtual task list ───────────────────────────────────────
+class VirtualTaskList:
+    """Shows a window of a (possibly huge) task list in a Treeview.
+
+    Only the visible rows plus a few overscan rows exist as Treeview items;
+    scrolling swaps rows in and out, and the scrollbar is driven from the
+    model size instead of the Treeview's own yview.
+
+    The selection is kept by id, so it survives scrolling, but only ids in
+    the current rows are kept. A plain click replaces it; only Ctrl/Shift
+    clicks extend it past the rows on screen. `contains(ids)` says which
+    ids are in the rows; without it the rows are walked.
+    """
+    EXTEND_MASK = 0x0001 | 0x0004  # Shift, Control in a Tk event's state
+
+    def __init__(self, tree: ttk.Treeview, scrollbar: ttk.Scrollbar, tags_for,
+                 visible: int = 14, overscan: int = 4, contains=None):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.tags_for = tags_for
+        self.visible = visible
+        self.overscan = overscan
+        self.rows: list[Task] = []
+        self.top = 0
+        self.shown: dict[str, Task] = {}     # iid -> Task currently materialised
+        self.selected: set[str] = set()      # selected iids, kept while scrolled away
+        self.contains = contains
+        self.extending: bool | None = None   # kind of the click being handled; None = not a click
+
+        scrollbar.configure(command=self.on_scroll)
+        tree.bind("<ButtonPress-1>", self.on_click)
+        tree.bind("<<TreeviewSelect>>", self.on_select)
+        tree.bind("<Control-a>", self.select_all)
+        # "break" keeps the Treeview's own bindings from scrolling its yview into the overscan rows
+        tree.bind("<MouseWheel>", lambda e: self.scroll_event(-1 if e.delta > 0 else 1, "units"))
+        tree.bind("<Button-4>", lambda e: self.scroll_event(-1, "units"))
+        tree.bind("<Button-5>", lambda e: self.scroll_event(1, "units"))
+        tree.bind("<Up>", lambda e: self.scroll_event(-1, "units"))
+        tree.bind("<Down>", lambda e: self.scroll_event(1, "units"))
+        tree.bind("<Prior>", lambda e: self.scroll_event(-1, "pages"))
+        tree.bind("<Next>", lambda e: self.scroll_event(1, "pages"))
+
+    def set_rows(self, rows: list[Task]):
+        """Point the view at a new filtered/sorted list; only the window is drawn"""
+        self.rows = rows
+        if self.selected:
+            self.selected = {str(i) for i in self.ids_in_rows([int(iid) for iid in self.selected])}
+        self.render()
+
+    def ids_in_rows(self, ids: list[int]) -> set[int]:
+        if self.contains is not None:
+            return self.contains(ids)
+        return {t.id for t in self.rows} & set(ids)
+
+    def render(self):
+        n = len(self.rows)
+        self.top = max(0, min(self.top, n - self.visible))
+        window = self.rows[self.top:self.top + self.visible + self.overscan]
+        wanted = {str(t.id): t for t in window}
+
+        for iid in self.tree.get_children():
+            if iid not in wanted:
+                self.tree.delete(iid)
+        for position, (iid, t) in enumerate(wanted.items()):
+            if self.tree.exists(iid):
+                self.tree.move(iid, "", position)
+                self.tree.item(iid, values=t.display(), tags=self.tags_for(t))
+            else:
+                self.tree.insert("", position, iid=iid, values=t.display(), tags=self.tags_for(t))
+        self.shown = wanted
+        self.tree.yview_moveto(0)
+        self.extending = None  # the selection_set below is ours, not a click
+        self.tree.selection_set([iid for iid in self.selected if iid in wanted])
+
+        if n:
+            self.scrollbar.set(self.top / n, min(1.0, (self.top + self.visible) / n))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def refresh_task(self, t: Task):
+        """Redraw one task if it is on screen"""
+        iid = str(t.id)
+        if iid in self.shown:
+            self.tree.item(iid, values=t.display(), tags=self.tags_for(t))
+
+    def retag(self, task_ids):
+        """Update the tags of those tasks that are on screen"""
+        for task_id in task_ids:
+            t = self.shown.get(str(task_id))
+            if t is not None:
+                self.tree.item(str(task_id), tags=self.tags_for(t))
+
+    def scroll_by(self, amount: int, what: str):
+        step = self.visible if what.startswith("page") else 1
+        self.top += int(amount) * step
+        self.render()
+
+    def scroll_event(self, amount: int, what: str) -> str:
+        self.scroll_by(amount, what)
+        return "break"
+
+    def on_scroll(self, action: str, *args):
+        if action == "moveto":
+            self.top = int(float(args[0]) * len(self.rows))
+            self.render()
+        elif action == "scroll":
+            self.scroll_by(int(args[0]), args[1])
+
+    def on_click(self, event):
+        if self.tree.identify_region(event.x, event.y) in ("cell", "tree"):  # not a heading
+            self.extending = bool(event.state & self.EXTEND_MASK)
+
+    def on_select(self, _event=None):
+        current = set(self.tree.selection())
+        if self.extending is False:
+            self.selected = current  # a plain click starts a new selection
+        else:
+            # a Ctrl/Shift click, or our own selection_set after a redraw
+            self.selected = {iid for iid in self.selected if iid not in self.shown} | current
+        self.extending = None
+
+    def selected_ids(self) -> list[int]:
+        """Ids of every selected row in the current rows, on screen or scrolled away"""
+        self.on_select()
+        if not self.selected:
+            return []
+        return sorted(self.ids_in_rows([int(iid) for iid in self.selected]))
+
+    def select_all(self, _event=None):
+        self.selected = {str(t.id) for t in self.rows}
+        self.render()
+        return "break"
+
+
+SEARCH_DELAY_MS = 150  # typing pause before the search box filters
+AUTOSAVE_DELAY_MS = 500  # quiet time after the last edit before autosaving
+IMPORT_ERRORS_SHOWN = 20  # skipped rows listed after an import
+PLAN_DAYS = 14  # days shown in the plan window
+
+
+def format_minutes(minutes: int) -> str:
+    return f"{minutes // 60}h {minutes % 60:02d}m"
 
-root = tk.Tk()
 
 class TodoApp:
-    def __init__(self, root: tk.Tk):
+    def __init__(self, root: tk.Tk, store: TaskStore | None = None,
+                 journal: TaskJournal | None = None, compact: bool = False,
+                 autosave: TaskAutosave | None = None):
         # window
         self.root = root
         self.root.title("Advanced To‑Do")
         self.root.geometry("800x600")
         self.root.resizable(False, False)
 
-        # master list
-        self.tasks: list[Task] = []
+        # the tasks and every operation on them live in the headless model;
+        # with a store they stay in SQLite and are paged in, with a journal
+        # they live in memory and every change is appended to it, with
+        # autosave they live in memory and the whole list is saved when
+        # editing pauses
+        self.model = TodoList(store, journal, autosave, compact)
+        self.model.on_change = self.schedule_autosave
+        self.autosave_after: str | None = None  # pending debounced save
+        self.views: dict[str, SavedView] = dict(SAVED_VIEWS)  # plus any saved this session
+        self.saved_view = self.views["All"]
+        self.sort_column: str | None = None  # a heading click; None keeps the view's own sort
+        self.search_query = ""
+        self.search_after: str | None = None  # pending debounced search
+        self.plan_window: tk.Toplevel | None = None
+        self.dashboard_window: tk.Toplevel | None = None
+        self.dashboard_stamp: tuple | None = None  # model state the dashboard last showed
 
         # ── input pane ──────────────────────────────────────────
         input_frame = tk.LabelFrame(root, text="New Task")
@@ -55,6 +203,12 @@ class TodoApp:
             input_frame, from_=1, to=5, textvariable=self.priority_var, width=3
         ).grid(row=0, column=3, padx=2, pady=2)
 
+        tk.Label(input_frame, text="Repeat").grid(row=0, column=4, sticky="e", padx=2)
+        self.repeat_var = tk.StringVar(value="none")
+        ttk.Combobox(
+            input_frame, textvariable=self.repeat_var, values=["none", *REPEATS[1:]], state="readonly", width=9
+        ).grid(row=0, column=5, padx=2, pady=2)
+
         tk.Label(input_frame, text="Due‑date (YYYY‑MM‑DD)").grid(row=1, column=0, sticky="e", padx=2)
         self.entry_due = tk.Entry(input_frame, width=15)
         self.entry_due.grid(row=1, column=1, sticky="w", padx=1, pady=2)
@@ -88,10 +242,15 @@ class TodoApp:
             self.tree.column(c, width=w, anchor="w")
         self.tree.pack(padx=10, pady=5)
         self.tree.tag_configure("overdue", foreground="red")
+        self.tree.tag_configure("infeasible", background="#ffd6d6")  # hard deadline can't be met
 
-        # add scrollbar
-        ttk.Scrollbar(root, orient="vertical", command=self.tree.yview).place(x=690, y=170, height=255)
-        self.tree.configure(yscrollcommand=lambda f, l: None)  # dummy; scrollbar handles it
+        # add scrollbar; it follows the model, not the Treeview's own rows
+        scrollbar = ttk.Scrollbar(root, orient="vertical")
+        scrollbar.place(x=690, y=170, height=255)
+        self.tree.configure(yscrollcommand=lambda f, l: None)  # the virtual list sets the scrollbar
+        self.view = VirtualTaskList(self.tree, scrollbar, self.row_tags,
+                                    contains=lambda ids: self.model.ids_in_view(
+                                        self.current_view(), self.search_query, ids))
 
         # ── action buttons ─────────────────────────────────────
         btn_frame = tk.Frame(root)
@@ -99,26 +258,128 @@ class TodoApp:
         tk.Button(btn_frame, text="Toggle Complete", command=self.toggle_complete).grid(row=0, column=0, padx=5)
         tk.Button(btn_frame, text="Delete Selected", command=self.delete_task).grid(row=0, column=1, padx=5)
         tk.Button(btn_frame, text="Show Today", command=self.filter_today).grid(row=0, column=2, padx=5)
-        tk.Button(btn_frame, text="Show All", command=self.show_all).grid(row=0, column=3, padx=5)
+        tk.Button(btn_frame, text="Show Category", command=self.filter_category).grid(row=0, column=3, padx=5)
+        tk.Button(btn_frame, text="Show All", command=self.show_all).grid(row=0, column=4, padx=5)
+        tk.Button(btn_frame, text="Set Priority", command=self.set_priority).grid(row=1, column=4, padx=5)
+        tk.Button(btn_frame, text="Set Category", command=self.set_category).grid(row=1, column=5, padx=5)
+        tk.Button(btn_frame, text="Set Repeat", command=self.set_repeat).grid(row=1, column=6, padx=5)
+        tk.Button(btn_frame, text="Plan Days", command=self.show_plan).grid(row=0, column=5, padx=5)
+        tk.Button(btn_frame, text="Dashboard", command=self.show_dashboard).grid(row=0, column=6, padx=5)
+        tk.Button(btn_frame, text="Import…", command=self.import_tasks).grid(row=2, column=4, padx=5)
+        tk.Button(btn_frame, text="Export…", command=self.export_tasks).grid(row=2, column=5, padx=5)
+
+        # ── saved views ───────────────────────────────────────
+        tk.Label(btn_frame, text="View").grid(row=2, column=0, sticky="e", padx=5)
+        self.view_var = tk.StringVar(value=self.saved_view.name)
+        self.view_box = ttk.Combobox(btn_frame, textvariable=self.view_var, values=list(self.views),
+                                     state="readonly", width=24)
+        self.view_box.grid(row=2, column=1, columnspan=2, sticky="w")
+        self.view_box.bind("<<ComboboxSelected>>", lambda e: self.show_view(self.view_var.get()))
+        tk.Button(btn_frame, text="Save View…", command=self.save_view).grid(row=2, column=3, padx=5)
+
+        # ── search box, filters as you type ───────────────────
+        tk.Label(btn_frame, text="Search").grid(row=1, column=0, sticky="e", padx=5, pady=5)
+        self.search_var = tk.StringVar()
+        tk.Entry(btn_frame, textvariable=self.search_var, width=40).grid(
+            row=1, column=1, columnspan=3, sticky="w", pady=5)
+        self.search_var.trace_add("write", lambda *_: self.schedule_search())
+
+        self.model.load()
+        self.refresh_tree()
+        if autosave is not None:
+            self.root.protocol("WM_DELETE_WINDOW", self.close)
+        if journal is not None:
+            self.sync_journal()
+        self.schedule_day_roll()
 
     # ── helpers ───────────────────────────────────────────────
     def parse_due(self, s: str) -> date | None:
         if not s:
             return None
         try:
-            return datetime.strptime(s, "%Y-%m-%d").date()
+            return parse_iso_date(s)
         except ValueError:
             messagebox.showwarning("Date format", "Use YYYY‑MM‑DD")
             return None
 
-    def refresh_tree(self, rows: list[Task] | None = None):
-        self.tree.delete(*self.tree.get_children())
-        now = datetime.now().date()
-        for t in (rows if rows is not None else self.tasks):
-            tags = []
-            if t.due and t.due < now and not t.done:
-                tags.append("overdue")
-            self.tree.insert("", "end", values=t.display(), tags=tags)
+    def repeat_rule(self) -> str:
+        repeat = self.repeat_var.get()
+        return "" if repeat == "none" else repeat
+
+    def row_tags(self, t: Task) -> list[str]:
+        tags = ["overdue"] if self.model.is_overdue(t) else []
+        if t.id in self.model.planner.infeasible:
+            tags.append("infeasible")
+        return tags
+
+    def current_view(self) -> SavedView:
+        if self.sort_column is None:
+            return self.saved_view
+        return self.saved_view.sorted_by(self.sort_column)
+
+    def view_rows(self) -> IndexView | IdView | PagedTaskRows:
+        """Tasks in the current view, in its sort order; memoized by the model"""
+        return self.model.view_rows(self.current_view(), self.search_query)
+
+    def set_tasks(self, tasks):
+        """Replace all tasks, e.g. after loading"""
+        self.model.set_tasks(tasks)
+        self.refresh_tree()
+
+    def refresh_tree(self, rows: list[Task] | IndexView | IdView | PagedTaskRows | None = None):
+        """Point the view at a new list; only the visible window is drawn"""
+        if self.model.planner.dirty:
+            self.model.planner.refresh()  # row tags read its infeasible set
+        self.view.set_rows(rows if rows is not None else self.view_rows())
+        if self.dashboard_window is not None and self.dashboard_window.winfo_exists():
+            self.fill_dashboard()
+
+    def sync_journal(self):
+        """fsync journal records written since the last batch, once a second"""
+        self.model.journal.sync()
+        self.root.after(1000, self.sync_journal)
+
+    def schedule_day_roll(self):
+        """One timer, due just after the next midnight"""
+        now = datetime.now()
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        self.root.after(int((midnight - now).total_seconds() * 1000) + 1000, self.roll_day)
+
+    def roll_day(self):
+        """A new day: re-tag only the tasks that just became overdue"""
+        today = date.today()
+        if today != self.model.today:
+            infeasible = set(self.model.planner.infeasible)
+            newly = self.model.roll_day(today)
+            if self.model.store is not None or self.saved_view.dated:
+                self.refresh_tree()  # a view by due date, or store rows tagged by date
+            else:
+                self.model.planner.refresh()  # a day less can make hard deadlines infeasible
+                self.view.retag(infeasible.symmetric_difference(self.model.planner.infeasible).union(newly))
+        self.schedule_day_roll()
+
+    def schedule_autosave(self):
+        """Save once edits pause; the file itself is written off the Tk thread"""
+        if self.model.autosave is None:
+            return
+        if self.autosave_after is not None:
+            self.root.after_cancel(self.autosave_after)
+        self.autosave_after = self.root.after(AUTOSAVE_DELAY_MS, self.apply_autosave)
+
+    def apply_autosave(self):
+        self.autosave_after = None
+        autosave = self.model.autosave
+        if autosave.error is not None:
+            error, autosave.error = autosave.error, None
+            messagebox.showwarning("Autosave", f"Saving {autosave.path} failed: {error}")
+        autosave.save(self.model.snapshot())
+
+    def close(self):
+        """Window closed: hand over any waiting save before the window goes"""
+        if self.autosave_after is not None:
+            self.root.after_cancel(self.autosave_after)
+            self.apply_autosave()
+        self.root.destroy()
 
     # ── CRUD ops ──────────────────────────────────────────────
     def add_task(self):
@@ -133,16 +394,21 @@ class TodoApp:
         except ValueError:
             messagebox.showwarning("Est. minutes", "Estimated minutes must be a number")
             return
+        repeat = self.repeat_rule()
+        if repeat and due is None:
+            messagebox.showwarning("Repeat", "A repeating task needs a due date for its first occurrence")
+            return
         task = Task(
             text=text,
             priority=self.priority_var.get(),
             due=due,
             category=self.entry_cat.get().strip(),
             est_min=est,
-            hard=self.hard_var.get()
+            hard=self.hard_var.get(),
+            repeat=repeat,
         )
-        self.tasks.append(task)
-        self.refresh_tree()
+        self.model.add(task)
+        self.refresh_tree()  # the new row may land anywhere in the sort order
 
         # clear inputs
         self.entry_text.delete(0, tk.END)
@@ -151,47 +417,266 @@ class TodoApp:
         self.entry_est.delete(0, tk.END)
         self.priority_var.set(2)
         self.hard_var.set(False)
+        self.repeat_var.set("none")
 
-    def current_index(self) -> int | None:
-        sel = self.tree.selection()
-        if not sel:
-            return None
-        return self.tree.index(sel[0])
+    def selected_tasks(self) -> list[Task]:
+        """Every selected task, including rows scrolled out of the window"""
+        return self.model.get_many(self.view.selected_ids())
+
+    def change_selected(self, change):
+        """Apply `change` to every selected task, save them as one batch, redraw once"""
+        selected = self.selected_tasks()
+        if not selected:
+            return
+        for task in selected:
+            change(task)
+        self.model.update_many(selected)
+        self.refresh_tree()  # rows may move under the current sort or filter
 
     def toggle_complete(self):
-        idx = self.current_index()
-        if idx is None:
+        """Completing a recurring task records the occurrence and moves the series on"""
+        selected = self.selected_tasks()
+        if not selected:
             return
-        self.tasks[idx].done = not self.tasks[idx].done
+        self.model.toggle_many(selected)
         self.refresh_tree()
 
+    def set_priority(self):
+        """Give every selected task the priority in the spinbox"""
+        priority = self.priority_var.get()
+        self.change_selected(lambda task: setattr(task, "priority", priority))
+
+    def set_category(self):
+        """Move every selected task to the category typed in the Category box"""
+        category = self.entry_cat.get().strip()
+        self.change_selected(lambda task: setattr(task, "category", category))
+
+    def set_repeat(self):
+        """Give every selected task with a due date the rule in the Repeat box"""
+        repeat = self.repeat_rule()
+        skipped = []
+
+        def change(task: Task):
+            if repeat and task.due is None:
+                skipped.append(task)
+            else:
+                task.repeat = repeat
+        self.change_selected(change)
+        if skipped:
+            messagebox.showwarning("Repeat", f"{len(skipped)} task(s) without a due date were left as they are")
+
     def delete_task(self):
-        idx = self.current_index()
-        if idx is None:
+        selected = self.selected_tasks()
+        if not selected:
             return
-        del self.tasks[idx]
+        self.model.delete_many(selected)
+        self.view.selected.clear()
         self.refresh_tree()
 
+    # ── import & export ───────────────────────────────────────
+    def import_tasks(self):
+        path = filedialog.askopenfilename(
+            title="Import tasks", filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl *.json"), ("All", "*")])
+        if not path:
+            return
+        try:
+            count, errors = self.model.import_file(path)
+        except (OSError, ValueError, csv.Error) as e:
+            messagebox.showerror("Import", f"Could not import {path}: {e}")
+            return
+        if count:
+            self.refresh_tree()
+        message = f"Imported {count} task(s)."
+        if errors:
+            shown = "\n".join(errors[:IMPORT_ERRORS_SHOWN])
+            more = f"\n… and {len(errors) - IMPORT_ERRORS_SHOWN} more" if len(errors) > IMPORT_ERRORS_SHOWN else ""
+            message += f"\n{len(errors)} row(s) skipped:\n{shown}{more}"
+        messagebox.showinfo("Import", message)
+
+    def export_tasks(self):
+        path = filedialog.asksaveasfilename(
+            title="Export tasks", defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl")])
+        if not path:
+            return
+        try:
+            count = self.model.export_file(path)
+        except OSError as e:
+            messagebox.showerror("Export", f"Could not export to {path}: {e}")
+            return
+        messagebox.showinfo("Export", f"Exported {count} task(s) to {path}.")
+
     # ── filtering & sorting ──────────────────────────────────
+    def show_view(self, name: str):
+        """Switch to a saved view; an unchanged one comes straight from the model's memo"""
+        self.saved_view = self.views[name]
+        self.sort_column = None
+        self.view_var.set(name)
+        self.refresh_tree()
+
+    def save_view(self):
+        """Keep the current filter and sort under a name for this session"""
+        name = simpledialog.askstring("Save view", "Name for this view:", parent=self.root)
+        if not name or not name.strip():
+            return
+        name = name.strip()
+        self.views[name] = replace(self.current_view(), name=name)
+        self.view_box.configure(values=list(self.views))
+        self.show_view(name)
+
     def filter_today(self):
-        today = date.today()
-        self.refresh_tree([t for t in self.tasks if t.due == today])
+        self.show_view("Today")
 
-    def show_all(self):
+    def filter_category(self):
+        """Narrow the current view to the category typed in the Category box"""
+        category = self.entry_cat.get().strip()
+        self.saved_view = replace(self.saved_view, category=category or None)
         self.refresh_tree()
 
+    def schedule_search(self):
+        """Wait until typing pauses before filtering"""
+        if self.search_after is not None:
+            self.root.after_cancel(self.search_after)
+        self.search_after = self.root.after(SEARCH_DELAY_MS, self.apply_search)
+
+    def apply_search(self):
+        self.search_after = None
+        self.search_query = self.search_var.get().strip()
+        self.refresh_tree()
+
+    def show_all(self):
+        if self.search_var.get():
+            self.search_var.set("")  # the debounced search then shows everything
+        self.search_query = ""
+        self.show_view("All")
+
     def sort_by(self, column_name: str):
-        key_funcs = {
-            "Status": lambda t: t.done,
-            "Task": lambda t: t.text.lower(),
-            "Pr": lambda t: t.priority,
-            "Due": lambda t: t.due or date.max,
-            "Hard": lambda t: not t.hard,
-            "Cat": lambda t: t.category.lower(),
-        }
-        self.tasks.sort(key=key_funcs[column_name])
+        # unfiltered, a view over the column's index (or the store's); else a memoized sort
+        self.sort_column = column_name
         self.refresh_tree()
 
+    # ── day plan ──────────────────────────────────────────────
+    def show_plan(self):
+        """Window with the next PLAN_DAYS days of work"""
+        if self.plan_window is not None and self.plan_window.winfo_exists():
+            self.plan_window.lift()
+            self.fill_plan()
+            return
+        window = self.plan_window = tk.Toplevel(self.root)
+        window.title("Plan")
+        top = tk.Frame(window)
+        top.pack(fill="x", padx=10, pady=5)
+        tk.Label(top, text="Minutes per day").pack(side="left")
+        self.capacity_var = tk.IntVar(value=self.model.planner.capacity)
+        tk.Spinbox(top, from_=30, to=1440, increment=30, textvariable=self.capacity_var,
+                   width=5).pack(side="left", padx=5)
+        tk.Button(top, text="Re-plan", command=self.fill_plan).pack(side="left", padx=5)
+        self.plan_summary = tk.Label(window, anchor="w")
+        self.plan_summary.pack(fill="x", padx=10)
+        self.plan_tree = ttk.Treeview(window, columns=("Min", "Note"), height=20)
+        self.plan_tree.heading("#0", text="Day / Task")
+        self.plan_tree.heading("Min", text="Min")
+        self.plan_tree.heading("Note", text="Note")
+        self.plan_tree.column("#0", width=300)
+        self.plan_tree.column("Min", width=50, anchor="e")
+        self.plan_tree.column("Note", width=180)
+        self.plan_tree.pack(padx=10, pady=5, fill="both", expand=True)
+        self.plan_tree.tag_configure("infeasible", background="#ffd6d6")
+        self.fill_plan()
+
+    def fill_plan(self):
+        planner = self.model.load_plan()
+        try:
+            planner.set_capacity(max(int(self.capacity_var.get()), 1))
+        except (tk.TclError, ValueError):
+            self.capacity_var.set(planner.capacity)
+        days = [planner.day_plan(day) for day in range(PLAN_DAYS)]
+        ids = {task_id for plan in days for task_id, _ in plan}
+        tasks = {t.id: t for t in self.model.get_many(ids)}
+
+        tree = self.plan_tree
+        tree.delete(*tree.get_children())
+        for day, plan in enumerate(days):
+            when = planner.start + timedelta(days=day)
+            parent = tree.insert("", "end", text=when.strftime("%a %Y-%m-%d"), open=day < 3,
+                                 values=(sum(minutes for _, minutes in plan), ""))
+            for task_id, minutes in plan:
+                t = tasks[task_id]
+                if task_id in planner.infeasible:
+                    note, tags = "misses hard deadline", ("infeasible",)
+                elif task_id in planner.hard:
+                    note, tags = f"hard, due {t.due}", ()
+                elif t.due is not None and when > t.due:
+                    note, tags = f"{(when - t.due).days} day(s) late", ()
+                else:
+                    note, tags = "", ()
+                tree.insert(parent, "end", text=t.text, values=(minutes, note), tags=tags)
+        self.plan_summary.config(
+            text=f"{len(planner.infeasible)} hard deadline(s) can't be met · "
+                 f"lateness penalty {planner.penalty()}")
+        self.refresh_tree()  # infeasible rows are highlighted in the main list too
+
+    # ── dashboard ─────────────────────────────────────────────
+    def show_dashboard(self):
+        """Window with estimated open minutes per category and due date; kept live by refresh_tree"""
+        if self.dashboard_window is not None and self.dashboard_window.winfo_exists():
+            self.dashboard_window.lift()
+            return
+        window = self.dashboard_window = tk.Toplevel(self.root)
+        window.title("Dashboard")
+        self.dashboard_summary = tk.Label(window, anchor="w")
+        self.dashboard_summary.pack(fill="x", padx=10, pady=5)
+        panes = tk.Frame(window)
+        panes.pack(fill="both", expand=True, padx=10, pady=5)
+        self.dashboard_trees = {}
+        for name in ("Category", "Due"):
+            tree = ttk.Treeview(panes, columns=(name, "Time"), show="headings", height=16)
+            tree.heading(name, text=name)
+            tree.heading("Time", text="Estimated")
+            tree.column(name, width=140)
+            tree.column("Time", width=90, anchor="e")
+            tree.pack(side="left", fill="both", expand=True, padx=5)
+            self.dashboard_trees[name] = tree
+        self.dashboard_trees["Due"].tag_configure("overdue", foreground="red")
+        self.dashboard_stamp = None
+        self.fill_dashboard()
+
+    def fill_dashboard(self):
+        # the totals are running sums, but a store re-queries them; skip redraws when nothing changed
+        stamp = (self.model.changes, self.model.today)
+        if stamp == self.dashboard_stamp:
+            return
+        self.dashboard_stamp = stamp
+        rollup = self.model.estimates()
+        self.dashboard_summary.config(
+            text=f"Overdue {format_minutes(rollup.overdue)} · on track {format_minutes(rollup.on_track)}")
+        tree = self.dashboard_trees["Category"]
+        tree.delete(*tree.get_children())
+        for category, minutes in sorted(rollup.by_category.items()):
+            tree.insert("", "end", values=(category or "(none)", format_minutes(minutes)))
+        tree = self.dashboard_trees["Due"]
+        tree.delete(*tree.get_children())
+        for due, minutes in sorted(rollup.by_due.items(), key=lambda item: item[0] or date.max):
+            tags = ("overdue",) if due is not None and due < self.model.today else ()
+            tree.insert("", "end", values=(due.isoformat() if due else "(no date)", format_minutes(minutes)),
+                        tags=tags)
+
 # ───── start app ──────────────────────────────────────────────
-app = TodoApp(root)
-root.mainloop()
+if __name__ == "__main__":
+    # My_to_do_list_app.py [tasks.db]  or  My_to_do_list_app.py --journal [--compact] [tasks.journal]
+    #                                   or  My_to_do_list_app.py --autosave [--compact] [tasks.json]
+    root = tk.Tk()
+    args = sys.argv[1:]
+    compact = "--compact" in args
+    args = [arg for arg in args if arg != "--compact"]
+    if args[:1] == ["--journal"]:
+        backend = TaskJournal(args[1] if len(args) > 1 else "tasks.journal")
+        app = TodoApp(root, journal=backend, compact=compact)
+    elif args[:1] == ["--autosave"]:
+        backend = TaskAutosave(args[1] if len(args) > 1 else "tasks.json")
+        app = TodoApp(root, compact=compact, autosave=backend)
+    else:
+        backend = TaskStore(args[0] if args else "tasks.db")
+        app = TodoApp(root, backend)
+    root.mainloop()
+    backend.close()
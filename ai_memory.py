@@ -0,0 +1,173 @@
+"""
+Per-AI conversation memory for WHOMPUS HUNT 2.0
+
+Each AI keeps its last few question/answer turns in a ring buffer. When a
+turn falls out of the buffer it is compacted into short facts ("said trap
+at (3,4)"), and only the newest facts are kept. The memory section of a
+prompt therefore stays the same size however long the game runs.
+build_ai_prompt puts the memory section into the prompt the game sends.
+
+    python ai_memory.py    # prompt size and call latency over 200 questions
+"""
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional, Tuple
+import re
+import time
+
+from ai_resilience import ResilientCaller
+
+ROOM_PATTERN = re.compile(r'\((\d)\s*,\s*(\d)')
+SENTENCE_PATTERN = re.compile(r'[^.!?\n]+')
+
+
+def _claim(sentence: str) -> Optional[str]:
+    """What a sentence says about the rooms it mentions"""
+    lowered = sentence.lower()
+    if 'whompus' in lowered:
+        return 'whompus'
+    if any(word in lowered for word in ('no trap', 'safe', 'clear')):
+        return 'safe'
+    if any(word in lowered for word in ('trap', 'danger', 'pit', 'hole')):
+        return 'trap'
+    return None
+
+
+class ConversationMemory:
+    """Bounded memory of what one AI has been asked and has said"""
+    def __init__(self, ai_name: str, max_turns: int = 4, max_facts: int = 10,
+                 max_answer_chars: int = 240):
+        self.ai_name = ai_name
+        self.max_turns = max_turns
+        self.max_facts = max_facts
+        self.max_answer_chars = max_answer_chars
+        self.turns = deque(maxlen=max_turns)
+        # fact key -> fact text, oldest first
+        self.facts: 'OrderedDict[str, str]' = OrderedDict()
+
+    def remember(self, question: str, answer: str, player_position: Tuple[int, int], move: int):
+        """Add a turn, compacting the oldest one into facts if the buffer is full"""
+        if len(self.turns) == self.max_turns:
+            self._compact(self.turns[0])
+        self.turns.append((move, player_position, question.strip(), answer.strip()))
+
+    def _compact(self, turn):
+        """Turn a question/answer pair into at most a few short facts"""
+        move, (row, col), question, answer = turn
+        for sentence in SENTENCE_PATTERN.findall(answer):
+            claim = _claim(sentence)
+            if claim is None:
+                continue
+            rooms = ROOM_PATTERN.findall(sentence)
+            if rooms:
+                for room_row, room_col in rooms:
+                    self._add_fact(f"{room_row},{room_col}", f"move {move}: said ({room_row},{room_col}) is {claim}")
+            else:
+                self._add_fact(f"near {row},{col}", f"move {move}: said rooms next to ({row},{col}) are {claim}")
+
+    def _add_fact(self, key: str, text: str):
+        # Newer claims about the same room replace older ones
+        self.facts.pop(key, None)
+        self.facts[key] = text
+        while len(self.facts) > self.max_facts:
+            self.facts.popitem(last=False)
+
+    def render(self) -> str:
+        """The memory section of a prompt; its size is bounded by the limits above"""
+        lines = []
+        if self.facts:
+            lines.append(f"Things {self.ai_name} said earlier:")
+            lines.extend(f"- {fact}" for fact in self.facts.values())
+        if self.turns:
+            lines.append("Most recent conversation:")
+            for move, position, question, answer in self.turns:
+                lines.append(f"[move {move}, player at {position}] Q: {question[:self.max_answer_chars]}")
+                lines.append(f"A: {answer[:self.max_answer_chars]}")
+        return "\n".join(lines)
+
+
+def create_ai_memories(ai_names=('ALI', 'AN', 'ALE')) -> Dict[str, ConversationMemory]:
+    """One memory per AI, for a new game"""
+    return {name: ConversationMemory(name) for name in ai_names}
+
+
+AI_ROLE_INSTRUCTIONS = {
+    'truth': "You always tell the truth about the rooms next to the player.",
+    'villain': "You always lie about the rooms next to the player, but never admit it.",
+    'fifty': "You randomly tell the truth or lie about the rooms next to the player."
+}
+
+
+def build_ai_prompt(ai_name: str, ai_role: str, question: str, adjacent_rooms: List[str],
+                    memory: Optional[ConversationMemory] = None) -> str:
+    """Build the prompt for one question; the memory section has a fixed maximum size"""
+    lines = [
+        f"You are {ai_name}, one of three AIs in a dark lab helping (or not) a player hide from the WHOMPUS.",
+        AI_ROLE_INSTRUCTIONS.get(ai_role, ""),
+        "Stay consistent with what you said before. Answer in character in two or three sentences.",
+        f"Rooms next to the player as (row,col,status): {', '.join(adjacent_rooms)}"
+    ]
+    if memory is not None:
+        history = memory.render()
+        if history:
+            lines.append(history)
+    lines.append(f"The player asks: {question}")
+    return "\n".join(lines)
+
+
+class SimulatedBackend:
+    """Stand-in for call_gpt whose latency grows with the prompt, like a real model reading it"""
+    def __init__(self, base_seconds: float = 0.002, seconds_per_char: float = 2e-6):
+        self.base_seconds = base_seconds
+        self.seconds_per_char = seconds_per_char
+
+    def __call__(self, prompt: str) -> str:
+        time.sleep(self.base_seconds + self.seconds_per_char * len(prompt))
+        row, col = len(prompt) % 10, len(prompt) // 10 % 10
+        return (f"*adjusts robes* There is a trap in room ({row},{col}). "
+                f"Room ({(row + 1) % 10},{col}) is safe. The Whompus is far away.")
+
+
+def measure_prompt_growth(questions: int = 200,
+                          memory: Optional[ConversationMemory] = None) -> List[Tuple[int, int, float]]:
+    """
+    Simulate a long session against one AI and return
+    (question number, prompt characters, milliseconds for the round trip)
+
+    Each prompt is built by build_ai_prompt, as in the game, and goes
+    through ResilientCaller to a SimulatedBackend the way the game asks
+    call_gpt, so the latency includes the prompt's cost.
+    """
+    memory = memory or ConversationMemory('ALI')
+    caller = ResilientCaller(SimulatedBackend(), timeout=5.0)
+    results = []
+    for number in range(1, questions + 1):
+        row, col = number % 10, (number * 3) % 10
+        question = f"Is there a trap next to me at ({row},{col})? Where is the Whompus?"
+        neighbours = ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1))
+        adjacent_rooms = [f"({r},{c},empty)" for r, c in neighbours if 0 <= r < 10 and 0 <= c < 10]
+        started = time.perf_counter()
+        prompt = build_ai_prompt(memory.ai_name, 'truth', question, adjacent_rooms, memory)
+        answer = caller(prompt)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        results.append((number, len(prompt), elapsed_ms))
+        memory.remember(question, answer, (row, col), number)
+    return results
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+if __name__ == '__main__':
+    questions = 200
+    for label, memory in (("bounded memory", ConversationMemory('ALI')),
+                          ("whole history", ConversationMemory('ALI', max_turns=questions))):
+        results = measure_prompt_growth(questions, memory)
+        print(f"{label}:")
+        for first in range(0, questions, 50):
+            window = results[first:first + 50]
+            latencies = [elapsed_ms for _, _, elapsed_ms in window]
+            print(f"  questions {first + 1:>3}-{first + len(window):<3}"
+                  f"  prompt up to {max(size for _, size, _ in window):>6} chars"
+                  f"  p50 {_percentile(latencies, 0.5):6.2f} ms  p95 {_percentile(latencies, 0.95):6.2f} ms")
@@ -0,0 +1,147 @@
+"""
+Timeouts, retries and a circuit breaker around the AI backend
+
+ResilientCaller wraps a function like call_gpt. Every attempt gets a
+deadline, failed attempts are retried a bounded number of times with
+jittered backoff, and after repeated failures the circuit breaker opens so
+callers go straight to their local fallback. While open, one probe call is
+let through every `reset_timeout` seconds to see if the backend is back.
+
+    python -m pytest tests/test_ai_resilience.py   # against a flaky fake backend
+"""
+from typing import Callable, Dict, Optional
+import random
+import threading
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the backend while the circuit is open"""
+
+
+class AICallTimeout(TimeoutError):
+    """Raised when one attempt takes longer than its deadline"""
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` failures in a row and probes after `reset_timeout` seconds"""
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.lock = threading.Lock()
+        self.counters = {
+            'closed_calls': 0,        # calls allowed while closed
+            'open_rejections': 0,     # calls refused while open
+            'half_open_probes': 0,    # probe calls while half open
+            'times_opened': 0,
+            'times_closed': 0
+        }
+
+    def allow(self) -> bool:
+        """Whether a call may go to the backend right now"""
+        with self.lock:
+            if self.state == OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+            if self.state == CLOSED:
+                self.counters['closed_calls'] += 1
+                return True
+            if self.state == HALF_OPEN and not self.probe_in_flight:
+                self.probe_in_flight = True
+                self.counters['half_open_probes'] += 1
+                return True
+            self.counters['open_rejections'] += 1
+            return False
+
+    def record_success(self):
+        with self.lock:
+            if self.state != CLOSED:
+                self.counters['times_closed'] += 1
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self.probe_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.counters['times_opened'] += 1
+                self.state = OPEN
+                self.opened_at = self.clock()
+            self.probe_in_flight = False
+
+
+class ResilientCaller:
+    """Call `backend(prompt)` with a deadline, bounded retries and a circuit breaker"""
+    def __init__(self, backend: Callable[[str], str], timeout: float = 15.0, retries: int = 2,
+                 base_delay: float = 0.5, max_delay: float = 4.0,
+                 breaker: Optional[CircuitBreaker] = None, rng=random,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.backend = backend
+        self.timeout = timeout
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker or CircuitBreaker()
+        self.rng = rng
+        self.sleep = sleep
+        self.counters = {'calls': 0, 'successes': 0, 'failures': 0, 'timeouts': 0, 'retries': 0}
+
+    def _call_with_deadline(self, prompt: str) -> str:
+        """Run one attempt on a daemon thread so a hung call can't block the game"""
+        result = {}
+
+        def attempt():
+            try:
+                result['value'] = self.backend(prompt)
+            except Exception as e:
+                result['error'] = e
+
+        worker = threading.Thread(target=attempt, daemon=True)
+        worker.start()
+        worker.join(self.timeout)
+        if worker.is_alive():
+            self.counters['timeouts'] += 1
+            raise AICallTimeout(f"AI backend took longer than {self.timeout}s")
+        if 'error' in result:
+            raise result['error']
+        return result['value']
+
+    def backoff(self, attempt: int) -> float:
+        """Full jitter: a random delay up to base_delay * 2**attempt, capped at max_delay"""
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def __call__(self, prompt: str) -> str:
+        self.counters['calls'] += 1
+        if not self.breaker.allow():
+            self.counters['failures'] += 1
+            raise CircuitOpenError("AI backend circuit is open")
+        for attempt in range(self.retries + 1):
+            try:
+                response = self._call_with_deadline(prompt)
+            except Exception:
+                self.breaker.record_failure()
+                # a failed probe, or the failure that opened the circuit, ends the retries
+                if attempt == self.retries or self.breaker.state != CLOSED:
+                    self.counters['failures'] += 1
+                    raise
+                self.counters['retries'] += 1
+                self.sleep(self.backoff(attempt))
+                continue
+            self.breaker.record_success()
+            self.counters['successes'] += 1
+            return response
+
+    def stats(self) -> Dict[str, object]:
+        """Current breaker state plus every counter"""
+        return {'state': self.breaker.state, **self.counters, **self.breaker.counters}
@@ -0,0 +1,20 @@
+"""
+Timing helpers shared by the benchmark scripts, which run from the
+repository root with benchmarks/ first on sys.path.
+"""
+import time
+
+
+def per_op(fn, repeat: int = 1) -> float:
+    """ms per call of fn, averaged over `repeat` calls"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def timed(label: str, fn, repeat: int = 20) -> float:
+    """Print and return the ms per call of fn"""
+    ms = per_op(fn, repeat)
+    print(f"{label:<28} {ms:8.3f} ms")
+    return ms
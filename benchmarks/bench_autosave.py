@@ -0,0 +1,96 @@
+"""
+Time autosaving a large task list: what a save on the Tk thread would
+stall, the snapshot the Tk thread still takes, how long simulated UI frames
+take while the background worker writes, and how many writes a burst of
+saves costs. Runs without a display.
+
+Run from the repository root:
+    python benchmarks/bench_autosave.py 200000
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from todo_core import Task, TaskAutosave, TodoList
+
+
+def frame(tasks: list[Task]):
+    """Roughly what one redraw does: build the visible rows' values"""
+    return [t.display() for t in tasks]
+
+
+def frame_times(tasks: list[Task], seconds: float) -> list[float]:
+    times = []
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        frame(tasks)
+        times.append((time.perf_counter() - start) * 1000)
+        time.sleep(0.004)
+    return times
+
+
+def report(label: str, times: list[float]):
+    times = sorted(times)
+    print(f"{label:<34} median {statistics.median(times):6.2f} ms"
+          f"  p99 {times[int(len(times) * 0.99)]:6.2f} ms  max {times[-1]:6.2f} ms")
+
+
+def main(n: int):
+    rng = random.Random(4)
+    today = date.today()
+    tasks = {
+        i: Task(text=f"task {i} {rng.random():.6f}", priority=rng.randint(1, 5),
+                due=today + timedelta(days=rng.randint(-5, 60)) if i % 3 else None,
+                category=f"cat{i % 9}", est_min=i % 120, hard=i % 7 == 0, id=i)
+        for i in range(1, n + 1)
+    }
+    visible = list(tasks.values())[:40]
+    path = os.path.join(tempfile.mkdtemp(), "tasks.json")
+    saver = TaskAutosave(path)
+
+    start = time.perf_counter()
+    saver._write(tasks)
+    blocking = time.perf_counter() - start
+    print(f"{f'save on the Tk thread, {n} tasks':<34} {blocking * 1000:8.1f} ms"
+          f"  ({os.path.getsize(path) / 1e6:.1f} MB)")
+    for label, compact in (("dict", False), ("compact", True)):
+        todo = TodoList(autosave=saver, compact=compact)
+        todo.set_tasks(tasks.values())
+        todo.saved = None  # time the full copy set_tasks made while loading
+        start = time.perf_counter()
+        todo.snapshot()
+        first = time.perf_counter() - start
+        edited = [todo.tasks[i] for i in rng.sample(range(1, n + 1), min(100, n))]
+        for t in edited:
+            t.done = True
+        todo.update_many(edited)
+        start = time.perf_counter()
+        todo.snapshot()
+        print(f"{f'snapshot, {label}':<34} {first * 1000:8.1f} ms at load"
+              f"  {(time.perf_counter() - start) * 1000:6.1f} ms after 100 edits")
+
+    report("frames, idle", frame_times(visible, min(blocking, 2.0)))
+    writes = saver.writes
+    saver.save(tasks.copy())
+    busy = []
+    while saver.writes == writes:
+        busy += frame_times(visible, 0.05)
+    report("frames, while the worker writes", busy)
+
+    writes = saver.writes
+    for _ in range(100):
+        saver.save(tasks.copy())
+        time.sleep(0.001)
+    saver.close()
+    print(f"{'100 saves in a burst':<34} {saver.writes - writes:8d} writes")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
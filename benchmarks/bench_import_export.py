@@ -0,0 +1,80 @@
+"""
+Time streaming export and import of a large task file, CSV and JSON Lines,
+into the in-memory index and into the SQLite store, in rows per minute.
+Also compares the import date parsing with datetime.strptime. Runs without
+a display.
+
+Run from the repository root:
+    python benchmarks/bench_import_export.py 1000000
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from todo_core import Task, TaskIndex, TaskStore, parse_iso_date, read_task_file, write_task_file
+
+
+def rate(label: str, rows: int, seconds: float):
+    print(f"{label:<30} {seconds:7.2f} s  {rows / seconds * 60 / 1e6:6.2f} M rows/min")
+
+
+def main(n: int):
+    rng = random.Random(5)
+    today = date.today()
+    words = ["call", "email", "write", "review", "plan", "buy", "fix", "read"]
+    tasks = (
+        Task(text=f"{rng.choice(words)} {rng.choice(words)} {i}", done=i % 4 == 0,
+             priority=rng.randint(1, 5), due=today + timedelta(days=rng.randint(-30, 300)) if i % 3 else None,
+             category=f"cat{i % 11}", est_min=rng.randint(0, 240), hard=i % 9 == 0)
+        for i in range(n)
+    )
+    folder = tempfile.mkdtemp()
+    csv_path = os.path.join(folder, "tasks.csv")
+    jsonl_path = os.path.join(folder, "tasks.jsonl")
+    start = time.perf_counter()
+    write_task_file(csv_path, tasks)
+    rate(f"export {n} rows, CSV", n, time.perf_counter() - start)
+
+    errors: list[str] = []
+    start = time.perf_counter()
+    imported = [t for batch in read_task_file(csv_path, errors) for t in batch]
+    rate("parse CSV", len(imported), time.perf_counter() - start)
+    start = time.perf_counter()
+    write_task_file(jsonl_path, imported)
+    rate("export JSON Lines", n, time.perf_counter() - start)
+    del imported
+
+    index = TaskIndex()
+    start = time.perf_counter()
+    index.rebuild(t for batch in read_task_file(jsonl_path, errors) for t in batch)  # as TodoApp.import_file
+    rate("import JSON Lines -> memory", len(index.by_id), time.perf_counter() - start)
+    del index
+
+    store = TaskStore(os.path.join(folder, "tasks.db"))
+    start = time.perf_counter()
+    for batch in read_task_file(csv_path, errors):
+        store.add_many(batch)
+    rate("import CSV -> SQLite store", store.count(), time.perf_counter() - start)
+    store.close()
+    print(f"rows rejected: {len(errors)}")
+
+    dates = [(today + timedelta(days=i % 400)).isoformat() for i in range(200_000)]
+    start = time.perf_counter()
+    for s in dates:
+        datetime.strptime(s, "%Y-%m-%d").date()
+    strptime = time.perf_counter() - start
+    start = time.perf_counter()
+    for s in dates:
+        parse_iso_date(s)
+    fast = time.perf_counter() - start
+    print(f"200k dates: strptime {strptime * 1000:.0f} ms, parse_iso_date {fast * 1000:.0f} ms "
+          f"(import also parses each distinct date once)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
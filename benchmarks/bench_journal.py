@@ -0,0 +1,68 @@
+"""
+Write a long add/toggle/delete history through the task journal, then time
+a cold start from snapshot + journal tail, against replaying the same
+history from a journal that was never compacted. Runs without a display.
+
+Run from the repository root:
+    python benchmarks/bench_journal.py 1000000
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from todo_core import Task, TaskJournal
+
+
+def write_history(path: str, ops: int, compact_every: int | None) -> float:
+    """Run `ops` operations (60% add, 30% toggle, 10% delete); returns µs per op"""
+    rng = random.Random(1)
+    today = date.today()
+    journal = TaskJournal(path, compact_every=compact_every)
+    journal.load()
+    live: list[Task] = []
+    start = time.perf_counter()
+    for i in range(ops):
+        roll = rng.random()
+        if roll < 0.6 or not live:
+            t = Task(text=f"task {i}", priority=i % 5 + 1, due=today + timedelta(days=i % 30),
+                     category=f"cat{i % 7}", est_min=i % 90)
+            live.append(t)
+            journal.add(t)
+        elif roll < 0.9:
+            t = live[rng.randrange(len(live))]
+            t.done = not t.done
+            journal.update(t)
+        else:
+            t = live.pop(rng.randrange(len(live)))
+            journal.delete(t.id)
+    journal.close()
+    return (time.perf_counter() - start) * 1e6 / ops
+
+
+def cold_start(path: str) -> tuple[float, int]:
+    start = time.perf_counter()
+    journal = TaskJournal(path)
+    tasks = journal.load()
+    elapsed = time.perf_counter() - start
+    journal.close()
+    return elapsed, len(tasks)
+
+
+def main(ops: int):
+    folder = tempfile.mkdtemp()
+    for label, compact_every in (("compacted", 100_000), ("journal only", None)):
+        path = os.path.join(folder, label.replace(" ", "_") + ".journal")
+        per_op = write_history(path, ops, compact_every)
+        seconds, n = cold_start(path)
+        sizes = [os.path.getsize(p) // 1024 for p in (path, path + ".snapshot") if os.path.exists(p)]
+        print(f"{label:<13} write {per_op:6.2f} µs/op   cold start {seconds:6.2f} s "
+              f"({n} tasks, files {sizes} KiB)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,55 @@
+"""
+Time overdue tracking: re-checking every task's due date against the
+OverdueTracker heap, which only touches tasks as they turn overdue. Runs
+without a display.
+
+Run from the repository root:
+    python benchmarks/bench_overdue.py 1000000
+"""
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from todo_core import OverdueTracker, Task
+
+
+def main(n: int, days: int = 60):
+    rng = random.Random(6)
+    today = date.today()
+    tasks = [
+        Task(text=f"task {i}", done=i % 5 == 0,
+             due=today + timedelta(days=rng.randint(-30, 365)) if i % 4 else None)
+        for i in range(n)
+    ]
+
+    start = time.perf_counter()
+    overdue = {t.id for t in tasks if t.due is not None and t.due < today and not t.done}
+    scan = time.perf_counter() - start
+    print(f"re-check all {n} tasks          {scan * 1000:8.1f} ms  ({len(overdue)} overdue)")
+
+    tracker = OverdueTracker(today)
+    start = time.perf_counter()
+    tracker.rebuild(tasks)
+    print(f"build heap                      {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+    turned = 0
+    start = time.perf_counter()
+    for day in range(1, days + 1):
+        turned += len(tracker.advance(today + timedelta(days=day)))
+    elapsed = time.perf_counter() - start
+    print(f"{days} midnights, {turned} tasks turned overdue"
+          f"  {elapsed * 1000 / days:8.3f} ms per day, {elapsed * 1e6 / max(turned, 1):.2f} us per task")
+
+    sample = rng.sample(tasks, min(10_000, len(tasks)))
+    start = time.perf_counter()
+    for t in sample:
+        t.due = today + timedelta(days=rng.randint(days, days + 30))
+        tracker.update(t)
+    print(f"{f're-date {len(sample)} tasks':<32}{(time.perf_counter() - start) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
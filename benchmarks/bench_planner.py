@@ -0,0 +1,53 @@
+"""
+Time the day planner: a full build against re-planning after one task
+changes, for a soft task and for a hard-deadline task. Runs without a
+display.
+
+Run from the repository root:
+    python benchmarks/bench_planner.py 50000
+"""
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from todo_core import DayPlanner, Task
+
+PLAN_DAYS = 14
+
+
+def main(n: int, changes: int = 50):
+    rng = random.Random(2)
+    today = date.today()
+    tasks = [
+        Task(text=f"task {i}", priority=rng.randint(1, 5),
+             due=today + timedelta(days=rng.randint(-3, 400)) if rng.random() < 0.8 else None,
+             est_min=rng.choice([15, 30, 60, 90, 120]), hard=rng.random() < 0.1)
+        for i in range(n)
+    ]
+    planner = DayPlanner(480)
+    start = time.perf_counter()
+    planner.rebuild(tasks)
+    for day in range(PLAN_DAYS):
+        planner.day_plan(day)
+    print(f"full plan, {n} tasks        {(time.perf_counter() - start) * 1000:8.1f} ms"
+          f"  ({len(planner.infeasible)} infeasible, penalty {planner.penalty()})")
+
+    for label, hard in (("soft", False), ("hard", True)):
+        elapsed = 0.0
+        for _ in range(changes):
+            t = rng.choice(tasks)
+            t.est_min += 5
+            t.hard = hard
+            start = time.perf_counter()
+            planner.update(t)
+            for day in range(PLAN_DAYS):
+                planner.day_plan(day)
+            elapsed += time.perf_counter() - start
+        print(f"re-plan after a {label} change {elapsed * 1000 / changes:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,51 @@
+"""
+Time recurring tasks kept as one row per series against the same series
+expanded into a Task per occurrence for a year: loading, sorting by Due and
+the Today view. Runs without a display.
+
+Run from the repository root:
+    python benchmarks/bench_recurring.py 10000
+"""
+import itertools
+import random
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from todo_core import SAVED_VIEWS, Task, TodoList, occurrences
+from _timing import timed
+
+HORIZON_DAYS = 365
+
+
+def run(label: str, tasks: list[Task]):
+    print(f"{label}: {len(tasks)} tasks")
+    todo = TodoList()
+    timed("  load", lambda: todo.set_tasks(tasks), repeat=1)
+    timed("  sort by Due", lambda: todo.view_rows(SAVED_VIEWS["All"].sorted_by("Due"))[:18], repeat=1)
+    timed("  Today view", lambda: todo.view_rows(SAVED_VIEWS["Today"]), repeat=1)
+    print(f"  {len(todo.view_rows(SAVED_VIEWS['Today']))} due today")
+
+
+def main(n: int):
+    rng = random.Random(9)
+    today = date.today()
+    series = [
+        Task(text=f"series {i}", priority=rng.randint(1, 5), category=f"cat{i % 6}", est_min=i % 60,
+             due=today - timedelta(days=rng.randint(0, 30)), repeat=rng.choice(["daily", "weekly", "monthly"]))
+        for i in range(n)
+    ]
+    run("one row per series", series)
+
+    end = today + timedelta(days=HORIZON_DAYS)
+    expanded = [
+        Task(t.text, False, t.priority, day, t.category, t.est_min, t.hard)
+        for t in series
+        for day in itertools.takewhile(end.__ge__, occurrences(t.due, t.repeat, today))
+    ]
+    run(f"expanded for {HORIZON_DAYS} days", expanded)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,65 @@
+"""
+Time the dashboard's estimate totals: summing every task again after each
+edit, against the running EstimateRollup that TodoList adjusts per change.
+Runs without a display.
+
+Run from the repository root:
+    python benchmarks/bench_rollup.py 100000
+"""
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from todo_core import Task, TodoList
+
+
+def scan(tasks, today: date):
+    by_category: dict[str, int] = {}
+    by_due: dict[date | None, int] = {}
+    overdue = on_track = 0
+    for t in tasks:
+        if t.done:
+            continue
+        by_category[t.category.lower()] = by_category.get(t.category.lower(), 0) + t.est_min
+        by_due[t.due] = by_due.get(t.due, 0) + t.est_min
+        if t.due is not None and t.due < today:
+            overdue += t.est_min
+        else:
+            on_track += t.est_min
+    return by_category, by_due, overdue, on_track
+
+
+def main(n: int, edits: int = 200):
+    rng = random.Random(10)
+    today = date.today()
+    todo = TodoList()
+    todo.set_tasks(
+        Task(text=f"task {i}", done=i % 4 == 0, priority=rng.randint(1, 5),
+             due=today + timedelta(days=rng.randint(-20, 60)) if i % 3 else None,
+             category=f"cat{i % 12}", est_min=rng.randint(0, 180))
+        for i in range(n)
+    )
+    ids = list(todo.tasks)
+
+    start = time.perf_counter()
+    scan(todo.tasks.values(), today)
+    print(f"re-sum all {n} tasks            {(time.perf_counter() - start) * 1000:9.3f} ms per edit")
+
+    start = time.perf_counter()
+    for _ in range(edits):
+        t = todo.tasks[rng.choice(ids)]
+        t.est_min += 15
+        t.done = not t.done
+        todo.update_many([t])  # indexes, overdue tracker and rollup together
+        todo.estimates()
+    print(f"edit + running totals            {(time.perf_counter() - start) * 1000 / edits:9.3f} ms per edit")
+
+    assert scan(todo.tasks.values(), today) == (
+        todo.rollup.by_category, todo.rollup.by_due, todo.rollup.overdue, todo.rollup.on_track)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,65 @@
+"""
+Time flipping between saved views: filtering and sorting each one from
+scratch, against switching back to a view whose memoized result is still
+valid, and how edits to other columns leave it valid. Runs without a
+display.
+
+Run from the repository root:
+    python benchmarks/bench_saved_views.py 1000000
+"""
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from todo_core import SAVED_VIEWS, SavedView, Task, TodoList
+
+WINDOW = slice(0, 18)  # what the Treeview draws after a switch
+
+
+def flip(todo: TodoList, views: list[SavedView], rounds: int) -> float:
+    """ms per view switch, including reading the first window"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for view in views:
+            todo.view_rows(view)[WINDOW]
+    return (time.perf_counter() - start) * 1000 / (rounds * len(views))
+
+
+def main(n: int, rounds: int = 5):
+    rng = random.Random(8)
+    today = date.today()
+    todo = TodoList()
+    todo.set_tasks(
+        Task(text=f"task {i}", done=i % 4 == 0, priority=rng.randint(1, 5),
+             due=today + timedelta(days=rng.randint(-10, 90)) if i % 3 else None,
+             category=f"cat{i % 12}", est_min=i % 120, hard=i % 8 == 0)
+        for i in range(n)
+    )
+    views = [view for name, view in SAVED_VIEWS.items() if name != "All"]
+    views += [SavedView("cat3", category="cat3", sort=(("Pr", False), ("Due", True))),
+              SavedView("cat7", category="cat7")]
+    print(f"{len(views)} filtered views over {n} tasks")
+
+    def cold():
+        todo.view_cache.clear()
+        return flip(todo, views, 1)
+    print(f"{'re-filter and re-sort':<34} {sum(cold() for _ in range(rounds)) / rounds:9.3f} ms per switch")
+    print(f"{'memoized, nothing changed':<34} {flip(todo, views, rounds * 20):9.3f} ms per switch")
+
+    ids = list(todo.tasks)
+    for label, edit in (("after a text edit", lambda t: setattr(t, "text", t.text + "!")),
+                        ("after a re-date", lambda t: setattr(t, "due", today))):
+        elapsed = 0.0
+        for _ in range(rounds):
+            t = todo.tasks[rng.choice(ids)]
+            edit(t)
+            todo.update_many([t])
+            elapsed += flip(todo, views, 1)
+        print(f"{label:<34} {elapsed / rounds:9.3f} ms per switch")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,124 @@
+"""
+Benchmark suite for the headless To-Do core: add, toggle, delete, sort,
+filter, search and serialize on an in-memory TodoList at several sizes,
+compared with a stored baseline. Runs without a display.
+
+Run from the repository root:
+    python benchmarks/bench_suite.py                      # 1k, 100k, 1M; compare with baseline.json
+    python benchmarks/bench_suite.py --sizes 1000 100000  # a quicker run
+    python benchmarks/bench_suite.py --save               # store this run as the new baseline
+
+Times are per operation in ms. A result more than --tolerance times the
+baseline is marked SLOWER and makes the run exit with status 1. The
+baseline is only meaningful on the machine that recorded it.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from todo_core import SORT_KEYS, Task, TodoList
+from _timing import per_op
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+WORDS = ["call", "email", "write", "review", "plan", "buy", "fix", "read", "book", "pay",
+         "clean", "send", "order", "check", "update", "draft", "ship", "test", "renew", "file"]
+
+
+def make_tasks(n: int, rng: random.Random) -> list[Task]:
+    today = date.today()
+    return [
+        Task(text=f"{rng.choice(WORDS)} {rng.choice(WORDS)} item{i % 5000}", done=i % 4 == 0,
+             priority=rng.randint(1, 5), due=today + timedelta(days=rng.randint(-20, 60)) if i % 3 else None,
+             category=f"cat{i % 12}", est_min=rng.randint(0, 180), hard=i % 8 == 0)
+        for i in range(n)
+    ]
+
+
+def run(n: int) -> dict[str, float]:
+    rng = random.Random(n)
+    results: dict[str, float] = {}
+    tasks = make_tasks(n, rng)
+    todo = TodoList()
+    results["load"] = per_op(lambda: todo.set_tasks(tasks), 1)
+
+    window = slice(n // 2, n // 2 + 18)  # what the view reads after scrolling to the middle
+    extra = iter(make_tasks(200, rng))
+    results["add"] = per_op(lambda: todo.add(next(extra)), 200)
+    ids = list(todo.tasks)
+
+    def toggle():
+        t = todo.tasks[rng.choice(ids)]
+        t.done = not t.done
+        todo.update_many([t])
+    results["toggle"] = per_op(toggle, 200)
+
+    def toggle_many():
+        picked = todo.get_many(rng.sample(ids, min(1000, len(ids))))
+        for t in picked:
+            t.done = not t.done
+        todo.update_many(picked)
+    results["toggle 1000"] = per_op(toggle_many, 3)
+
+    gone = iter(rng.sample(ids, 200))
+    results["delete"] = per_op(lambda: todo.delete_many([todo.tasks[next(gone)]]), 200)
+
+    for column in SORT_KEYS:
+        results[f"sort {column}"] = per_op(lambda: todo.rows(column)[window], 20)
+    results["filter today"] = per_op(lambda: todo.rows("Due", today_only=True)[:18], 20)
+    results["filter category"] = per_op(lambda: todo.rows("Pr", category="cat3")[:18], 20)
+    for query in ("review", "re", "pay item12"):
+        results[f"search {query!r}"] = per_op(lambda: todo.rows(search=query)[:18], 20)
+
+    folder = tempfile.mkdtemp()
+    for ext in ("csv", "jsonl"):
+        path = os.path.join(folder, f"tasks.{ext}")
+        results[f"export {ext}"] = per_op(lambda: todo.export_file(path), 1)
+        results[f"import {ext}"] = per_op(lambda: TodoList().import_file(path), 1)
+        os.remove(path)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--save", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    args = parser.parse_args()
+
+    baseline = json.loads(BASELINE.read_text())["results"] if BASELINE.exists() else {}
+    results: dict[str, dict[str, float]] = {}
+    slower = 0
+    for n in args.sizes:
+        results[str(n)] = run(n)
+        print(f"\n{n} tasks")
+        for name, ms in results[str(n)].items():
+            before = baseline.get(str(n), {}).get(name)
+            line = f"  {name:<22} {ms:10.3f} ms"
+            if before:
+                ratio = ms / before
+                line += f"   baseline {before:10.3f} ms  x{ratio:5.2f}"
+                if ratio > args.tolerance and ms - before > 1.0:  # ignore noise on sub-ms operations
+                    line += "  SLOWER"
+                    slower += 1
+            print(line)
+
+    if args.save:
+        BASELINE.write_text(json.dumps({
+            "python": platform.python_version(), "machine": platform.machine(),
+            "results": {n: {name: round(ms, 4) for name, ms in r.items()} for n, r in results.items()},
+        }, indent=1) + "\n")
+        print(f"\nbaseline saved to {BASELINE}")
+    elif slower:
+        print(f"\n{slower} result(s) slower than the baseline")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Time sorting, filtering and searching the in-memory task list through the
+maintained indexes, against a full re-sort / scan. Runs without a display.
+
+Run from the repository root:
+    python benchmarks/bench_task_index.py 100000
+"""
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from todo_core import SORT_KEYS, Task, TaskIndex
+from _timing import timed
+
+
+def main(n: int):
+    rng = random.Random(1)
+    today = date.today()
+    vocabulary = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 9)))
+                  for _ in range(20_000)]
+    tasks = [
+        Task(text=" ".join(rng.choice(vocabulary) for _ in range(rng.randint(2, 6))),
+             priority=rng.randint(1, 5),
+             due=today + timedelta(days=rng.randint(-5, 25)), category=f"cat{i % 7}",
+             est_min=i % 90, hard=i % 6 == 0)
+        for i in range(n)
+    ]
+    index = TaskIndex()
+    start = time.perf_counter()
+    index.rebuild(tasks)
+    print(f"index {n} tasks             {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+    window = slice(n // 2, n // 2 + 18)
+    for column, key in SORT_KEYS.items():
+        timed(f"sort {column}: re-sort", lambda: sorted(tasks, key=key)[window], repeat=3)
+        timed(f"sort {column}: index view", lambda: index.column(column)[window])
+    timed("today: scan", lambda: [t for t in tasks if t.due == today], repeat=3)
+    timed("today: due map", lambda: index.due_on(today))
+    timed("category: scan", lambda: [t for t in tasks if t.category.lower() == "cat3"], repeat=3)
+    timed("category: index range", lambda: index.category("cat3")[0:18])
+    for query in ("t", "st", "cat3 b", vocabulary[0][:4]):
+        timed(f"search {query!r}: scan", lambda: [
+            t for t in tasks
+            if all(t.text.lower().find(w) >= 0 or t.category.lower().find(w) >= 0 for w in query.split())
+        ], repeat=3)
+        timed(f"search {query!r}: index", lambda: index.search(query))
+
+    extra = [Task(text=f"new {i}", due=today, category="cat1") for i in range(1000)]
+    timed("add 1000 tasks", lambda: [index.add(t) for t in extra], repeat=1)
+    for t in extra:
+        t.done = True
+    timed("toggle 1000 tasks", lambda: [index.update(t) for t in extra], repeat=1)
+    timed("delete 1000 tasks", lambda: [index.remove(t) for t in extra], repeat=1)
+
+    block = rng.sample(tasks, min(10_000, len(tasks)))
+    for t in block:
+        t.done, t.priority, t.category = not t.done, 1, "moved"
+    timed(f"batch update {len(block)} tasks", lambda: index.update_many(block), repeat=1)
+    timed(f"batch remove {len(block)} tasks", lambda: index.remove_many(block), repeat=1)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
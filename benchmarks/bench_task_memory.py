@@ -0,0 +1,64 @@
+"""
+Bytes per task for the old dataclass Task (one __dict__ each), the slotted
+Task with interned categories, and the columnar TaskColumns. Each task gets
+its own date and category string, the way they arrive from typed input or a
+file. Runs without a display.
+
+Run from the repository root:
+    python benchmarks/bench_task_memory.py 1000000
+"""
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from todo_core import Task, TaskColumns, TaskIndex
+
+
+@dataclass
+class DictTask:
+    """Task as it was before slots: every instance has a __dict__"""
+    text: str
+    done: bool = False
+    priority: int = 2
+    due: date | None = None
+    category: str = ""
+    est_min: int = 0
+    hard: bool = False
+    id: int = 0
+
+
+def fields(i: int):
+    today = date.today().toordinal()
+    return (f"task number {i}", i % 3 == 0, i % 5 + 1, date.fromordinal(today + i % 60),
+            "".join(("cat", str(i % 12))), i % 240, i % 7 == 0)
+
+
+def measure(label: str, build, n: int):
+    gc.collect()
+    tracemalloc.start()
+    kept = build(n)
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<34} {used / n:8.1f} bytes/task  ({used / 2**20:7.1f} MiB)")
+    return kept
+
+
+def main(n: int):
+    print(f"{n} tasks")
+    measure("dataclass with __dict__ (old)",
+            lambda n: {i: DictTask(*fields(i), id=i) for i in range(n)}, n)
+    measure("slotted Task, interned categories",
+            lambda n: {i: Task(*fields(i), id=i) for i in range(n)}, n)
+    measure("TaskColumns", lambda n: TaskColumns(Task(*fields(i), id=i) for i in range(n)), n)
+    if n <= 200_000:
+        tasks = [Task(*fields(i), id=i) for i in range(n)]
+        index = TaskIndex(compact=True)
+        measure("TaskIndex overhead (sorts, search)", lambda n: index.rebuild(tasks), n)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,49 @@
+"""
+Time opening, paging, sorting and filtering the SQLite task store with a
+large database. Runs without a display.
+
+Run from the repository root:
+    python benchmarks/bench_task_store.py 300000
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from todo_core import Task, TaskStore
+from _timing import timed
+
+
+def main(n: int):
+    path = os.path.join(tempfile.mkdtemp(), "tasks.db")
+    today = date.today()
+    store = TaskStore(path)
+    start = time.perf_counter()
+    store.add_many([
+        Task(text=f"task {i}", priority=i % 5 + 1,
+             due=today + timedelta(days=i % 30 - 5) if i % 11 else None,
+             category=f"cat{i % 7}", est_min=i % 90)
+        for i in range(n)
+    ])
+    store.close()
+    print(f"{n} tasks written in {time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    store = TaskStore(path)
+    rows = store.rows()
+    rows[0:18]
+    print(f"open + first window        {(time.perf_counter() - start) * 1000:8.2f} ms ({len(rows)} rows)")
+
+    timed("window at 90%", lambda: store.rows()[int(n * 0.9):int(n * 0.9) + 18])
+    for column in ("Status", "Task", "Pr", "Due", "Hard", "Cat"):
+        timed(f"sort {column} first window", lambda: store.rows(column)[0:18])
+    timed("filter today (count+win)", lambda: (lambda r: (len(r), r[0:18]))(store.rows("Pr", due=today)))
+    timed("filter category", lambda: (lambda r: (len(r), r[0:18]))(store.rows(category="cat3")))
+    store.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300_000)
@@ -0,0 +1,76 @@
+"""
+Time startup, scrolling, add / toggle / delete / sort in the To-Do app with
+a large task list.
+
+Needs a display (Tk). Run from the repository root:
+    python benchmarks/bench_treeview.py 50000
+"""
+import sys
+import time
+import tkinter as tk
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from My_to_do_list_app import Task, TodoApp
+from _timing import timed
+
+
+def main(n: int):
+    root = tk.Tk()
+    root.withdraw()
+    app = TodoApp(root)
+    today = date.today()
+    tasks = [
+        Task(text=f"task {i}", priority=i % 5 + 1, due=today + timedelta(days=i % 30 - 5),
+             category=f"cat{i % 7}", est_min=i % 90)
+        for i in range(n)
+    ]
+    start = time.perf_counter()
+    app.set_tasks(tasks)
+    print(f"{n} tasks loaded in {time.perf_counter() - start:.2f} s")
+
+    def add():
+        app.entry_text.insert(0, "benchmark task")
+        app.add_task()
+
+    def select_middle():
+        # only the visible window exists in the tree, so scroll there first
+        app.view.on_scroll("moveto", "0.5")
+        app.view.selected.clear()
+        app.tree.selection_set(app.tree.get_children()[0])
+        app.view.on_select()
+
+    def toggle():
+        select_middle()
+        app.toggle_complete()
+
+    def delete():
+        select_middle()
+        app.delete_task()
+
+    timed("scroll to middle", lambda: app.view.on_scroll("moveto", "0.5"))
+    timed("scroll one page", lambda: app.view.scroll_by(1, "pages"))
+    timed("add_task", add)
+    timed("toggle_complete", toggle)
+    timed("delete_task", delete)
+
+    def select_block(count: int = 10_000):
+        app.view.selected = {str(t.id) for t in app.view.rows[:count]}
+        app.view.render()  # puts the on-screen part of it into the tree's selection
+
+    def bulk(action):
+        select_block()
+        action()
+
+    timed("toggle 10k selected", lambda: bulk(app.toggle_complete), repeat=3)
+    timed("set priority 10k", lambda: bulk(app.set_priority), repeat=3)
+    timed("delete 10k selected", lambda: bulk(app.delete_task), repeat=1)
+    timed("sort_by Due", lambda: app.sort_by("Due"), repeat=3)
+    timed("filter_today", app.filter_today, repeat=3)
+    timed("show_all", app.show_all, repeat=3)
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
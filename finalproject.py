@@ -1,7 +1,18 @@
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 from graphics import Canvas
 from ai import call_gpt
-import random
+from ai_memory import ConversationMemory, build_ai_prompt, create_ai_memories
+from ai_resilience import ResilientCaller
+from game_history import GameHistory
+from menu_widgets import WidgetLayer
+from render_queue import RenderQueue
+from terminal_screen import TerminalScreen
+from whompus_rules import (
+    DIRECTIONS, GameState, check_room_status, get_valid_moves,
+    state_memory_report, whompus_move
+)
+from whompus_net import RemoteWhompusController
+import sys
 import time
 
 
@@ -13,6 +24,16 @@ CANVAS_HEIGHT = 540
 ROOM_SIZE = 40    
 canvas = Canvas(CANVAS_WIDTH, CANVAS_HEIGHT)
 
+# Drawing during a turn goes through a render queue, flushed once per frame
+render = RenderQueue(canvas)
+
+# Terminal text is drawn through one double-buffered screen; --quiet turns it off
+screen = TerminalScreen(quiet='--quiet' in sys.argv)
+
+# call_gpt with a deadline, retries and a circuit breaker; when it raises,
+# get_ai_response falls back to the local mock answers
+resilient_gpt = ResilientCaller(call_gpt)
+
 ################################################################################################
 ################# Character Part Sizes ######################################
 ################################################################################################
@@ -22,69 +43,6 @@ PLAYER_SHIRT_HEIGHT = 10
 PLAYER_SHIRT_WIDTH = 10
 PLAYER_HEAD_SIZE = 6 
 
-################################################################################################
-################# Movement Directions ######################################
-################################################################################################
-DIRECTIONS = {
-    'UP': (-1, 0),
-    'DOWN': (1, 0),
-    'LEFT': (0, -1),
-    'RIGHT': (0, 1)
-}
-################################################################################################
-################ Game State Classes ######################################
-################################################################################################
-class GameState:
-    """Class to manage the game state"""
-    def __init__(self):
-        self.player_position = (9, 0)  # Starting position
-        self.whompus_position = (0, 9)  # Starting position
-        self.trap_doors = set()  # Set of (row, col) positions
-        self.player_moves = 0
-        self.whompus_moves = 0
-        self.ai_roles = {}  # Will store which AI is which role
-        self.game_over = False
-        self.player_won = False
-        self.current_room_status = {}  # Stores status of each room
-        # Initialize room_occupants as a 10x10 grid of empty lists
-        self.room_occupants = [[[] for _ in range(10)] for _ in range(10)]
-        self.last_action = None  # Track the last action taken
-        self.action_in_progress = False  # Flag for ongoing actions
-    
-    def increment_moves(self, action_type: str):
-        """Increment player moves and track the action type"""
-        self.player_moves += 1
-        self.last_action = action_type
-        self.action_in_progress = True
-
-    def complete_action(self):
-        """Mark the current action as complete"""
-        self.action_in_progress = False
-    ################################################################################################
-    ################# Trap door locations selected ######################################
-    ################################################################################################
-    def initialize_trap_doors(self):
-        """Initialize 10 random trap doors"""
-        while len(self.trap_doors) < 10:
-            row = random.randint(0, 9)
-            col = random.randint(0, 9)
-            # Don't place traps on player or whompus starting positions
-            if (row, col) not in [(9, 0), (0, 9)]:
-                self.trap_doors.add((row, col))
-
-    ################################################################################################
-    ################# Establish naming convention for ais ######################################
-    ################################################################################################
-    def assign_ai_roles(self):
-        """Randomly assign roles to AIs"""
-        numbers = random.sample(range(1, 11), 3)
-        roles = {
-            'ALI': 'villain' if numbers[0] == min(numbers) else 'truth' if numbers[0] == max(numbers) else 'fifty',
-            'AN': 'villain' if numbers[1] == min(numbers) else 'truth' if numbers[1] == max(numbers) else 'fifty',
-            'ALE': 'villain' if numbers[2] == min(numbers) else 'truth' if numbers[2] == max(numbers) else 'fifty'
-        }
-        self.ai_roles = roles
-
 ################################################################################################
 ################ InfoBar Class ######################################
 ################################################################################################
@@ -93,6 +51,7 @@ class InfoBar:
         self.canvas = canvas
         self.info_bar_id = None
         self.text_ids: List[int] = []
+        self.text_lines: List[str] = []
         self._create_base_info_bar()
         self.last_response = None  # Store the last AI response
         self.waiting_for_acknowledgment = False  # Flag to track if we're waiting for user input
@@ -103,6 +62,8 @@ class InfoBar:
         # Delete existing info bar if it exists
         if self.info_bar_id:
             self.canvas.delete(self.info_bar_id)
+        # Text drawn before would now be hidden under the new rectangle
+        self._clear_text()
         
         # Create new info bar rectangle
         self.info_bar_id = self.canvas.create_rectangle(
@@ -115,6 +76,7 @@ class InfoBar:
         for text_id in self.text_ids:
             self.canvas.delete(text_id)
         self.text_ids.clear()
+        self.text_lines.clear()
     
     def _add_text(self, text: str, y_offset: int) -> int:
         """Add a line of text to the info bar and return its ID"""
@@ -127,8 +89,21 @@ class InfoBar:
             anchor='w'
         )
         self.text_ids.append(text_id)
+        self.text_lines.append(text)
         return text_id
     
+    def _set_lines(self, lines: List[str]):
+        """Show these lines, changing only the text items whose line changed"""
+        if len(lines) != len(self.text_ids):
+            self._clear_text()
+            for i, line in enumerate(lines):
+                self._add_text(line, i * 12)
+            return
+        for i, line in enumerate(lines):
+            if line != self.text_lines[i]:
+                self.canvas.change_text(self.text_ids[i], line)
+                self.text_lines[i] = line
+    
     def _format_message(self, message: str) -> str:
         """Format a message for display, ensuring proper line breaks and formatting"""
         if not message:
@@ -163,9 +138,6 @@ class InfoBar:
             if not self.info_bar_id or not self.canvas.find_overlapping(0, 400, 400, 440):
                 self._create_base_info_bar()
             
-            # Clear existing text
-            self._clear_text()
-            
             # Add move count if game state exists
             move_text = f"Moves: {game_state.player_moves}" if game_state else ""
             
@@ -176,19 +148,19 @@ class InfoBar:
                 "INFO: Press 'I' for game rules"
             ]
             
-            for i, line in enumerate(instructions):
-                self._add_text(line, i * 12)
+            self._set_lines(instructions)
             
             # Handle message if provided
             if message:
                 formatted_message = self._format_message(message)
-                print(formatted_message)
+                screen.add_message(formatted_message)
                 
                 # Store AI response and set flag for acknowledgment
                 if is_ai_response and message != self.last_response:
                     self.last_response = message
                     self.waiting_for_acknowledgment = True
-                    print("\nPress any key to continue...")
+                    screen.set_region('prompt', ["Press any key to continue..."])
+                screen.flush()
         
         finally:
             self.is_updating = False
@@ -210,6 +182,7 @@ class InfoBar:
             time.sleep(0.1)
         
         self.waiting_for_acknowledgment = False
+        screen.set_region('prompt', [])
 
 ################################################################################################
 #################### ROWS OF INTRO DIALOG ######################################
@@ -418,8 +391,8 @@ def create_character(character_type, row, col):
 ################################################################################################
 ################# Create main menu, and game over screen ######################################
 ################################################################################################
-def create_main_menu() -> Tuple[int, int, int, int]:
-    """Create the main menu with clickable options and return the button IDs"""
+def create_main_menu() -> WidgetLayer:
+    """Create the main menu with clickable options and return its widget layer"""
     # Clear the canvas
     canvas.clear()
     
@@ -457,104 +430,40 @@ def create_main_menu() -> Tuple[int, int, int, int]:
     button_spacing = 30
     start_y = 150
     
+    # Buttons are registered once with their bounds for hover and clicks
+    menu = WidgetLayer(canvas)
+    
     # Play with intro button
-    with_intro_box = canvas.create_rectangle(
+    menu.create_button(
         (CANVAS_WIDTH - button_width) // 2,
         start_y,
         (CANVAS_WIDTH + button_width) // 2,
         start_y + button_height,
-        'black', 'red'
-    )
-    with_intro_text = canvas.create_text(
-        ((CANVAS_WIDTH // 2)-(button_width/4)),
-        start_y + button_height // 2,
-        text="Play (With Intro)",
-        font='Arial',
-        font_size=16,
-        color='white'
+        "Play (With Intro)", 'with_intro',
+        text_x=((CANVAS_WIDTH // 2)-(button_width/4)),
+        text_y=start_y + button_height // 2
     )
     
     # Play without intro button
-    skip_intro_box = canvas.create_rectangle(
+    menu.create_button(
         (CANVAS_WIDTH - button_width) // 2,
         start_y + button_height + button_spacing,
         (CANVAS_WIDTH + button_width) // 2,
         start_y + 2 * button_height + button_spacing,
-        'black', 'red'
-    )
-    skip_intro_text = canvas.create_text(
-        ((CANVAS_WIDTH // 2)-(button_width//4)), (start_y + button_height + button_spacing+(button_height//2)),
-        text="Play (Skip Intro)",
-        font='Arial',
-        font_size=16,
-        color='white'
+        "Play (Skip Intro)", 'skip_intro',
+        text_x=((CANVAS_WIDTH // 2)-(button_width//4)),
+        text_y=(start_y + button_height + button_spacing+(button_height//2))
     )
     
-    return with_intro_box, skip_intro_box, with_intro_text, skip_intro_text
+    return menu
 
 def show_main_menu() -> str:
     """Show the main menu and return the selected option"""
     # Create the menu
-    with_intro_box, skip_intro_box, with_intro_text, skip_intro_text = create_main_menu()
-    
-    # Track button states for hover effects
-    button_states = {
-        with_intro_box: {'hover': False, 'text': with_intro_text},
-        skip_intro_box: {'hover': False, 'text': skip_intro_text}
-    }
+    menu = create_main_menu()
     
-    # Wait for click
-    while True:
-        # Get current mouse position
-        mouse_x = canvas.get_mouse_x()
-        mouse_y = canvas.get_mouse_y()
-        
-        # Check hover states for each button
-        for box_id, state in button_states.items():
-            # Get coordinates using coords() instead of get_bounds()
-            coords = canvas.coords(box_id)
-            left_x, top_y = coords[0], coords[1]
-            right_x = left_x + canvas.get_object_width(box_id)
-            bottom_y = top_y + canvas.get_object_height(box_id)
-            
-            is_hovering = (left_x <= mouse_x <= right_x and top_y <= mouse_y <= bottom_y)
-            
-            # Update hover state if changed
-            if is_hovering != state['hover']:
-                state['hover'] = is_hovering
-                # Change button color on hover
-                canvas.set_color(box_id, 'red' if is_hovering else 'black')
-                canvas.set_color(state['text'], 'black' if is_hovering else 'white')
-        
-        # Check for clicks
-        click = canvas.get_last_click()
-        if click:
-            # click is a list of coordinates [x, y]
-            x, y = click[0], click[1]
-            
-            # Get coordinates for each button
-            with_intro_coords = canvas.coords(with_intro_box)
-            skip_intro_coords = canvas.coords(skip_intro_box)
-            
-            # Calculate button boundaries
-            with_intro_left = with_intro_coords[0]
-            with_intro_top = with_intro_coords[1]
-            with_intro_right = with_intro_left + canvas.get_object_width(with_intro_box)
-            with_intro_bottom = with_intro_top + canvas.get_object_height(with_intro_box)
-            
-            skip_intro_left = skip_intro_coords[0]
-            skip_intro_top = skip_intro_coords[1]
-            skip_intro_right = skip_intro_left + canvas.get_object_width(skip_intro_box)
-            skip_intro_bottom = skip_intro_top + canvas.get_object_height(skip_intro_box)
-            
-            if (with_intro_left <= x <= with_intro_right and
-                with_intro_top <= y <= with_intro_bottom):
-                return 'with_intro'
-            elif (skip_intro_left <= x <= skip_intro_right and
-                  skip_intro_top <= y <= skip_intro_bottom):
-                return 'skip_intro'
-        
-        time.sleep(0.1)
+    # Hover and clicks are looked up in the menu's index, not on the canvas
+    return menu.wait_for_action()
 
 def show_game_over_screen(result: str) -> None:
     """Show the game over screen with appropriate message"""
@@ -606,23 +515,25 @@ def show_game_over_screen(result: str) -> None:
         color='red'
     )
     
-    # Wait for click using wait_for_click() instead of polling
-    canvas.wait_for_click()
+    # The whole screen is one clickable region
+    screen = WidgetLayer(canvas)
+    screen.add_region(0, 0, CANVAS_WIDTH, CANVAS_HEIGHT, 'menu')
+    screen.wait_for_action()
 ################################################################################################
 ################ Build a "lit" room when character is present ######################################
 ################################################################################################
-def character_room_occupied(row, col):
-    """Create a lit room effect when a character is present"""
+def character_room_occupied(row, col, draw=canvas):
+    """Create a lit room effect when a character is present (on the canvas or a render queue)"""
     left_x = col * ROOM_SIZE
     top_y = row * ROOM_SIZE
     right_x = (col * ROOM_SIZE) + ROOM_SIZE
     bottom_y = (row * ROOM_SIZE) + ROOM_SIZE
     
-    character_room_white = canvas.create_rectangle(
+    character_room_white = draw.create_rectangle(
         left_x, top_y, right_x, bottom_y, 
         "white", "yellow"
     )
-    character_room_light = canvas.create_oval(
+    character_room_light = draw.create_oval(
         left_x, top_y, (left_x + 3), (top_y + 3), 
         "yellow", "red"
     ) 
@@ -636,15 +547,15 @@ def character_room_occupied(row, col):
 ################ Build a dark room when character is NOT present ######################################
 ################################################################################################
 
-def darken_room(row, col):
-    """Darken a room when a character leaves it"""
+def darken_room(row, col, draw=canvas):
+    """Darken a room when a character leaves it (on the canvas or a render queue)"""
     left_x = col * ROOM_SIZE
     top_y = row * ROOM_SIZE
     right_x = left_x + ROOM_SIZE
     bottom_y = top_y + ROOM_SIZE
     
     # Create a black rectangle to cover the room
-    canvas.create_rectangle(
+    draw.create_rectangle(
         left_x, top_y, right_x, bottom_y,
         'black', 'white'  # Black fill with white outline
     )
@@ -891,22 +802,28 @@ def finish_the_intro():
 ################################################################################################
 def get_player_question(ai_name: str, game_state: GameState, info_bar: InfoBar) -> Optional[str]:
     """Get the player's question for the AI with improved terminal interaction"""
-    # Update info bar with AI interaction header
-    info_bar.update(game_state, message=f"\n=== ASKING {ai_name} ===\n", is_ai_response=False)
-    
-    # Display context and instructions in terminal
-    print("\nYou can ask about:")
-    print("  - Nearby rooms and their contents")
-    print("  - The Whompus's location")
-    print("  - Trap doors in adjacent rooms")
-    print("  - Game mechanics and rules")
-    print("  - The AI's role and behavior")
-    print("\nType 'exit' to return to the game menu")
-    print("\n" + "-"*30)
+    # Update info bar
+    info_bar.update(game_state)
+    
+    # Display the AI interaction header, context and instructions in terminal
+    screen.set_region('menu', [
+        f"=== ASKING {ai_name} ===",
+        "",
+        "You can ask about:",
+        "  - Nearby rooms and their contents",
+        "  - The Whompus's location",
+        "  - Trap doors in adjacent rooms",
+        "  - Game mechanics and rules",
+        "  - The AI's role and behavior",
+        "",
+        "Type 'exit' to return to the game menu",
+        "-"*30
+    ])
     
     # Get the question with a clear prompt
-    print(f"\nYour question for {ai_name}:")
-    question = input("> ").strip()
+    screen.set_region('prompt', [f"Your question for {ai_name}:"])
+    question = screen.input("> ").strip()
+    screen.set_region('prompt', [])
     
     # Handle exit command
     if question.lower() in ['exit', 'quit', 'back']:
@@ -918,7 +835,8 @@ def get_player_question(ai_name: str, game_state: GameState, info_bar: InfoBar)
     
     return question
 
-def get_ai_response(ai_name: str, question: str, game_state: GameState, info_bar: InfoBar) -> str:
+def get_ai_response(ai_name: str, question: str, game_state: GameState, info_bar: InfoBar,
+                    memory: Optional[ConversationMemory] = None) -> str:
     """Get response from the specified AI with improved context"""
     try:
         # Reset any pending acknowledgments before starting
@@ -936,11 +854,12 @@ def get_ai_response(ai_name: str, question: str, game_state: GameState, info_bar
                 if status == 'trap':
                     adjacent_traps.append(f"({new_row},{new_col})")
         
-        # Rest of the function remains the same until the response handling...
+        ai_role = game_state.ai_roles.get(ai_name, 'fifty')
+        prompt = build_ai_prompt(ai_name, ai_role, question, adjacent_rooms, memory)
         
         try:
             # Get response from AI
-            response = call_gpt(prompt)
+            response = resilient_gpt(prompt)
             
             # Ensure the response includes an actual answer
             if "trap" in question.lower() and not any(word in response.lower() for word in ["trap", "pit", "hole", "danger", "safe", "clear"]):
@@ -968,6 +887,10 @@ def get_ai_response(ai_name: str, question: str, game_state: GameState, info_bar
             info_bar.update(game_state, formatted_response, is_ai_response=True)
             info_bar.wait_for_acknowledgment()
             
+            # Only remembered once shown; if showing it failed, the mock answer below is remembered instead
+            if memory is not None:
+                memory.remember(question, response, game_state.player_position, game_state.player_moves)
+            
             # Complete the action after acknowledgment
             game_state.complete_action()
             
@@ -1008,6 +931,9 @@ def get_ai_response(ai_name: str, question: str, game_state: GameState, info_bar
             info_bar.update(game_state, formatted_response, is_ai_response=True)
             info_bar.wait_for_acknowledgment()
             
+            if memory is not None:
+                memory.remember(question, response, game_state.player_position, game_state.player_moves)
+            
             # Complete the action after acknowledgment
             game_state.complete_action()
             
@@ -1020,63 +946,6 @@ def get_ai_response(ai_name: str, question: str, game_state: GameState, info_bar
         game_state.complete_action()
         return error_msg
 ################################################################################################
-############# Whompus Movement and Game State ######################################
-################################################################################################
-def whompus_move(game_state: GameState, player_position: Tuple[int, int]) -> Tuple[int, int]:
-    #Determine whompuss next move
-    # Move categories
-    if game_state.player_moves < 30:  # Category A
-        if game_state.player_moves % 3 != 0:
-            return game_state.whompus_position
-    elif game_state.player_moves < 50:  # Category B
-        if game_state.player_moves % 2 != 0:
-            return game_state.whompus_position
-    # Category C - always move
-    
-    # Get valid moves for whompus
-    valid_moves = get_valid_moves(game_state.whompus_position)
-    if not valid_moves:
-        return game_state.whompus_position
-    
-    # Determine if whompus should chase player
-    chase_chance = 0.25
-    if game_state.player_moves >= 30:
-        chase_chance = 0.5
-    if game_state.player_moves >= 50:
-        chase_chance = 1.0
-    
-    if random.random() < chase_chance:
-        # Try to move towards player
-        best_move = None
-        min_distance = float('inf')
-        for direction in valid_moves:
-            drow, dcol = DIRECTIONS[direction]
-            new_row = game_state.whompus_position[0] + drow
-            new_col = game_state.whompus_position[1] + dcol
-            distance = abs(new_row - player_position[0]) + abs(new_col - player_position[1])
-            if distance < min_distance:
-                min_distance = distance
-                best_move = (new_row, new_col)
-        return best_move if best_move else game_state.whompus_position
-    
-    # Random move
-    direction = random.choice(valid_moves)
-    drow, dcol = DIRECTIONS[direction]
-    return (game_state.whompus_position[0] + drow, 
-            game_state.whompus_position[1] + dcol)
-################################################################################################
-############# Checking the rooms next to player ######################################
-################################################################################################
-def check_room_status(position: Tuple[int, int], game_state: GameState) -> str:
-
-    row, col = position
-    if position in game_state.trap_doors:
-        return 'trap'
-    elif position == game_state.whompus_position:
-        return 'whompus'
-    else:
-        return 'empty'
-################################################################################################
 ############# Trap door visualization and location ######################################
 ################################################################################################
 def visualize_trap_doors(game_state: GameState):
@@ -1092,27 +961,20 @@ def visualize_trap_doors(game_state: GameState):
             'black', 'black'  # Solid black circle
         )
 
-def show_trap(row: int, col: int):
+def show_trap(row: int, col: int, draw=canvas):
     left_x = col * ROOM_SIZE + ROOM_SIZE//4
     top_y = row * ROOM_SIZE + ROOM_SIZE//4
     right_x = col * ROOM_SIZE + 3*ROOM_SIZE//4
     bottom_y = row * ROOM_SIZE + 3*ROOM_SIZE//4
     
     # Create a black circle for the trap on top of the lit room
-    canvas.create_oval(
+    draw.create_oval(
         left_x, top_y, right_x, bottom_y,
         'black', 'black'  # Solid black circle
     )
 ################################################################################################
 ########### Player Movement and validation of moves ######################################
 ################################################################################################
-def get_valid_moves(position: Tuple[int, int]) -> List[str]:
-    row, col = position
-    return [
-        direction for direction, (drow, dcol) in DIRECTIONS.items()
-        if 0 <= row + drow < 10 and 0 <= col + dcol < 10
-    ]
-
 def move_character(character: Dict, new_position: Tuple[int, int], game_state: GameState) -> Dict:
     
     # Get old and new positions
@@ -1120,10 +982,7 @@ def move_character(character: Dict, new_position: Tuple[int, int], game_state: G
     new_row, new_col = new_position
     
     # Update room occupants
-    if character['id'] in game_state.room_occupants[old_row][old_col]:
-        game_state.room_occupants[old_row][old_col].remove(character['id'])
-    if character['id'] not in game_state.room_occupants[new_row][new_col]:
-        game_state.room_occupants[new_row][new_col].append(character['id'])
+    game_state.move_occupant(character['id'], character['position'], new_position)
     
     # Update character's position
     character['position'] = new_position
@@ -1138,13 +997,13 @@ def move_character(character: Dict, new_position: Tuple[int, int], game_state: G
     
     # Delete old character parts
     for part in character['parts'].values():
-        canvas.delete(part['id'])
+        render.delete(part['id'])
     
     # Handle room lighting based on character type
     if character['type'] == 'player':
         # Darken old room and light up new room
-        darken_room(old_row, old_col)
-        character_room_occupied(new_row, new_col)
+        darken_room(old_row, old_col, render)
+        character_room_occupied(new_row, new_col, render)
     
     # Create new character parts
     specs = CHARACTER_PARTS[character['type']]
@@ -1156,7 +1015,7 @@ def move_character(character: Dict, new_position: Tuple[int, int], game_state: G
     pants_bottom = bottom_y
     
     character['parts']['pants'] = {
-        'id': canvas.create_rectangle(
+        'id': render.create_rectangle(
             pants_left, pants_top, pants_right, pants_bottom,
             specs['pants']['color']
         ),
@@ -1173,7 +1032,7 @@ def move_character(character: Dict, new_position: Tuple[int, int], game_state: G
     shirt_bottom = pants_top
     
     character['parts']['shirt'] = {
-        'id': canvas.create_rectangle(
+        'id': render.create_rectangle(
             shirt_left, shirt_top, shirt_right, shirt_bottom,
             specs['shirt']['color']
         ),
@@ -1190,7 +1049,7 @@ def move_character(character: Dict, new_position: Tuple[int, int], game_state: G
     head_bottom = shirt_top
     
     character['parts']['head'] = {
-        'id': canvas.create_oval(
+        'id': render.create_oval(
             head_left, head_top, head_right, head_bottom,
             specs['head']['color']
         ),
@@ -1203,7 +1062,7 @@ def move_character(character: Dict, new_position: Tuple[int, int], game_state: G
     # Handle whompus visibility
     if character['type'] == 'whompus':
         for part in character['parts'].values():
-            canvas.set_hidden(part['id'], True)
+            render.set_hidden(part['id'], True)
     
     return character
 
@@ -1222,9 +1081,8 @@ def format_ai_response(ai_name: str, response: str) -> str:
 def show_game_rules(canvas: Canvas, game_state: GameState):
     """Display the game rules with move count and return option"""
 
-    print(f"        GAME RULES (Moves: {game_state.player_moves})")
-    
-    rules = """MOVEMENT:
+    rules = f"""        GAME RULES (Moves: {game_state.player_moves})
+MOVEMENT:
 - Use arrow keys to move between rooms
 - The Whompus moves faster as you make more moves
 - After 30 moves: Whompus moves every other turn
@@ -1247,35 +1105,57 @@ WINNING:
 
 Press 'B' to return to the game..."""
     
-    print(rules)
+    screen.set_region('menu', [rules])
+    screen.flush()
+    
+    # Clickable back button under the info bar
+    rules_menu = WidgetLayer(canvas)
+    rules_menu.create_button(150, 460, 250, 490, "Back (B)", 'back', font_size=12)
     
-    # Wait for 'B' key to return to game
+    # Wait for 'B' key or a click on Back to return to game
     while True:
         key = canvas.get_last_key_press()
-        if key in ['B', 'b']:
+        if key in ['B', 'b'] or rules_menu.poll() == 'back':
             break
         time.sleep(0.1)
+    rules_menu.clear()
 #######################################################################################
 ######################## SHOW GAME MENU#######################################################################################
 #######################################################################################
 def show_game_menu(game_state: GameState):
     """Display the game menu with move count"""
-    print(f"\n=== WHOMPUS 2.0 (Moves: {game_state.player_moves}) ===")
-    print("\nMOVE (M) - Use arrow keys to navigate")
-    print("ASK (A)  - Question an AI about nearby rooms")
-    print("INFO (I) - View game rules")
-    print("\nEnter your choice (M/A/I): ", end="")     
+    screen.set_region('menu', [
+        f"=== WHOMPUS 2.0 (Moves: {game_state.player_moves}) ===",
+        "",
+        "MOVE (M) - Use arrow keys to navigate",
+        "ASK (A)  - Question an AI about nearby rooms",
+        "INFO (I) - View game rules",
+        "",
+        "Enter your choice (M/A/I): "
+    ])
+    screen.flush()
 ################################################################################################
 ########## Show ai options to the player ######################################
 ################################################################################################
-def show_ai_options(game_state: GameState):
-    """Display AI selection menu with move count"""
-    print(f"\n=== SELECT AN AI (Moves: {game_state.player_moves}) ===")
-    print("\n1. ALI  - One of three AIs that may help or mislead")
-    print("2. AN   - Another AI that may tell truth or lies")
-    print("3. ALE  - The third AI, choose questions carefully")
-    print("4. Back - Return to main menu (B)")
-    print("\nEnter your choice (1-4 or B): ", end="")
+def show_ai_options(game_state: GameState) -> WidgetLayer:
+    """Display AI selection menu with move count and return its clickable buttons"""
+    screen.set_region('menu', [
+        f"=== SELECT AN AI (Moves: {game_state.player_moves}) ===",
+        "",
+        "1. ALI  - One of three AIs that may help or mislead",
+        "2. AN   - Another AI that may tell truth or lies",
+        "3. ALE  - The third AI, choose questions carefully",
+        "4. Back - Return to main menu (B)",
+        "",
+        "Enter your choice (1-4 or B): "
+    ])
+    screen.flush()
+    
+    # Same choices as clickable buttons under the info bar
+    ai_menu = WidgetLayer(canvas)
+    for i, (label, action) in enumerate([('ALI', '1'), ('AN', '2'), ('ALE', '3'), ('Back', 'B')]):
+        ai_menu.create_button(20 + i * 95, 460, 95 + i * 95, 490, label, action, font_size=12)
+    return ai_menu
 ################################################################################################
 ########## Turn player into whompus ######################################
 ################################################################################################
@@ -1283,9 +1163,9 @@ def show_ai_options(game_state: GameState):
 def transform_player_to_whompus(player: Dict):
     # Get the current colors
     current_colors = {
-        'pants': canvas.get_fill_color(player['parts']['pants']['id']),
-        'shirt': canvas.get_fill_color(player['parts']['shirt']['id']),
-        'head': canvas.get_fill_color(player['parts']['head']['id'])
+        'pants': render.get_fill_color(player['parts']['pants']['id']),
+        'shirt': render.get_fill_color(player['parts']['shirt']['id']),
+        'head': render.get_fill_color(player['parts']['head']['id'])
     }
     
     # Number of steps for the transformation
@@ -1296,7 +1176,8 @@ def transform_player_to_whompus(player: Dict):
             # Create a gradient from current color to black
             current_color = current_colors[part_name]
             # For simplicity, we'll just make it darker each step
-            canvas.set_fill_color(player['parts'][part_name]['id'], 'black')
+            render.set_fill_color(player['parts'][part_name]['id'], 'black')
+        render.flush()
         
         # Wait a bit between each step
         time.sleep(0.1)    
@@ -1304,7 +1185,9 @@ def transform_player_to_whompus(player: Dict):
 ########## Play a single round of the game ######################################
 ################################################################################################
 
-def play_round(game_state: GameState, player: Dict, whompus: Dict, info_bar: InfoBar) -> str:
+def play_round(game_state: GameState, player: Dict, whompus: Dict, info_bar: InfoBar,
+               ai_memories: Optional[Dict[str, ConversationMemory]] = None,
+               whompus_controller: Callable = whompus_move) -> str:
     """Play a single round of the game with improved move tracking"""
     info_bar.waiting_for_acknowledgment = False
     show_game_menu(game_state)
@@ -1318,21 +1201,22 @@ def play_round(game_state: GameState, player: Dict, whompus: Dict, info_bar: Inf
     
     if key in ['I', 'i']:
         game_state.increment_moves('view_rules')
-        show_game_rules(game_state)
+        show_game_rules(canvas, game_state)
         game_state.complete_action()
         return 'continue'
     
     elif key in ['A', 'a']:
-        show_ai_options(game_state)
+        ai_menu = show_ai_options(game_state)
         
         selected_ai = None
         while True:
-            key = canvas.get_last_key_press()
+            key = canvas.get_last_key_press() or ai_menu.poll()
             if key in ['1', '2', '3', '4', 'B', 'b']:
                 if key in ['1', '2', '3']:
                     selected_ai = {'1': 'ALI', '2': 'AN', '3': 'ALE'}[key]
                 break
             time.sleep(0.1)
+        ai_menu.clear()
         
         if not selected_ai:
             show_game_menu(game_state)
@@ -1347,7 +1231,8 @@ def play_round(game_state: GameState, player: Dict, whompus: Dict, info_bar: Inf
             return 'continue'
         
         try:
-            response = get_ai_response(selected_ai, question, game_state, info_bar)
+            memory = ai_memories.get(selected_ai) if ai_memories else None
+            response = get_ai_response(selected_ai, question, game_state, info_bar, memory)
             while canvas.get_last_key_press():
                 time.sleep(0.1)
             show_game_menu(game_state)
@@ -1362,9 +1247,12 @@ def play_round(game_state: GameState, player: Dict, whompus: Dict, info_bar: Inf
     elif key in ['M', 'm']:
         game_state.increment_moves('move')
         valid_moves = get_valid_moves(game_state.player_position)
-        print("\n=== Movement ===")
-        print(f"Valid moves: {', '.join(valid_moves)}")
-        print("Use arrow keys to move")
+        screen.set_region('menu', [
+            "=== Movement ===",
+            f"Valid moves: {', '.join(valid_moves)}",
+            "Use arrow keys to move"
+        ])
+        screen.flush()
         
         key_map = {
             'ArrowUp': 'UP',
@@ -1390,29 +1278,28 @@ def play_round(game_state: GameState, player: Dict, whompus: Dict, info_bar: Inf
         
         room_status = check_room_status(new_position, game_state)
         if room_status == 'trap':
-            show_trap(new_position[0], new_position[1])
-            print("\n=== Game Over ===")
-            print("You fell into a trap!")
+            show_trap(new_position[0], new_position[1], render)
+            screen.add_message("=== Game Over ===\nYou fell into a trap!")
+            screen.flush()
             game_state.game_over = True
             game_state.complete_action()
             return 'trap'
         elif room_status == 'whompus':
-            print("\n=== Game Over ===")
-            print("The Whompus caught you!")
+            screen.add_message("=== Game Over ===\nThe Whompus caught you!")
+            screen.flush()
             game_state.game_over = True
             game_state.complete_action()
             return 'whompus'
         
-        new_whompus_position = whompus_move(game_state, game_state.player_position)
+        new_whompus_position = whompus_controller(game_state, game_state.player_position)
         if new_whompus_position != game_state.whompus_position:
             move_character(whompus, new_whompus_position, game_state)
             game_state.whompus_position = new_whompus_position
             game_state.whompus_moves += 1
             
             if new_whompus_position == game_state.player_position:
-                clear_terminal()
-                print("\n=== Game Over ===")
-                print("The Whompus caught you!")
+                screen.add_message("=== Game Over ===\nThe Whompus caught you!")
+                screen.flush()
                 game_state.game_over = True
                 game_state.complete_action()
                 return 'whompus'
@@ -1426,8 +1313,10 @@ def play_round(game_state: GameState, player: Dict, whompus: Dict, info_bar: Inf
 ################################################################################################
 ########## MAIN GAME LOOP ######################################
 ################################################################################################
-def main():
+def main(whompus_controller: Callable = whompus_move):
     """Main game loop with menu system"""
+    # Finished games are kept in a local SQLite file
+    history = GameHistory()
     while True:
         # Show main menu and get selection
         choice = show_main_menu()
@@ -1440,8 +1329,12 @@ def main():
         # Create the game board
         make_the_board()
         
-        # Create info bar
-        info_bar = InfoBar(canvas)
+        # Create info bar; it draws through the render queue
+        render.reset()
+        info_bar = InfoBar(render)
+        
+        # Each AI remembers this game's conversation
+        ai_memories = create_ai_memories()
         
         # Show intro if selected
         if choice == 'with_intro':
@@ -1468,12 +1361,26 @@ def main():
         while game_active and not game_state.game_over:
             # Update info bar at the start of each round
             info_bar.update(game_state)
+            render.flush()
             
-            result = play_round(game_state, player, whompus, info_bar)
+            result = play_round(game_state, player, whompus, info_bar, ai_memories, whompus_controller)
+            
+            # Everything drawn during the turn reaches the canvas in one batch
+            render.flush()
+            if '--render-stats' in sys.argv:
+                requested, issued = render.last_frame
+                screen.add_message(f"Canvas calls this turn: {requested} requested, {issued} issued")
+                screen.flush()
             
             if result in ['trap', 'whompus']:
+                # Let a remote whompus player know how it ended
+                if hasattr(whompus_controller, 'finish'):
+                    whompus_controller.finish(game_state, result)
+                history.record(game_state, result)
                 # Show game over screen
                 show_game_over_screen(result)
+                # Write the result while the player is back at the menu
+                history.flush()
                 # Set game_active to False to exit the game loop
                 game_active = False
         
@@ -1493,4 +1400,15 @@ def main():
 ################################################################################################
 
 if __name__ == '__main__':
-    main()
+    if '--memory-report' in sys.argv:
+        for name, value in state_memory_report().items():
+            print(f"{name}: {value:.1f}")
+    elif '--host' in sys.argv:
+        # Two player mode: someone else controls the whompus over the network
+        port = int(sys.argv[sys.argv.index('--host') + 1])
+        controller = RemoteWhompusController(port)
+        print(f"Waiting for the Whompus player on port {controller.port}...")
+        controller.wait_for_guest()
+        main(controller)
+    else:
+        main()
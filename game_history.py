@@ -0,0 +1,139 @@
+"""
+SQLite game history and leaderboard for WHOMPUS HUNT 2.0
+
+Finished games are queued in memory and written with executemany in one
+transaction per batch. The table is indexed on (outcome, player_moves) and
+on player_moves, so the leaderboard and "how did I die most often" queries
+read the index instead of scanning every game.
+
+    python game_history.py whompus_history.db    # leaderboard and causes of death
+"""
+from typing import List, Optional, Tuple
+import sqlite3
+import sys
+import time
+
+DEFAULT_PATH = 'whompus_history.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    played_at REAL NOT NULL,
+    outcome TEXT NOT NULL,
+    player_moves INTEGER NOT NULL,
+    whompus_moves INTEGER NOT NULL,
+    ali_role TEXT,
+    an_role TEXT,
+    ale_role TEXT,
+    player TEXT NOT NULL DEFAULT 'human'
+);
+CREATE INDEX IF NOT EXISTS idx_games_outcome_moves ON games (outcome, player_moves);
+CREATE INDEX IF NOT EXISTS idx_games_moves ON games (player_moves);
+"""
+
+INSERT = """
+INSERT INTO games (played_at, outcome, player_moves, whompus_moves, ali_role, an_role, ale_role, player)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def game_row(game_state, outcome: str, player: str = 'human') -> Tuple:
+    """One row for a finished game"""
+    roles = game_state.ai_roles
+    return (
+        time.time(), outcome, game_state.player_moves, game_state.whompus_moves,
+        roles.get('ALI'), roles.get('AN'), roles.get('ALE'), player
+    )
+
+
+class GameHistory:
+    """Batched writer and indexed queries over finished games"""
+    def __init__(self, path: str = DEFAULT_PATH, batch_size: int = 500):
+        self.path = path
+        self.batch_size = batch_size
+        self.pending: List[Tuple] = []
+        self.connection = sqlite3.connect(path)
+        # WAL keeps readers and the writer from blocking each other, and
+        # NORMAL only syncs at checkpoints, which is plenty for game results
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def record(self, game_state, outcome: str, player: str = 'human'):
+        """Queue a finished game; it is written when the batch fills up or on flush()"""
+        self.pending.append(game_row(game_state, outcome, player))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def record_rows(self, rows: List[Tuple]):
+        """Queue rows built with game_row(), e.g. sent back from tournament workers"""
+        self.pending.extend(rows)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write every queued game in a single transaction"""
+        if not self.pending:
+            return
+        with self.connection:
+            self.connection.executemany(INSERT, self.pending)
+        self.pending.clear()
+
+    def close(self):
+        self.flush()
+        self.connection.close()
+
+    ################################################################################################
+    ################ Queries ######################################
+    ################################################################################################
+    def leaderboard(self, limit: int = 10, player: Optional[str] = None) -> List[Tuple]:
+        """Longest games first: (player_moves, outcome, whompus_moves, played_at)"""
+        self.flush()
+        if player is None:
+            return self.connection.execute(
+                "SELECT player_moves, outcome, whompus_moves, played_at FROM games "
+                "ORDER BY player_moves DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return self.connection.execute(
+            "SELECT player_moves, outcome, whompus_moves, played_at FROM games "
+            "WHERE player = ? ORDER BY player_moves DESC LIMIT ?", (player, limit)
+        ).fetchall()
+
+    def death_counts(self) -> List[Tuple[str, int]]:
+        """How often each outcome happened, most common first"""
+        self.flush()
+        return self.connection.execute(
+            "SELECT outcome, COUNT(*) AS games FROM games "
+            "GROUP BY outcome ORDER BY games DESC"
+        ).fetchall()
+
+    def most_common_death(self) -> Optional[str]:
+        """'trap' or 'whompus', whichever has killed the player more often"""
+        deaths = [row for row in self.death_counts() if row[0] != 'survived']
+        return deaths[0][0] if deaths else None
+
+    def mean_moves(self, outcome: str) -> float:
+        """Average moves for games with this outcome"""
+        self.flush()
+        value, = self.connection.execute(
+            "SELECT AVG(player_moves) FROM games WHERE outcome = ?", (outcome,)
+        ).fetchone()
+        return value or 0.0
+
+
+if __name__ == '__main__':
+    history = GameHistory(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH)
+    started = time.perf_counter()
+    top = history.leaderboard()
+    leaderboard_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    deaths = history.death_counts()
+    deaths_ms = (time.perf_counter() - started) * 1000
+
+    print(f"Leaderboard ({leaderboard_ms:.1f} ms):")
+    for rank, (moves, outcome, whompus_moves, played_at) in enumerate(top, 1):
+        print(f"{rank:>3}. {moves} moves, ended by {outcome}")
+    print(f"Outcomes ({deaths_ms:.1f} ms):")
+    for outcome, games in deaths:
+        print(f"  {outcome}: {games}")
+    history.close()
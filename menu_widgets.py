@@ -0,0 +1,133 @@
+"""
+Clickable regions for the WHOMPUS menus
+
+Buttons are registered once with the bounds they were drawn at. Those
+bounds go into a coarse grid (a simple spatial index), so working out which
+button is under the mouse only looks at the buttons in one grid cell, and
+never asks the canvas where anything is.
+"""
+from typing import Dict, List, Optional, Tuple
+import time
+
+CELL_SIZE = 40  # Same as a room, so the grid lines up with the board
+
+
+class Button:
+    """A clickable region, optionally drawn as a box with a text label"""
+    def __init__(self, bounds: Tuple[float, float, float, float], action,
+                 box_id: Optional[int] = None, text_id: Optional[int] = None,
+                 colors: Optional[Dict[str, str]] = None):
+        self.bounds = bounds  # (left, top, right, bottom), cached once
+        self.action = action
+        self.box_id = box_id
+        self.text_id = text_id
+        self.colors = colors or {}
+        self.hover = False
+
+    def contains(self, x: float, y: float) -> bool:
+        left, top, right, bottom = self.bounds
+        return left <= x <= right and top <= y <= bottom
+
+
+class WidgetLayer:
+    """Keeps the buttons for one screen and dispatches hover and clicks"""
+    def __init__(self, canvas, cell_size: int = CELL_SIZE):
+        self.canvas = canvas
+        self.cell_size = cell_size
+        self.buttons: List[Button] = []
+        self.grid: Dict[Tuple[int, int], List[Button]] = {}
+        self.hovered: Optional[Button] = None
+
+    def _cells(self, bounds: Tuple[float, float, float, float]):
+        left, top, right, bottom = bounds
+        for cell_x in range(int(left // self.cell_size), int(right // self.cell_size) + 1):
+            for cell_y in range(int(top // self.cell_size), int(bottom // self.cell_size) + 1):
+                yield cell_x, cell_y
+
+    def add(self, button: Button) -> Button:
+        """Register a button; later buttons sit on top of earlier ones"""
+        self.buttons.append(button)
+        for cell in self._cells(button.bounds):
+            self.grid.setdefault(cell, []).append(button)
+        return button
+
+    def add_region(self, left: float, top: float, right: float, bottom: float, action) -> Button:
+        """Register an invisible clickable area"""
+        return self.add(Button((left, top, right, bottom), action))
+
+    def create_button(self, left: float, top: float, right: float, bottom: float,
+                      label: str, action, text_x: Optional[float] = None,
+                      text_y: Optional[float] = None, font_size: int = 16) -> Button:
+        """Draw a box with a label in the menu colors and register it"""
+        colors = {
+            'box': 'black', 'box_hover': 'red',
+            'text': 'white', 'text_hover': 'black'
+        }
+        box_id = self.canvas.create_rectangle(left, top, right, bottom, colors['box'], 'red')
+        text_id = self.canvas.create_text(
+            text_x if text_x is not None else left + 10,
+            text_y if text_y is not None else (top + bottom) // 2,
+            text=label,
+            font='Arial',
+            font_size=font_size,
+            color=colors['text']
+        )
+        return self.add(Button((left, top, right, bottom), action, box_id, text_id, colors))
+
+    def hit_test(self, x: float, y: float) -> Optional[Button]:
+        """Return the top-most button under (x, y)"""
+        cell = (int(x // self.cell_size), int(y // self.cell_size))
+        for button in reversed(self.grid.get(cell, ())):
+            if button.contains(x, y):
+                return button
+        return None
+
+    def _set_hover(self, button: Button, hover: bool):
+        button.hover = hover
+        if button.box_id is not None:
+            self.canvas.set_color(button.box_id, button.colors['box_hover' if hover else 'box'])
+        if button.text_id is not None:
+            self.canvas.set_color(button.text_id, button.colors['text_hover' if hover else 'text'])
+
+    def update_hover(self, x: Optional[float], y: Optional[float]):
+        """Recolor only the buttons the mouse entered or left"""
+        button = self.hit_test(x, y) if x is not None and y is not None else None
+        if button is self.hovered:
+            return
+        if self.hovered is not None:
+            self._set_hover(self.hovered, False)
+        if button is not None:
+            self._set_hover(button, True)
+        self.hovered = button
+
+    def dispatch_click(self, click) -> Optional[object]:
+        """Return the action of the button under a click, if any"""
+        if not click:
+            return None
+        button = self.hit_test(click[0], click[1])
+        if button is None:
+            return None
+        return button.action() if callable(button.action) else button.action
+
+    def poll(self) -> Optional[object]:
+        """Handle one frame of hover and clicks, returning a clicked action"""
+        self.update_hover(self.canvas.get_mouse_x(), self.canvas.get_mouse_y())
+        return self.dispatch_click(self.canvas.get_last_click())
+
+    def wait_for_action(self, delay: float = 0.1):
+        """Poll every `delay` seconds until a button is clicked"""
+        while True:
+            action = self.poll()
+            if action is not None:
+                return action
+            time.sleep(delay)
+
+    def clear(self):
+        """Remove the drawn buttons and forget every region"""
+        for button in self.buttons:
+            for item_id in (button.box_id, button.text_id):
+                if item_id is not None:
+                    self.canvas.delete(item_id)
+        self.buttons.clear()
+        self.grid.clear()
+        self.hovered = None
@@ -0,0 +1,134 @@
+"""
+Batched canvas updates for WHOMPUS HUNT 2.0
+
+RenderQueue has the same drawing methods as the canvas, but only records
+the calls. Creating an object hands back a placeholder id straight away.
+Calls that cancel out are dropped before anything reaches the canvas: an
+object created and deleted in the same frame is never drawn, and only the
+last of several recolors of one object is kept. flush() then makes the
+remaining calls in their original order.
+
+Placeholder ids keep working after the flush: each one holds the real
+canvas id it was given, so code can store them like normal ids, and the
+queue keeps no table of them that would grow over a long game. Anything
+that is not a drawing call (mouse, keys, queries) goes straight to the
+canvas.
+"""
+from typing import Dict, List, Tuple
+
+# Calls that create a new object and return its id
+CREATE_METHODS = ('create_rectangle', 'create_oval', 'create_text', 'create_polygon', 'create_line')
+
+# Calls that change one property of an object; only the last one per object counts
+SET_METHODS = ('set_color', 'set_fill_color', 'set_outline_color', 'set_hidden', 'change_text')
+
+
+class Placeholder:
+    """Id handed out for a queued create; `real` is the canvas id once flushed"""
+    __slots__ = ('real',)
+
+    def __init__(self):
+        self.real = None
+
+
+class RenderQueue:
+    """Collects the canvas calls for a frame and issues them in one batch"""
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.ops: List[list] = []
+        self.pending_creates: Dict[Placeholder, list] = {}
+        self.pending_sets: Dict[Tuple[object, str], list] = {}
+        self.frame_requested = 0
+        self.last_frame = (0, 0)  # (calls requested, calls issued) for the last flush
+        self.totals = {'requested': 0, 'issued': 0, 'frames': 0}
+
+    @staticmethod
+    def _real(item_id):
+        return item_id.real if isinstance(item_id, Placeholder) else item_id
+
+    def _create(self, method: str, *args, **kwargs) -> Placeholder:
+        self.frame_requested += 1
+        placeholder = Placeholder()
+        op = ['create', placeholder, method, args, kwargs]
+        self.ops.append(op)
+        self.pending_creates[placeholder] = op
+        return placeholder
+
+    def _set(self, method: str, item_id, *args):
+        self.frame_requested += 1
+        op = self.pending_sets.get((item_id, method))
+        if op is not None:
+            # A later change of the same property replaces the earlier one
+            op[3] = args
+            return
+        op = ['set', item_id, method, args]
+        self.ops.append(op)
+        self.pending_sets[(item_id, method)] = op
+
+    def delete(self, item_id):
+        self.frame_requested += 1
+        # Nothing queued for a deleted object needs to happen
+        for key in [key for key in self.pending_sets if key[0] == item_id]:
+            self.pending_sets.pop(key)[0] = 'skip'
+        create = self.pending_creates.pop(item_id, None)
+        if create is not None:
+            # Created and deleted in the same frame: never draw it
+            create[0] = 'skip'
+            return
+        self.ops.append(['delete', item_id])
+
+    def __getattr__(self, name: str):
+        if name in CREATE_METHODS:
+            return lambda *args, **kwargs: self._create(name, *args, **kwargs)
+        if name in SET_METHODS:
+            return lambda item_id, *args: self._set(name, item_id, *args)
+        # Queries and input go straight through, after flushing so they see the frame
+        attribute = getattr(self.canvas, name)
+        if not callable(attribute):
+            return attribute
+
+        def passthrough(*args, **kwargs):
+            self.flush()
+            if args:
+                args = (self._real(args[0]),) + args[1:]
+            return attribute(*args, **kwargs)
+        return passthrough
+
+    def flush(self):
+        """Issue every queued call that survived cancelling, in order"""
+        if not self.ops:
+            return
+        issued = 0
+        for op in self.ops:
+            kind = op[0]
+            if kind == 'create':
+                _, placeholder, method, args, kwargs = op
+                placeholder.real = getattr(self.canvas, method)(*args, **kwargs)
+            elif kind == 'set':
+                _, item_id, method, args = op
+                getattr(self.canvas, method)(self._real(item_id), *args)
+            elif kind == 'delete':
+                self.canvas.delete(self._real(op[1]))
+            else:
+                continue
+            issued += 1
+        self.ops.clear()
+        self.pending_creates.clear()
+        self.pending_sets.clear()
+        self.last_frame = (self.frame_requested, issued)
+        self.totals['requested'] += self.frame_requested
+        self.totals['issued'] += issued
+        self.totals['frames'] += 1
+        self.frame_requested = 0
+
+    def reset(self):
+        """Forget anything queued, e.g. when a new game starts"""
+        self.ops.clear()
+        self.pending_creates.clear()
+        self.pending_sets.clear()
+        self.frame_requested = 0
+
+    def clear(self):
+        """Drop anything queued and clear the canvas"""
+        self.reset()
+        self.canvas.clear()
@@ -0,0 +1,123 @@
+"""
+Double-buffered terminal screen for the WHOMPUS text menus
+
+The screen is split into named regions (menu, messages, prompt). Changes go
+into the next frame; flush() compares it with the frame already on the
+terminal and writes only the lines that differ, in one buffered write.
+The messages region keeps the last few AI answers in place instead of
+letting them scroll away. In quiet mode nothing is written at all.
+
+    python terminal_screen.py    # bytes written per round, reprint vs. diff
+"""
+from collections import deque
+from typing import Dict, Iterable, List
+import io
+import sys
+
+CLEAR_SCREEN = "\x1b[2J"
+CLEAR_LINE = "\x1b[K"
+
+
+def _move_to(line: int) -> str:
+    return f"\x1b[{line + 1};1H"
+
+
+class TerminalScreen:
+    """Keeps the previous frame and redraws only changed lines"""
+    REGIONS = ('menu', 'messages', 'prompt')
+
+    def __init__(self, stream=None, quiet: bool = False, message_lines: int = 12):
+        self.stream = stream if stream is not None else sys.stdout
+        self.quiet = quiet
+        self.regions: Dict[str, List[str]] = {name: [] for name in self.REGIONS}
+        self.messages = deque(maxlen=message_lines)
+        self.previous: List[str] = []
+        self.first_frame = True
+        self.bytes_written = 0
+        self.flushes = 0
+
+    def set_region(self, name: str, lines: Iterable[str]):
+        """Replace the lines of one region in the next frame"""
+        self.regions[name] = [line for text in lines for line in str(text).split("\n")]
+
+    def add_message(self, text: str):
+        """Add a message; only the newest `message_lines` lines stay on screen"""
+        for line in text.strip("\n").split("\n"):
+            self.messages.append(line)
+        self.regions['messages'] = list(self.messages)
+
+    def frame(self) -> List[str]:
+        """The full frame: each non-empty region followed by a blank line"""
+        lines = []
+        for name in self.REGIONS:
+            if self.regions[name]:
+                lines.extend(self.regions[name])
+                lines.append("")
+        return lines
+
+    def flush(self):
+        """Write the lines that changed since the last flush in a single write"""
+        if self.quiet:
+            return
+        lines = self.frame()
+        out = io.StringIO()
+        if self.first_frame:
+            out.write(CLEAR_SCREEN)
+            self.previous = []
+            self.first_frame = False
+        for number, line in enumerate(lines):
+            if number >= len(self.previous) or self.previous[number] != line:
+                out.write(_move_to(number) + line + CLEAR_LINE)
+        # Blank out lines left over from a longer previous frame
+        for number in range(len(lines), len(self.previous)):
+            out.write(_move_to(number) + CLEAR_LINE)
+        out.write(_move_to(len(lines)))
+        text = out.getvalue()
+        self.previous = lines
+        self.stream.write(text)
+        self.stream.flush()
+        self.bytes_written += len(text.encode())
+        self.flushes += 1
+
+    def input(self, prompt: str = "> ") -> str:
+        """Flush, then read a line at the bottom of the frame"""
+        self.flush()
+        answer = input(prompt)
+        # The typed line scrolled the terminal, so redraw everything next time
+        self.first_frame = True
+        return answer
+
+
+def measure_round_io(rounds: int = 100) -> Dict[str, float]:
+    """Bytes per round for the old print-everything approach vs. the diffed screen"""
+    menu = [
+        "=== WHOMPUS 2.0 (Moves: {moves}) ===", "",
+        "MOVE (M) - Use arrow keys to navigate",
+        "ASK (A)  - Question an AI about nearby rooms",
+        "INFO (I) - View game rules", "",
+        "Enter your choice (M/A/I): "
+    ]
+    answer = "=== ALI's Response ===\n*adjusts robes* There are no traps in the rooms adjacent to you."
+
+    printed = io.StringIO()
+    for moves in range(rounds):
+        printed.write("\n".join(line.format(moves=moves) for line in menu) + "\n")
+        printed.write("\n" + answer + "\n\n")
+
+    screen = TerminalScreen(stream=io.StringIO())
+    for moves in range(rounds):
+        screen.set_region('menu', [line.format(moves=moves) for line in menu])
+        if moves % 10 == 0:
+            screen.add_message(answer)
+        screen.flush()
+
+    return {
+        'print_bytes_per_round': len(printed.getvalue().encode()) / rounds,
+        'screen_bytes_per_round': screen.bytes_written / rounds,
+        'writes_per_round': screen.flushes / rounds
+    }
+
+
+if __name__ == '__main__':
+    for name, value in measure_round_io().items():
+        print(f"{name}: {value:.1f}")
@@ -0,0 +1,158 @@
+"""
+ResilientCaller and CircuitBreaker against a flaky fake backend.
+
+Run from the repository root:
+    python -m pytest tests/test_ai_resilience.py
+"""
+import sys
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from ai_resilience import (
+    CLOSED, HALF_OPEN, OPEN, AICallTimeout, CircuitBreaker, CircuitOpenError, ResilientCaller
+)
+
+
+class FlakyBackend:
+    """Fake call_gpt that fails, hangs or answers according to a script of outcomes"""
+    def __init__(self, script, hang_seconds: float = 1.0):
+        self.script = list(script)
+        self.hang_seconds = hang_seconds
+        self.calls = 0
+
+    def __call__(self, prompt: str) -> str:
+        outcome = self.script[self.calls] if self.calls < len(self.script) else 'ok'
+        self.calls += 1
+        if outcome == 'fail':
+            raise ConnectionError("backend down")
+        if outcome == 'hang':
+            time.sleep(self.hang_seconds)
+        return f"answer to: {prompt}"
+
+
+class MaxJitter:
+    """rng whose uniform() always returns the top of the range, so backoff is predictable"""
+    @staticmethod
+    def uniform(low, high):
+        return high
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_caller(script, threshold=3, retries=2, timeout=1.0, hang_seconds=1.0):
+    clock = Clock()
+    sleeps = []
+    backend = FlakyBackend(script, hang_seconds)
+    breaker = CircuitBreaker(failure_threshold=threshold, reset_timeout=30.0, clock=clock)
+    caller = ResilientCaller(backend, timeout=timeout, retries=retries, base_delay=0.5, max_delay=4.0,
+                             breaker=breaker, rng=MaxJitter(), sleep=sleeps.append)
+    return caller, backend, breaker, clock, sleeps
+
+
+class RetryTests(unittest.TestCase):
+    def test_retries_with_exponential_backoff_then_answers(self):
+        caller, backend, _, _, sleeps = make_caller(['fail', 'fail', 'ok'], threshold=10)
+        self.assertEqual(caller("q"), "answer to: q")
+        self.assertEqual(backend.calls, 3)
+        self.assertEqual(sleeps, [0.5, 1.0])
+        self.assertEqual(caller.counters, {'calls': 1, 'successes': 1, 'failures': 0, 'timeouts': 0, 'retries': 2})
+
+    def test_gives_up_after_the_retry_budget(self):
+        caller, backend, breaker, _, sleeps = make_caller(['fail'] * 5, threshold=10, retries=2)
+        with self.assertRaises(ConnectionError):
+            caller("q")
+        self.assertEqual(backend.calls, 3)
+        self.assertEqual(len(sleeps), 2)
+        self.assertEqual(caller.counters['failures'], 1)
+        self.assertEqual(breaker.state, CLOSED)
+
+    def test_backoff_is_capped(self):
+        caller = make_caller([])[0]
+        self.assertEqual([caller.backoff(attempt) for attempt in range(6)], [0.5, 1.0, 2.0, 4.0, 4.0, 4.0])
+
+    def test_backoff_is_jittered_below_the_cap(self):
+        caller = ResilientCaller(FlakyBackend([]), base_delay=0.5, max_delay=4.0)
+        for attempt in range(6):
+            self.assertTrue(0 <= caller.backoff(attempt) <= min(4.0, 0.5 * 2 ** attempt))
+
+
+class TimeoutTests(unittest.TestCase):
+    def test_a_hung_attempt_times_out(self):
+        caller, backend, _, _, _ = make_caller(['hang'], threshold=10, retries=0, timeout=0.05, hang_seconds=0.5)
+        start = time.monotonic()
+        with self.assertRaises(AICallTimeout):
+            caller("q")
+        self.assertLess(time.monotonic() - start, 0.4)
+        self.assertEqual(caller.counters['timeouts'], 1)
+
+    def test_a_timeout_is_retried(self):
+        caller, backend, _, _, sleeps = make_caller(['hang', 'ok'], threshold=10, timeout=0.05, hang_seconds=0.5)
+        self.assertEqual(caller("q"), "answer to: q")
+        self.assertEqual(backend.calls, 2)
+        self.assertEqual(caller.counters['timeouts'], 1)
+        self.assertEqual(sleeps, [0.5])
+
+
+class BreakerTests(unittest.TestCase):
+    def test_closed_open_reject_probe_close(self):
+        caller, backend, breaker, clock, sleeps = make_caller(['fail', 'fail', 'fail', 'fail', 'ok'])
+
+        # three failures in a row open it; the retries stop there
+        with self.assertRaises(ConnectionError):
+            caller("q")
+        self.assertEqual(breaker.state, OPEN)
+        self.assertEqual(backend.calls, 3)
+        self.assertEqual(breaker.counters['open_rejections'], 0)
+
+        # open: refused without calling the backend
+        with self.assertRaises(CircuitOpenError):
+            caller("q")
+        self.assertEqual(backend.calls, 3)
+        self.assertEqual(breaker.counters['open_rejections'], 1)
+
+        # after reset_timeout one probe goes through; it fails, so it opens again without retrying
+        clock.now += 31
+        with self.assertRaises(ConnectionError):
+            caller("q")
+        self.assertEqual(backend.calls, 4)
+        self.assertEqual(breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError):
+            caller("q")
+
+        # the next probe answers and closes it
+        clock.now += 31
+        self.assertEqual(caller("q"), "answer to: q")
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(caller("q"), "answer to: q")
+        self.assertEqual(backend.calls, 6)
+
+        self.assertEqual(sleeps, [0.5, 1.0])
+        self.assertEqual(breaker.counters, {
+            'closed_calls': 2, 'open_rejections': 2, 'half_open_probes': 2, 'times_opened': 2, 'times_closed': 1,
+        })
+        self.assertEqual(caller.counters, {'calls': 6, 'successes': 2, 'failures': 4, 'timeouts': 0, 'retries': 2})
+        self.assertEqual(caller.stats()['state'], CLOSED)
+
+    def test_only_one_probe_while_half_open(self):
+        clock = Clock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0, clock=clock)
+        breaker.allow()
+        breaker.record_failure()
+        clock.now += 30
+        self.assertTrue(breaker.allow())
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertFalse(breaker.allow())
+        self.assertEqual(breaker.counters['half_open_probes'], 1)
+        self.assertEqual(breaker.counters['open_rejections'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,1950 @@
+"""
+Headless task model for the To-Do app
+
+Everything in here works without Tk: tasks and their indexes, saved
+views, the SQLite store, the journal, autosave, import/export, the day planner, overdue
+tracking, and TodoList, which ties them together into the operations the
+window in My_to_do_list_app.py calls. It can be imported, scripted and
+benchmarked on a machine without a display.
+"""
+import bisect
+import calendar
+import csv
+import heapq
+import itertools
+import json
+import mmap
+import operator
+import os
+import re
+from array import array
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from datetime import date, timedelta
+
+_task_ids = itertools.count(1)
+
+
+def _reserve_ids(last: int):
+    """Make new Tasks start after `last`, the highest id already saved"""
+    global _task_ids
+    _task_ids = itertools.count(max(last, next(_task_ids)) + 1)
+
+# ───── data model ───────────────────────────────────────────────
+@dataclass(slots=True)  # no per-task __dict__
+class Task:
+    text: str
+    done: bool = False
+    priority: int = 2              # 1=High,2=Med,3=Low
+    due: date | None = None
+    category: str = ""
+    est_min: int = 0               # estimated minutes
+    hard: bool = False              # New: hard vs soft deadline checkbox
+    repeat: str = ""               # "", "daily", "weekly" or "monthly"; due is the next occurrence
+    id: int = field(default_factory=lambda: next(_task_ids), compare=False)  # stable, used as the Treeview item id
+
+    def __post_init__(self):
+        self.category = sys.intern(self.category)  # a handful of categories shared by many tasks
+
+    # for Treeview we expose a tuple representation
+    def display(self) -> tuple[str, str, str, str, str]:
+        status = "✅" if self.done else " "
+        due_str = self.due.isoformat() if self.due else ""
+        hard_flag= "H" if self.hard else ""   # flag for hard vs soft deadline
+        if self.repeat:
+            due_str += " ↻"
+        return (
+            status,
+            self.text,
+            str(self.priority),
+            due_str,
+            hard_flag,
+            self.category or "",
+        )
+
+
+# ── recurrence ──
+# A recurring task is one Task whose due date is its next occurrence. Later
+# occurrences are only generated, lazily, when something asks for them; the
+# one that gets completed becomes a done Task of its own.
+REPEATS = ("", "daily", "weekly", "monthly")
+_REPEAT_DAYS = {"daily": 1, "weekly": 7}
+
+
+def _add_months(day: date, months: int) -> date:
+    """Same day of the month `months` later, or the month's last day if it is shorter"""
+    year, month = divmod(day.month - 1 + months, 12)
+    year += day.year
+    return date(year, month + 1, min(day.day, calendar.monthrange(year, month + 1)[1]))
+
+
+def occurrences(due: date | None, repeat: str, start: date | None = None):
+    """Occurrence dates of a series due on `due`, in order, from the first on
+    or after `start`; it jumps there instead of walking the series"""
+    if due is None:
+        return
+    if not repeat:
+        if start is None or due >= start:
+            yield due
+        return
+    try:  # the series ends where date does, in the year 9999
+        if repeat == "monthly":
+            n = 0
+            if start is not None and start > due:
+                n = (start.year - due.year) * 12 + start.month - due.month
+                if _add_months(due, n) < start:
+                    n += 1
+            while True:
+                yield _add_months(due, n)
+                n += 1
+        step = _REPEAT_DAYS[repeat]
+        if start is not None and start > due:
+            due += timedelta(days=-(-(start - due).days // step) * step)
+        while True:
+            yield due
+            due += timedelta(days=step)
+    except (OverflowError, ValueError):
+        return
+
+
+def occurs_between(due: date | None, repeat: str, first: date, last: date | None) -> bool:
+    """Whether a series has an occurrence from `first` to `last` (inclusive, None = open)"""
+    day = next(occurrences(due, repeat, first), None)
+    return day is not None and (last is None or day <= last)
+
+
+def _copy_task(t: Task) -> Task:
+    """A new Task with the same fields and id; a few times faster than dataclasses.replace"""
+    return Task(t.text, t.done, t.priority, t.due, t.category, t.est_min, t.hard, t.repeat, t.id)
+
+# ───── compact task storage ────────────────────────────────────
+class TaskColumns:
+    """Tasks stored column by column instead of as one object each.
+
+    Priority, estimate and the done/hard flags live in arrays, due dates as
+    day ordinals (0 = none) and categories as codes into a table of interned
+    names, so a task costs a few bytes per field plus its text. It behaves
+    like the id -> Task dict it replaces: reading an id builds a Task from
+    its row, which is only done for the rows the view shows; storing a Task
+    copies its fields back. Deleting moves the last row into the gap. The
+    repeat rule is two bits of the flags byte.
+    Task ids come from a counter, so id -> row is an array indexed by id
+    (-1 = no such task) rather than a dict.
+    """
+    DONE = 1
+    HARD = 2
+    REPEAT_SHIFT = 2  # flags >> REPEAT_SHIFT indexes REPEATS
+
+    def __init__(self, tasks=()):
+        self.ids = array("q")
+        self.texts: list[str] = []
+        self.priority = array("b")
+        self.est_min = array("l")
+        self.flags = array("B")
+        self.due = array("l")
+        self.category = array("L")
+        self.categories: list[str] = []
+        self.category_codes: dict[str, int] = {}
+        self.row_of = array("l")  # id -> row
+        for t in tasks:
+            self[t.id] = t
+
+    def _category_code(self, name: str) -> int:
+        code = self.category_codes.get(name)
+        if code is None:
+            code = self.category_codes[name] = len(self.categories)
+            self.categories.append(sys.intern(name))
+        return code
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _row(self, task_id: int) -> int:
+        row = self.row_of[task_id] if 0 <= task_id < len(self.row_of) else -1
+        if row < 0:
+            raise KeyError(task_id)
+        return row
+
+    def __contains__(self, task_id) -> bool:
+        return 0 <= task_id < len(self.row_of) and self.row_of[task_id] >= 0
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __getitem__(self, task_id: int) -> Task:
+        row = self._row(task_id)
+        flags = self.flags[row]
+        due = self.due[row]
+        return Task(self.texts[row], bool(flags & self.DONE), self.priority[row],
+                    date.fromordinal(due) if due else None, self.categories[self.category[row]],
+                    self.est_min[row], bool(flags & self.HARD), REPEATS[flags >> self.REPEAT_SHIFT], id=task_id)
+
+    def get(self, task_id: int, default=None):
+        return self[task_id] if task_id in self else default
+
+    def pop(self, task_id: int, default=None):
+        if task_id not in self:
+            return default
+        t = self[task_id]
+        del self[task_id]
+        return t
+
+    def __setitem__(self, task_id: int, t: Task):
+        flags = ((self.DONE if t.done else 0) | (self.HARD if t.hard else 0)
+                 | REPEATS.index(t.repeat) << self.REPEAT_SHIFT)
+        fields = (t.priority, t.est_min, flags,
+                  t.due.toordinal() if t.due else 0, self._category_code(t.category))
+        if task_id >= len(self.row_of):
+            self.row_of.extend([-1] * (task_id + 1 - len(self.row_of)))
+        row = self.row_of[task_id]
+        if row < 0:
+            self.row_of[task_id] = len(self.ids)
+            self.ids.append(task_id)
+            self.texts.append(t.text)
+            for column, value in zip((self.priority, self.est_min, self.flags, self.due, self.category), fields):
+                column.append(value)
+        else:
+            self.texts[row] = t.text
+            for column, value in zip((self.priority, self.est_min, self.flags, self.due, self.category), fields):
+                column[row] = value
+
+    def __delitem__(self, task_id: int):
+        row = self._row(task_id)
+        self.row_of[task_id] = -1
+        last = len(self.ids) - 1
+        columns = (self.ids, self.texts, self.priority, self.est_min, self.flags, self.due, self.category)
+        if row != last:
+            for column in columns:
+                column[row] = column[last]
+            self.row_of[self.ids[row]] = row
+        for column in columns:
+            column.pop()
+
+    def values(self):
+        return map(self.__getitem__, self.ids)
+
+    def copy(self) -> "TaskColumns":
+        """Independent copy; the columns are copied as whole arrays, not row by row"""
+        new = TaskColumns()
+        for name in ("ids", "texts", "priority", "est_min", "flags", "due", "category", "categories", "row_of"):
+            setattr(new, name, getattr(self, name)[:])
+        new.category_codes = dict(self.category_codes)
+        return new
+
+    def nbytes(self) -> int:
+        """Approximate memory held, texts included"""
+        arrays = (self.ids, self.priority, self.est_min, self.flags, self.due, self.category, self.row_of)
+        return (sum(a.itemsize * len(a) for a in arrays) + sys.getsizeof(self.texts)
+                + sum(sys.getsizeof(text) for text in self.texts))
+
+# ───── task indexes ────────────────────────────────────────────
+# Sort key for each column, the same order sort_by has always used
+SORT_KEYS = {
+    "Status": lambda t: t.done,
+    "Task": lambda t: t.text.lower(),
+    "Pr": lambda t: t.priority,
+    "Due": lambda t: t.due or date.max,
+    "Hard": lambda t: not t.hard,
+    "Cat": lambda t: sys.intern(t.category.lower()),
+}
+COLUMN_NO = {column: n for n, column in enumerate(SORT_KEYS)}
+DUE_COLUMN = COLUMN_NO["Due"]
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    # interned, so the same word in many tasks is one string
+    return [sys.intern(word) for word in _WORD.findall(text.lower())]
+
+
+class IndexView:
+    """Read-only slice of one sorted index, resolved to tasks only when read"""
+    def __init__(self, index: "TaskIndex", column: str, lo: int = 0, hi: int | None = None):
+        self.index = index
+        self.entries = index.sorted[column]
+        self.lo = lo
+        self.hi = len(self.entries) if hi is None else hi
+
+    def __len__(self) -> int:
+        return self.hi - self.lo
+
+    def __getitem__(self, i):
+        by_id = self.index.by_id
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(self))
+            return [by_id[e[1]] for e in self.entries[self.lo + start:self.lo + stop:step]]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return by_id[self.entries[self.lo + i][1]]
+
+    def __iter__(self):
+        by_id = self.index.by_id
+        return (by_id[e[1]] for e in self.entries[self.lo:self.hi])
+
+
+class IdView:
+    """Task ids in view order, pulled from `ids` only as far as has been read.
+
+    `total` is known up front (the size of the match set), so the view can
+    report its length and draw the first window without walking the whole
+    ordered source.
+    """
+    def __init__(self, by_id: dict[int, Task], ids, total: int):
+        self.by_id = by_id
+        if isinstance(ids, list) and len(ids) == total:
+            # already in order (a memoized view): read it in place, it is never extended
+            self.source, self.ids = iter(()), ids
+        else:
+            self.source = iter(ids)
+            self.ids: list[int] = []
+        self.total = total
+
+    def _fill(self, n: int):
+        if len(self.ids) < n:
+            self.ids.extend(itertools.islice(self.source, n - len(self.ids)))
+
+    def __len__(self) -> int:
+        return self.total
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            self._fill(i.indices(self.total)[1])
+            return [self.by_id[id_] for id_ in self.ids[i]]
+        if i < 0:
+            i += self.total
+        self._fill(i + 1)
+        return self.by_id[self.ids[i]]
+
+    def __iter__(self):
+        self._fill(self.total)
+        return map(self.by_id.__getitem__, self.ids)
+
+
+class TaskIndex:
+    """Secondary indexes over the in-memory tasks, updated on every change.
+
+    `by_id` is the master dict of tasks, keyed by their stable id. Each
+    column keeps a list of (sort key, id) in sorted order (the None column is
+    plain id order, oldest first), so a sort is a view over that list instead
+    of a re-sort, and a category is a bisected range of the Cat index.
+    `by_due` maps a due date to its tasks for the Today filter.
+
+    Changes to a few tasks cost O(log n) comparisons plus a list shift per
+    column; batches of many tasks are applied in one filter + sort pass per
+    column instead.
+
+    Search uses an inverted index: `postings` maps each word of the text and
+    category to the ids containing it, and `vocabulary` keeps the words
+    sorted so a prefix is a bisected range of it. `recurring` holds the
+    dated recurring tasks, the few a date filter has to ask about later
+    occurrences.
+    """
+    BATCH = 32  # above this many entries, rewrite a column instead of shifting it per entry
+
+    def __init__(self, compact: bool = False):
+        self.compact = compact  # keep tasks in TaskColumns instead of a dict of Task objects
+        self.by_id: dict[int, Task] | TaskColumns = TaskColumns() if compact else {}
+        self.sorted: dict[str | None, list[tuple]] = {c: [] for c in (None, *SORT_KEYS)}
+        self.keys: dict[int, tuple] = {}          # id -> the keys it is filed under, per column
+        self.by_due: dict[date, list[int]] = {}  # due date -> ids, kept sorted
+        self.postings: dict[str, set[int]] = {}
+        self.vocabulary: list[str] = []
+        self.words: dict[int, frozenset[str]] = {}  # id -> words it is filed under
+        self.recurring: dict[int, str] = {}  # id -> repeat rule
+
+    def rebuild(self, tasks):
+        tasks = list({t.id: t for t in tasks}.values())
+        self.by_id = TaskColumns(tasks) if self.compact else {t.id: t for t in tasks}
+        self.keys = {t.id: tuple(key(t) for key in SORT_KEYS.values()) for t in tasks}
+        self.sorted[None] = [(id_, id_) for id_ in sorted(self.keys)]
+        for column_no, column in enumerate(SORT_KEYS):
+            self.sorted[column] = sorted((keys[column_no], id_) for id_, keys in self.keys.items())
+        self.by_due = {}
+        for t in sorted(tasks, key=operator.attrgetter("id")):
+            if t.due is not None:
+                self.by_due.setdefault(t.due, []).append(t.id)
+        self.postings = {}
+        self.words = {}
+        for t in tasks:
+            words = self.words[t.id] = frozenset(tokenize(t.text) + tokenize(t.category))
+            for word in words:
+                self.postings.setdefault(word, set()).add(t.id)
+        self.vocabulary = sorted(self.postings)
+        self.recurring = {t.id: t.repeat for t in tasks if t.repeat and t.due is not None}
+
+    def _file_due(self, task_id: int, due: date):
+        bisect.insort(self.by_due.setdefault(due, []), task_id)
+
+    def _unfile_due(self, task_id: int, due: date):
+        """`due` is the key it was filed under (date.max if none)"""
+        ids = self.by_due.get(due)
+        if ids is None:
+            return
+        i = bisect.bisect_left(ids, task_id)
+        if i < len(ids) and ids[i] == task_id:
+            del ids[i]
+            if not ids:
+                del self.by_due[due]
+
+    def _refile(self, column: str | None, old: list[tuple], new: list[tuple]):
+        """Swap entries of one sorted column: per entry for a few, one pass for many"""
+        entries = self.sorted[column]
+        if len(old) + len(new) <= self.BATCH:
+            for entry in old:
+                del entries[bisect.bisect_left(entries, entry)]
+            for entry in new:
+                bisect.insort(entries, entry)
+            return
+        if old:
+            gone = {entry[1] for entry in old}  # each id appears once per column
+            entries[:] = [entry for entry in entries if entry[1] not in gone]
+        entries.extend(new)
+        entries.sort()  # Timsort merges the sorted run with the new block
+
+    def _file_words(self, t: Task, born: list[str]):
+        """Post the task under its words; words new to the index go into `born`"""
+        words = self.words[t.id] = frozenset(tokenize(t.text) + tokenize(t.category))
+        for word in words:
+            ids = self.postings.get(word)
+            if ids is None:
+                ids = self.postings[word] = set()
+                born.append(word)
+            ids.add(t.id)
+
+    def _unfile_words(self, t: Task, dead: list[str]):
+        """Drop the task from its words; words no task uses any more go into `dead`"""
+        for word in self.words.pop(t.id):
+            ids = self.postings[word]
+            ids.discard(t.id)
+            if not ids:
+                del self.postings[word]
+                dead.append(word)
+
+    def _refile_vocabulary(self, dead: list[str], born: list[str]):
+        vocabulary = self.vocabulary
+        if len(dead) + len(born) <= self.BATCH:
+            for word in dead:
+                del vocabulary[bisect.bisect_left(vocabulary, word)]
+            for word in born:
+                bisect.insort(vocabulary, word)
+            return
+        if dead:
+            gone = set(dead)
+            vocabulary[:] = [word for word in vocabulary if word not in gone]
+        vocabulary.extend(born)
+        vocabulary.sort()
+
+    def add(self, t: Task):
+        self.add_many([t])
+
+    def remove(self, t: Task):
+        self.remove_many([t])
+
+    def update(self, t: Task):
+        """Re-file a task after its fields changed"""
+        self.update_many([t])
+
+    def add_many(self, tasks: list[Task]):
+        new: dict[str | None, list[tuple]] = {c: [] for c in self.sorted}
+        born: list[str] = []
+        for t in tasks:
+            keys = self.keys[t.id] = tuple(key(t) for key in SORT_KEYS.values())
+            self.by_id[t.id] = t
+            new[None].append((t.id, t.id))
+            for column, key in zip(SORT_KEYS, keys):
+                new[column].append((key, t.id))
+            if t.due is not None:
+                self._file_due(t.id, t.due)
+                if t.repeat:
+                    self.recurring[t.id] = t.repeat
+            self._file_words(t, born)
+        for column, entries in new.items():
+            self._refile(column, [], entries)
+        self._refile_vocabulary([], born)
+
+    def remove_many(self, tasks: list[Task]):
+        old: dict[str | None, list[tuple]] = {c: [] for c in self.sorted}
+        dead: list[str] = []
+        for t in tasks:
+            keys = self.keys.pop(t.id)
+            del self.by_id[t.id]
+            old[None].append((t.id, t.id))
+            for column, key in zip(SORT_KEYS, keys):
+                old[column].append((key, t.id))
+            self._unfile_due(t.id, keys[DUE_COLUMN])
+            self.recurring.pop(t.id, None)
+            self._unfile_words(t, dead)
+        for column, entries in old.items():
+            self._refile(column, entries, [])
+        self._refile_vocabulary(dead, [])
+
+    def update_many(self, tasks: list[Task]) -> set[str]:
+        """Re-file tasks whose fields changed; only the columns that changed are touched.
+
+        Returns the names of those columns; a changed repeat rule counts as Due.
+        """
+        old: dict[str, list[tuple]] = {c: [] for c in SORT_KEYS}
+        new: dict[str, list[tuple]] = {c: [] for c in SORT_KEYS}
+        dead: list[str] = []
+        born: list[str] = []
+        repeats_changed = False
+        for t in tasks:
+            self.by_id[t.id] = t  # TaskColumns copies the changed fields back in
+            before = self.keys[t.id]
+            after = self.keys[t.id] = tuple(key(t) for key in SORT_KEYS.values())
+            for column, old_key, new_key in zip(SORT_KEYS, before, after):
+                if old_key != new_key:
+                    old[column].append((old_key, t.id))
+                    new[column].append((new_key, t.id))
+            if before[DUE_COLUMN] != after[DUE_COLUMN]:
+                # only move it when the date changed; it goes back in at its id's place
+                self._unfile_due(t.id, before[DUE_COLUMN])
+                if t.due is not None:
+                    self._file_due(t.id, t.due)
+            repeat = t.repeat if t.due is not None else ""
+            if self.recurring.get(t.id, "") != repeat:
+                repeats_changed = True
+                if repeat:
+                    self.recurring[t.id] = repeat
+                else:
+                    del self.recurring[t.id]
+            if self.words[t.id] != frozenset(tokenize(t.text) + tokenize(t.category)):
+                self._unfile_words(t, dead)
+                self._file_words(t, born)
+        for column in SORT_KEYS:
+            self._refile(column, old[column], new[column])
+        # a word can die and come back within one batch
+        revived = set(dead) & set(born)
+        self._refile_vocabulary([w for w in dead if w not in revived], [w for w in born if w not in revived])
+        changed = {column for column in SORT_KEYS if new[column]}
+        if repeats_changed:
+            changed.add("Due")
+        return changed
+
+    def column(self, name: str) -> IndexView:
+        return IndexView(self, name)
+
+    def category(self, name: str) -> IndexView:
+        """Tasks in one category, oldest first: a range of the Cat index"""
+        entries = self.sorted["Cat"]
+        key = name.lower()
+        lo = bisect.bisect_left(entries, (key,))
+        hi = bisect.bisect_left(entries, (key, float("inf")), lo)
+        return IndexView(self, "Cat", lo, hi)
+
+    def due_on(self, day: date) -> list[Task]:
+        by_id = self.by_id
+        return [by_id[id_] for id_ in self.by_due.get(day, ())]
+
+    def search(self, query: str) -> set[int]:
+        """Ids of tasks where every query word starts a word of the text or category"""
+        ranges = []
+        for word in set(tokenize(query)):
+            lo = bisect.bisect_left(self.vocabulary, word)
+            hi = bisect.bisect_left(self.vocabulary, word + "\U0010ffff", lo)
+            ranges.append((hi - lo, word, lo, hi))
+        if not ranges:
+            return set(self.by_id)
+        ranges.sort()  # the word with the fewest completions first
+        result: set[int] | None = None
+        for size, word, lo, hi in ranges:
+            if result is not None and len(result) < size:
+                # cheaper to check the few candidates left than to union every completion
+                words = self.words
+                result = {i for i in result if any(w.startswith(word) for w in words[i])}
+            else:
+                matches: set[int] = set()
+                for vocab_word in self.vocabulary[lo:hi]:
+                    matches |= self.postings[vocab_word]
+                result = matches if result is None else result & matches
+            if not result:
+                break
+        return result
+
+# ───── saved views ─────────────────────────────────────────────
+@dataclass(frozen=True)
+class SavedView:
+    """A named filter plus a multi-key sort.
+
+    `sort` is a tuple of (column, descending), most significant first; ties
+    fall back to id order. Due dates are day offsets from today, so "Today"
+    stays today after midnight. Filters left at None don't apply. Views are
+    hashable and TodoList memoizes each one's result.
+    """
+    name: str
+    sort: tuple[tuple[str, bool], ...] = ()
+    due_from: int | None = None
+    due_to: int | None = None
+    category: str | None = None
+    max_priority: int | None = None
+    hard: bool | None = None
+    done: bool | None = None
+
+    @property
+    def filtered(self) -> bool:
+        return any(value is not None for value in (self.due_from, self.due_to, self.category,
+                                                   self.max_priority, self.hard, self.done))
+
+    @property
+    def dated(self) -> bool:
+        """Whether the result depends on today's date"""
+        return self.due_from is not None or self.due_to is not None
+
+    @property
+    def columns(self) -> set[str]:
+        """The columns the result depends on; a change elsewhere leaves it valid"""
+        used = {column for column, _ in self.sort}
+        for column, value in (("Due", self.due_from), ("Due", self.due_to), ("Cat", self.category),
+                              ("Pr", self.max_priority), ("Hard", self.hard), ("Status", self.done)):
+            if value is not None:
+                used.add(column)
+        return used
+
+    def matches(self, t: Task, today: date) -> bool:
+        """Whether one task belongs in the view, by the same rules as TodoList.view_rows"""
+        if self.due_from is not None:
+            last = today + timedelta(days=self.due_to) if self.due_to is not None else None
+            if not occurs_between(t.due, t.repeat, today + timedelta(days=self.due_from), last):
+                return False
+        elif self.due_to is not None and (t.due is None or t.due > today + timedelta(days=self.due_to)):
+            return False
+        return ((self.category is None or t.category.lower() == self.category.lower())
+                and (self.max_priority is None or t.priority <= self.max_priority)
+                and (self.hard is None or t.hard == self.hard)
+                and (self.done is None or t.done == self.done))
+
+    def sorted_by(self, column: str | None) -> "SavedView":
+        """The same filter sorted by one column instead (a heading click)"""
+        return replace(self, sort=((column, False),) if column is not None else ())
+
+
+SAVED_VIEWS = {view.name: view for view in (
+    SavedView("All"),
+    SavedView("Today", due_from=0, due_to=0),
+    SavedView("High priority", sort=(("Due", False), ("Task", False)), max_priority=1, done=False),
+    SavedView("Hard deadlines this week", sort=(("Due", False), ("Pr", False)),
+              due_to=6, hard=True, done=False),
+)}
+VIEW_CACHE_SIZE = 16  # memoized view results kept per list
+
+# ───── persistent store ────────────────────────────────────────
+TASK_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL,
+    done INTEGER NOT NULL DEFAULT 0,
+    priority INTEGER NOT NULL DEFAULT 2,
+    due TEXT,
+    category TEXT NOT NULL DEFAULT '',
+    est_min INTEGER NOT NULL DEFAULT 0,
+    hard INTEGER NOT NULL DEFAULT 0,
+    repeat TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_due ON tasks (due);
+CREATE INDEX IF NOT EXISTS idx_tasks_due_order ON tasks (due IS NULL, due);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks (priority);
+CREATE INDEX IF NOT EXISTS idx_tasks_category ON tasks (category COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_tasks_done ON tasks (done);
+CREATE INDEX IF NOT EXISTS idx_tasks_hard ON tasks (hard DESC);
+CREATE INDEX IF NOT EXISTS idx_tasks_text ON tasks (text COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_tasks_repeat ON tasks (due) WHERE repeat != '';
+"""
+
+TASK_COLUMNS = "id, text, done, priority, due, category, est_min, hard, repeat"
+
+# ORDER BY for each sortable column; each one matches an index above so
+# SQLite walks the index instead of sorting. Same order as the list sort,
+# so undated tasks go last and hard deadlines first.
+SORT_ORDERS = {
+    None: "id",
+    "Status": "done, id",
+    "Task": "text COLLATE NOCASE, id",
+    "Pr": "priority, id",
+    "Due": "due IS NULL, due, id",
+    "Hard": "hard DESC, id",
+    "Cat": "category COLLATE NOCASE, id",
+}
+
+
+def _task_from_row(row) -> Task:
+    id_, text, done, priority, due, category, est_min, hard, repeat = row
+    return Task(
+        text=text, done=bool(done), priority=priority,
+        due=date.fromisoformat(due) if due else None,
+        category=category, est_min=est_min, hard=bool(hard), repeat=repeat, id=id_,
+    )
+
+
+def _task_values(t: Task) -> tuple:
+    return (t.text, int(t.done), t.priority, t.due.isoformat() if t.due else None,
+            t.category, t.est_min, int(t.hard), t.repeat)
+
+
+def _occurs_between_sql(due: str, repeat: str, first: str, last: str | None) -> bool:
+    return occurs_between(date.fromisoformat(due), repeat, date.fromisoformat(first),
+                          date.fromisoformat(last) if last else None)
+
+
+class PagedTaskRows:
+    """Read-only sequence over a query; rows are fetched a page at a time.
+
+    len() is one COUNT on an index and slicing only loads the pages it
+    touches, so the virtual list can point at hundreds of thousands of rows
+    without reading them. A few recent pages are cached for scrolling.
+    """
+    def __init__(self, store: "TaskStore", where: str, params: tuple, order: str,
+                 page_size: int = 256, cached_pages: int = 8):
+        self.store = store
+        self.where = where
+        self.params = params
+        self.order = order
+        self.page_size = page_size
+        self.cached_pages = cached_pages
+        self.pages: dict[int, list[Task]] = {}
+        self._len: int | None = None
+
+    def __len__(self) -> int:
+        if self._len is None:
+            self._len = self.store.count(self.where, self.params)
+        return self._len
+
+    def _page(self, number: int) -> list[Task]:
+        page = self.pages.pop(number, None)
+        if page is None:
+            page = self.store.fetch(self.where, self.params, self.order,
+                                    number * self.page_size, self.page_size)
+            if len(self.pages) >= self.cached_pages:
+                del self.pages[next(iter(self.pages))]
+        self.pages[number] = page  # most recently used goes last
+        return page
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            rows: list[Task] = []
+            if stop <= start:
+                return rows
+            for number in range(start // self.page_size, (stop - 1) // self.page_size + 1):
+                page = self._page(number)
+                base = number * self.page_size
+                rows.extend(page[max(start - base, 0):stop - base])
+            return rows
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._page(index // self.page_size)[index % self.page_size]
+
+    def __iter__(self):
+        for number in range((len(self) + self.page_size - 1) // self.page_size):
+            yield from self._page(number)
+
+    def ids_within(self, task_ids: list[int], chunk: int = 500) -> set[int]:
+        """Which of `task_ids` this query returns, without paging through it"""
+        found: set[int] = set()
+        where = f"{self.where} AND" if self.where else "WHERE"
+        for start in range(0, len(task_ids), chunk):
+            ids = task_ids[start:start + chunk]
+            found.update(id_ for id_, in self.store.connection.execute(
+                f"SELECT id FROM tasks {where} id IN ({', '.join('?' * len(ids))})", self.params + tuple(ids)))
+        return found
+
+
+class TaskStore:
+    """SQLite storage for tasks with indexed filter and sort queries"""
+    def __init__(self, path: str = "tasks.db"):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(tasks)")}
+        if columns and "repeat" not in columns:
+            # a database from before recurring tasks
+            self.connection.execute("ALTER TABLE tasks ADD COLUMN repeat TEXT NOT NULL DEFAULT ''")
+        self.connection.executescript(TASK_SCHEMA)
+        self.connection.create_function("occurs_between", 4, _occurs_between_sql, deterministic=True)
+        # new in-memory Tasks must not reuse ids that are already stored
+        last, = self.connection.execute("SELECT MAX(id) FROM tasks").fetchone()
+        _reserve_ids(last or 0)
+
+    def add(self, t: Task):
+        with self.connection:
+            self.connection.execute(
+                f"INSERT INTO tasks ({TASK_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (t.id,) + _task_values(t))
+
+    def add_many(self, tasks: list[Task]):
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT INTO tasks ({TASK_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(t.id,) + _task_values(t) for t in tasks])
+
+    def update(self, t: Task):
+        with self.connection:
+            self.connection.execute(
+                "UPDATE tasks SET text = ?, done = ?, priority = ?, due = ?, category = ?, "
+                "est_min = ?, hard = ?, repeat = ? WHERE id = ?", _task_values(t) + (t.id,))
+
+    def update_many(self, tasks: list[Task]):
+        with self.connection:
+            self.connection.executemany(
+                "UPDATE tasks SET text = ?, done = ?, priority = ?, due = ?, category = ?, "
+                "est_min = ?, hard = ?, repeat = ? WHERE id = ?", [_task_values(t) + (t.id,) for t in tasks])
+
+    def delete(self, task_id: int):
+        with self.connection:
+            self.connection.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+
+    def delete_many(self, task_ids: list[int]):
+        with self.connection:
+            self.connection.executemany("DELETE FROM tasks WHERE id = ?", [(i,) for i in task_ids])
+
+    def get_many(self, task_ids: list[int], chunk: int = 500) -> list[Task]:
+        tasks = []
+        for start in range(0, len(task_ids), chunk):
+            ids = task_ids[start:start + chunk]
+            cursor = self.connection.execute(
+                f"SELECT {TASK_COLUMNS} FROM tasks WHERE id IN ({', '.join('?' * len(ids))})", ids)
+            tasks.extend(_task_from_row(row) for row in cursor)
+        return tasks
+
+    def count(self, where: str = "", params: tuple = ()) -> int:
+        n, = self.connection.execute(f"SELECT COUNT(*) FROM tasks {where}", params).fetchone()
+        return n
+
+    def fetch(self, where: str, params: tuple, order: str, offset: int, limit: int) -> list[Task]:
+        cursor = self.connection.execute(
+            f"SELECT {TASK_COLUMNS} FROM tasks {where} ORDER BY {order} LIMIT ? OFFSET ?",
+            params + (limit, offset))
+        return [_task_from_row(row) for row in cursor]
+
+    def rows(self, sort: str | None = None, due: date | None = None,
+             category: str | None = None, search: str = "") -> PagedTaskRows:
+        """Lazy view of the tasks matching the filters, in `sort` column order"""
+        clauses, params = [], []
+        for word in tokenize(search):
+            # substring match; this one is a scan, the in-memory index is the fast path
+            clauses.append("(text LIKE ? OR category LIKE ?)")
+            params += [f"%{word}%", f"%{word}%"]
+        if due is not None:
+            clauses.append("due = ?")
+            params.append(due.isoformat())
+        if category is not None:
+            clauses.append("category = ? COLLATE NOCASE")
+            params.append(category)
+        where = "WHERE " + " AND ".join(clauses) if clauses else ""
+        return PagedTaskRows(self, where, tuple(params), SORT_ORDERS[sort])
+
+    def view_rows(self, view: SavedView, today: date, search: str = "") -> PagedTaskRows:
+        """Lazy view of a saved view's tasks, sorted on all of its keys"""
+        clauses, params = [], []
+        for word in tokenize(search):
+            clauses.append("(text LIKE ? OR category LIKE ?)")
+            params += [f"%{word}%", f"%{word}%"]
+        first = (today + timedelta(days=view.due_from)).isoformat() if view.due_from is not None else None
+        last = (today + timedelta(days=view.due_to)).isoformat() if view.due_to is not None else None
+        if first is not None:
+            # ISO dates compare as text; a series due earlier may still recur in the window
+            in_window = "due >= ? AND due <= ?" if last is not None else "due >= ?"
+            clauses.append(f"({in_window} OR repeat != '' AND due < ? AND occurs_between(due, repeat, ?, ?))")
+            params += [first, *([last] if last is not None else []), first, first, last]
+        elif last is not None:
+            clauses.append("due <= ?")
+            params.append(last)
+        for clause, value in (("category = ? COLLATE NOCASE", view.category),
+                              ("priority <= ?", view.max_priority),
+                              ("hard = ?", view.hard), ("done = ?", view.done)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        terms = []
+        for column, descending in view.sort:
+            for term in SORT_ORDERS[column].removesuffix(", id").split(", "):
+                if descending:
+                    term = term.removesuffix(" DESC") if term.endswith(" DESC") else term + " DESC"
+                terms.append(term)
+        where = "WHERE " + " AND ".join(clauses) if clauses else ""
+        return PagedTaskRows(self, where, tuple(params), ", ".join([*terms, "id"]))
+
+    def estimate_rollup(self, today: date) -> "EstimateRollup":
+        """The same totals as the in-memory rollup, from GROUP BY queries"""
+        rollup = EstimateRollup()
+        query = self.connection.execute
+        rollup.by_category = dict(query(
+            "SELECT lower(category), SUM(est_min) FROM tasks WHERE done = 0 "
+            "GROUP BY lower(category) HAVING SUM(est_min) != 0"))
+        rollup.by_due = {
+            date.fromisoformat(due) if due else None: minutes for due, minutes in query(
+                "SELECT due, SUM(est_min) FROM tasks WHERE done = 0 GROUP BY due HAVING SUM(est_min) != 0")}
+        for overdue, minutes in query(
+                "SELECT due < ?, SUM(est_min) FROM tasks WHERE done = 0 GROUP BY due < ?",
+                (today.isoformat(),) * 2):
+            if overdue:
+                rollup.overdue = minutes
+            else:
+                rollup.on_track += minutes  # undated tasks come back as NULL
+        return rollup
+
+    def close(self):
+        self.connection.execute("PRAGMA optimize")  # refresh planner stats if they went stale
+        self.connection.close()
+
+# ───── task journal ────────────────────────────────────────────
+READ_CHUNK = 1 << 22  # bytes of a journal file parsed per json.loads
+
+
+def _journal_record(t: Task) -> list:
+    record = ["u", t.id, t.text, t.done, t.priority, t.due.isoformat() if t.due else None,
+              t.category, t.est_min, t.hard]
+    if t.repeat:
+        record.append(t.repeat)  # older files have no rule, so it stays optional
+    return record
+
+
+def _read_records(path: str) -> tuple[list[list], int]:
+    """Every complete record in a journal/snapshot file, read through mmap.
+
+    Whole lines are parsed READ_CHUNK bytes at a time with one json.loads
+    each, so only a chunk is ever copied out of the map; a half-written last
+    line left by a crash is ignored. Also returns how many bytes were valid.
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return [], 0
+    records: list[list] = []
+    pos = 0
+    with f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return [], 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = mm.rfind(b"\n") + 1
+            while pos < end:
+                stop = end if pos + READ_CHUNK >= end else mm.find(b"\n", pos + READ_CHUNK - 1) + 1
+                chunk = mm[pos:stop]
+                try:
+                    records += json.loads(b"[" + chunk[:-1].replace(b"\n", b",") + b"]")
+                except ValueError:
+                    for line in chunk.splitlines(keepends=True):
+                        try:
+                            records.append(json.loads(line))
+                        except ValueError:
+                            return records, pos  # nothing after a damaged record can be trusted
+                        pos += len(line)
+                    continue
+                pos = stop
+    return records, pos
+
+
+def _replay(tasks: dict[int, Task], records: list[list], dates: dict[str | None, date | None]):
+    """Apply upsert/delete records to `tasks`; `dates` caches parsed due dates
+    (there are few distinct ones, so each is parsed once)"""
+    for r in records:
+        if r[0] == "u":
+            _, id_, text, done, priority, due, category, est_min, hard, *rest = r
+            repeat = rest[0] if rest else ""
+            if due not in dates:
+                dates[due] = date.fromisoformat(due)
+            old = tasks.get(id_)
+            if old is None:
+                tasks[id_] = Task(text, done, priority, dates[due], category, est_min, hard, repeat, id=id_)
+            else:
+                (old.text, old.done, old.priority, old.due, old.category, old.est_min, old.hard,
+                 old.repeat) = (text, done, priority, dates[due], category, est_min, hard, repeat)
+        else:
+            tasks.pop(r[1], None)
+
+
+class TaskJournal:
+    """Append-only log of task changes, compacted into snapshots.
+
+    Every add/toggle/delete/edit is one JSON line written straight to the
+    file, so it survives the app crashing; fsync is batched (every
+    `sync_every` records or `sync_interval` seconds) so a write costs O(1)
+    and not a disk flush. Records are upserts and deletes by id, so replaying
+    a journal on top of a newer snapshot gives the same result. After
+    `compact_every` records the live tasks are written to a new snapshot
+    (temp file + rename) and the journal starts over. Startup reads the
+    snapshot plus the journal tail.
+    """
+    def __init__(self, path: str = "tasks.journal", sync_every: int = 64,
+                 sync_interval: float = 1.0, compact_every: int | None = 100_000):
+        self.path = path
+        self.snapshot_path = path + ".snapshot"
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.compact_every = compact_every
+        self.tasks: dict[int, Task] = {}
+        self.fd: int | None = None
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+        self.tail_records = 0
+
+    def load(self) -> list[Task]:
+        """Rebuild the task list from the snapshot and the journal tail"""
+        tasks = self.tasks
+        tasks.clear()
+        dates: dict[str | None, date | None] = {None: None}
+        snapshot, _ = _read_records(self.snapshot_path)
+        tail, valid = _read_records(self.path)
+        for records in (snapshot, tail):
+            _replay(tasks, records, dates)
+        _reserve_ids(max(tasks, default=0))
+        self.fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        # drop a torn last line so new records start on a fresh line
+        if os.fstat(self.fd).st_size != valid:
+            os.ftruncate(self.fd, valid)
+        self.tail_records = len(tail)
+        return list(tasks.values())
+
+    def _append(self, record: list):
+        os.write(self.fd, json.dumps(record, separators=(",", ":")).encode() + b"\n")
+        self.unsynced += 1
+        self.tail_records += 1
+        if self.unsynced >= self.sync_every or time.monotonic() - self.last_sync >= self.sync_interval:
+            self.sync()
+        if self.compact_every is not None and self.tail_records >= self.compact_every:
+            self.compact()
+
+    def add(self, t: Task):
+        self.tasks[t.id] = t
+        self._append(_journal_record(t))
+
+    def update(self, t: Task):
+        """Record the current values of a toggled or edited task"""
+        self._append(_journal_record(t))
+
+    def delete(self, task_id: int):
+        self.tasks.pop(task_id, None)
+        self._append(["d", task_id])
+
+    def sync(self):
+        if self.unsynced and self.fd is not None:
+            os.fsync(self.fd)
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def compact(self):
+        """Write the live tasks to a new snapshot and empty the journal"""
+        tmp = self.snapshot_path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(b"".join(json.dumps(_journal_record(t), separators=(",", ":")).encode() + b"\n"
+                             for t in self.tasks.values()))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+        # the snapshot is safely in place; a crash before the truncate only
+        # means the same records get replayed again
+        os.ftruncate(self.fd, 0)
+        os.fsync(self.fd)
+        self.unsynced = 0
+        self.tail_records = 0
+
+    def close(self):
+        if self.fd is not None:
+            self.sync()
+            os.close(self.fd)
+            self.fd = None
+
+# ───── autosave ────────────────────────────────────────────────
+class TaskAutosave:
+    """The whole task list in one file, written by a background thread.
+
+    save() takes a snapshot of the tasks and returns at once; a worker thread
+    turns it into JSON lines, writes a temp file, fsyncs it and renames it
+    over the save file, so a crash leaves the old file or the new one, never
+    half of each. The worker waits until saves pause for SETTLE seconds and
+    writes only the newest snapshot, so a burst of saves becomes one write
+    (plus the one already running) whatever the size of the list. close()
+    waits for the last save to land. The format is the journal snapshot's.
+    """
+    CHUNK = 2048  # records encoded between chances for the Tk thread to run
+    SETTLE = 0.05  # quiet seconds before the worker writes
+
+    def __init__(self, path: str = "tasks.json"):
+        self.path = path
+        self.pending = None        # newest copy not yet written
+        self.writes = 0
+        self.error: Exception | None = None  # last failed write, reported by the app
+        self.closing = False
+        self.wakeup = threading.Condition()
+        self.worker = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self.worker.start()
+
+    def load(self) -> list[Task]:
+        tasks: dict[int, Task] = {}
+        records, _ = _read_records(self.path)
+        _replay(tasks, records, {None: None})
+        _reserve_ids(max(tasks, default=0))
+        return list(tasks.values())
+
+    def save(self, tasks):
+        """Queue a snapshot of the id -> Task mapping (dict or TaskColumns) for writing"""
+        with self.wakeup:
+            self.pending = tasks
+            self.wakeup.notify()
+
+    def _run(self):
+        while True:
+            with self.wakeup:
+                while self.pending is None and not self.closing:
+                    self.wakeup.wait()
+                while not self.closing and self.wakeup.wait(self.SETTLE):
+                    pass  # another save came in; wait for the burst to end
+                tasks, self.pending = self.pending, None
+            if tasks is None:
+                return  # closing, nothing left to write
+            try:
+                self._write(tasks)
+            except Exception as e:  # keep the worker alive for the next save
+                self.error = e
+
+    def _write(self, tasks):
+        tmp = self.path + ".tmp"
+        encode = json.JSONEncoder(separators=(",", ":")).encode
+        with open(tmp, "wb") as f:
+            chunk = []
+            for t in tasks.values():
+                chunk.append(encode(_journal_record(t)))
+                if len(chunk) == self.CHUNK:
+                    f.write(("\n".join(chunk) + "\n").encode())
+                    chunk.clear()
+                    time.sleep(0)  # hand the GIL back so the UI never waits long
+            if chunk:
+                f.write(("\n".join(chunk) + "\n").encode())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.writes += 1
+
+    def close(self):
+        """Write whatever is still queued, then stop the worker"""
+        with self.wakeup:
+            self.closing = True
+            self.wakeup.notify()
+        self.worker.join()
+
+# ───── import / export ─────────────────────────────────────────
+# Columns of a CSV export, and keys of a JSON Lines one
+TASK_FIELDS = ("text", "done", "priority", "due", "category", "est_min", "hard", "repeat")
+IMPORT_BATCH = 50_000  # tasks handed to the backend at a time
+_BOOLS = {"": False, "0": False, "1": True, "false": False, "true": True, "no": False, "yes": True,
+          None: False, False: False, True: True, 0: False, 1: True}
+
+
+def parse_iso_date(s: str) -> date:
+    """YYYY-MM-DD only; date.fromisoformat is many times faster than strptime"""
+    if len(s) != 10 or s[4] != "-" or s[7] != "-":
+        raise ValueError(f"not a YYYY-MM-DD date: {s!r}")
+    return date.fromisoformat(s)
+
+
+def _int_field(fields: dict, name: str, default: int) -> int:
+    value = fields.get(name)
+    try:
+        return int(value or default)
+    except (ValueError, TypeError):
+        raise ValueError(f"{name} is not a whole number: {value!r}") from None
+
+
+def _task_from_fields(fields: dict, dates: dict[str, date | None]) -> Task:
+    """A Task from one imported row; ValueError says what is wrong with it"""
+    text = fields.get("text")
+    if not text or not isinstance(text, str):
+        raise ValueError("no task text")
+    due = fields.get("due") or ""
+    if due not in dates:
+        dates[due] = parse_iso_date(due) if due else None
+    priority = _int_field(fields, "priority", 2)
+    if not 1 <= priority <= 5:
+        raise ValueError(f"priority {priority} is not 1-5")
+    est_min = _int_field(fields, "est_min", 0)
+    if est_min < 0:
+        raise ValueError(f"negative est_min {est_min}")
+    flags = []
+    for name in ("done", "hard"):
+        value = fields.get(name)
+        flag = _BOOLS.get(value.lower() if isinstance(value, str) else value)
+        if flag is None:
+            raise ValueError(f"{name} is not true/false: {value!r}")
+        flags.append(flag)
+    category = fields.get("category") or ""
+    repeat = fields.get("repeat") or ""
+    if repeat not in REPEATS:
+        raise ValueError(f"repeat is not daily/weekly/monthly: {repeat!r}")
+    if repeat and dates[due] is None:
+        raise ValueError("a repeating task needs a due date")
+    return Task(text, flags[0], priority, dates[due], str(category), est_min, flags[1], repeat)
+
+
+def _csv_rows(f):
+    """(line number, {field: value}) for each data row of a CSV file with a header"""
+    reader = csv.reader(f)
+    header = [name.strip().lower() for name in next(reader, [])]
+    if "text" not in header:
+        raise ValueError("the first line must be a header with at least a 'text' column")
+    columns = [(i, name) for i, name in enumerate(header) if name in TASK_FIELDS]
+    for row in reader:
+        if row:
+            yield reader.line_num, {name: row[i] for i, name in columns if i < len(row)}
+
+
+def _jsonl_rows(f):
+    decode = json.JSONDecoder().decode
+    for number, line in enumerate(f, 1):
+        if line.strip():
+            try:
+                fields = decode(line)
+            except ValueError:
+                fields = None  # reported with the row's number
+            yield number, fields if isinstance(fields, dict) else None
+
+
+def read_task_file(path: str, errors: list[str], batch: int = IMPORT_BATCH):
+    """Stream tasks from a .csv or JSON Lines file, `batch` Tasks at a time.
+
+    The file is read a row at a time; rows that can't be imported are
+    skipped and described in `errors` ("line N: why").
+    """
+    dates: dict[str, date | None] = {}
+    tasks: list[Task] = []
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        rows = _csv_rows(f) if path.lower().endswith(".csv") else _jsonl_rows(f)
+        for number, fields in rows:
+            if fields is None:
+                errors.append(f"line {number}: not a JSON object")
+                continue
+            try:
+                tasks.append(_task_from_fields(fields, dates))
+            except (ValueError, TypeError) as e:
+                errors.append(f"line {number}: {e}")
+                continue
+            if len(tasks) >= batch:
+                yield tasks
+                tasks = []
+    if tasks:
+        yield tasks
+
+
+def _chunks(items, size: int):
+    it = iter(items)
+    while chunk := list(itertools.islice(it, size)):
+        yield chunk
+
+
+def write_task_file(path: str, tasks) -> int:
+    """Stream tasks to a .csv or JSON Lines file; returns how many were written"""
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if path.lower().endswith(".csv"):
+            writer = csv.writer(f)
+            writer.writerow(TASK_FIELDS)
+            for chunk in _chunks(tasks, 4096):
+                writer.writerows((t.text, int(t.done), t.priority, t.due.isoformat() if t.due else "",
+                                  t.category, t.est_min, int(t.hard), t.repeat) for t in chunk)
+                count += len(chunk)
+        else:
+            encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+            for chunk in _chunks(tasks, 4096):
+                f.write("".join(encode({
+                    "text": t.text, "done": t.done, "priority": t.priority,
+                    "due": t.due.isoformat() if t.due else None, "category": t.category,
+                    "est_min": t.est_min, "hard": t.hard, "repeat": t.repeat}) + "\n" for t in chunk))
+                count += len(chunk)
+    return count
+
+# ───── planner ─────────────────────────────────────────────────
+DAILY_CAPACITY_MIN = 240  # minutes of task work planned per day unless changed in the app
+
+
+def _soft_key(t: Task) -> tuple:
+    """Order soft work is done in: earliest due date first, each priority level
+    below High giving a day of slack; undated tasks last, by priority"""
+    if t.due is None:
+        return (1, 0, t.priority, t.id)
+    return (0, t.due.toordinal() + t.priority - 1, t.priority, t.id)
+
+
+class DayPlanner:
+    """Day-by-day schedule built from est_min, due, hard and priority.
+
+    Hard deadlines are constraints. Hard tasks are placed as late as their
+    deadlines allow (latest deadline first, walking back from the due day),
+    which fits exactly when earliest-deadline-first would and keeps the early
+    days free. A hard task that does not fit is flagged in `infeasible` and
+    its missing minutes go to the front of the soft queue.
+
+    Soft tasks share the capacity left over, in _soft_key order, as one
+    stream of minutes: a task finishes on the day where the running total
+    reaches it. Every day late costs (6 - priority).
+
+    Changes are incremental: a soft task moves one entry in the sorted queue
+    and only the running totals after it are recomputed (lazily, on the next
+    query); a hard task change re-places the hard tasks only. Soft tasks are
+    kept as queue keys, not Task objects, so results come back as ids.
+    """
+    def __init__(self, capacity: int = DAILY_CAPACITY_MIN, start: date | None = None):
+        self.capacity = capacity
+        self.start = start or date.today()
+        self.hard: dict[int, Task] = {}
+        self.queue: list[tuple] = []      # soft work in order, by _soft_key (last item is the id)
+        self.minutes: list[int] = []      # minutes of each queue entry
+        self.totals: list[int] = []       # running total of minutes through each entry
+        self.valid = 0                    # totals[:valid] are up to date
+        self.queued: dict[int, tuple] = {}  # id -> its queue entry
+        self.hard_dirty = False
+        self.reserved: dict[int, list[tuple[int, int]]] = {}  # day -> [(id, minutes)] of hard work
+        self.hard_finish: dict[int, int] = {}  # hard id -> last day it is worked on
+        self.free_totals: list[int] = []  # running total of capacity left for soft work, per day
+        self.infeasible: dict[int, int] = {}  # hard id -> minutes that don't fit before its due date
+
+    # ── changes ───────────────────────────────────────────────
+    def rebuild(self, tasks):
+        open_tasks = [t for t in tasks if not t.done]
+        self.hard = {t.id: t for t in open_tasks if t.hard and t.due is not None}
+        soft = sorted((_soft_key(t), max(t.est_min, 0)) for t in open_tasks if t.id not in self.hard)
+        self.queue = [key for key, _ in soft]
+        self.minutes = [minutes for _, minutes in soft]
+        self.queued = {key[-1]: key for key in self.queue}
+        self.totals = []
+        self.valid = 0
+        self.infeasible = {}
+        self.hard_dirty = True
+
+    def set_capacity(self, capacity: int):
+        if capacity != self.capacity:
+            self.capacity = capacity
+            self.hard_dirty = True
+
+    def set_start(self, start: date):
+        """Re-anchor day 0; soft totals are in minutes, so only hard work moves"""
+        if start != self.start:
+            self.start = start
+            self.hard_dirty = True
+
+    def update(self, t: Task):
+        """Re-plan after one task was added or changed"""
+        self.remove(t.id)
+        if t.done:
+            return
+        if t.hard and t.due is not None:
+            self.hard[t.id] = t
+            self.hard_dirty = True
+        else:
+            self._enqueue(_soft_key(t), max(t.est_min, 0))
+
+    def remove(self, task_id: int):
+        if self.hard.pop(task_id, None) is not None:
+            self.hard_dirty = True
+            self.infeasible.pop(task_id, None)
+        self._dequeue(task_id)  # its soft entry, or the overflow of a hard task
+
+    def _enqueue(self, key: tuple, minutes: int):
+        pos = bisect.bisect_left(self.queue, key)
+        self.queue.insert(pos, key)
+        self.minutes.insert(pos, minutes)
+        self.queued[key[-1]] = key
+        self.valid = min(self.valid, pos)
+
+    def _dequeue(self, task_id: int):
+        key = self.queued.pop(task_id, None)
+        if key is None:
+            return
+        pos = bisect.bisect_left(self.queue, key)
+        del self.queue[pos]
+        del self.minutes[pos]
+        self.valid = min(self.valid, pos)
+
+    # ── planning ──────────────────────────────────────────────
+    def _place_hard(self):
+        before = self.infeasible
+        self.infeasible = {}
+        self.reserved = {}
+        self.hard_finish = {}
+        used: dict[int, int] = {}
+        day = None
+        for t in sorted(self.hard.values(), key=lambda t: (t.due, t.id), reverse=True):
+            need = max(t.est_min, 0)
+            due_day = (t.due - self.start).days
+            day = due_day if day is None else min(day, due_day)
+            self.hard_finish[t.id] = max(day, 0)
+            while need and day >= 0:
+                take = min(self.capacity - used.get(day, 0), need)
+                if take:
+                    used[day] = used.get(day, 0) + take
+                    self.reserved.setdefault(day, []).append((t.id, take))
+                    need -= take
+                if need:
+                    day -= 1  # this day is full
+            if need or due_day < 0:  # an overdue hard task has missed its deadline already
+                self.infeasible[t.id] = need
+        # only overflow entries that changed move in the queue
+        for task_id, need in before.items():
+            if self.infeasible.get(task_id) != need:
+                self._dequeue(task_id)
+        for task_id, need in self.infeasible.items():
+            if before.get(task_id) != need:
+                t = self.hard[task_id]
+                self._enqueue((-1, t.due.toordinal(), t.priority, t.id), need)
+        last = max(used, default=-1)
+        self.free_totals = list(itertools.accumulate(self.capacity - used.get(d, 0) for d in range(last + 1)))
+        self.hard_dirty = False
+
+    @property
+    def dirty(self) -> bool:
+        """Whether changes are waiting for refresh()"""
+        return self.hard_dirty or self.valid < len(self.queue) or len(self.totals) != len(self.queue)
+
+    def refresh(self):
+        """Bring the plan up to date after changes"""
+        if self.hard_dirty:
+            self._place_hard()
+        if self.valid < len(self.queue) or len(self.totals) != len(self.queue):
+            start = self.totals[self.valid - 1] if self.valid else 0
+            self.totals[self.valid:] = itertools.accumulate(self.minutes[self.valid:], initial=start)
+            del self.totals[self.valid]  # the initial value
+            self.valid = len(self.queue)
+
+    def _free_total(self, day: int) -> int:
+        """Soft minutes available from the start through the end of `day`"""
+        if day < 0:
+            return 0
+        ft = self.free_totals
+        if day < len(ft):
+            return ft[day]
+        return (ft[-1] if ft else 0) + (day - len(ft) + 1) * self.capacity
+
+    def _day_for(self, total: int) -> int:
+        """Day on which the soft work reaches `total` minutes"""
+        ft = self.free_totals
+        if ft and total <= ft[-1]:
+            return bisect.bisect_left(ft, total)
+        done = ft[-1] if ft else 0
+        return len(ft) + max(0, -(-(total - done) // self.capacity) - 1)
+
+    def finish_day(self, task_id: int) -> date | None:
+        """Day a task is finished under the plan"""
+        self.refresh()
+        if task_id in self.hard and task_id not in self.infeasible:
+            return self.start + timedelta(days=self.hard_finish[task_id])
+        key = self.queued.get(task_id)
+        if key is None:
+            return None
+        total = self.totals[bisect.bisect_left(self.queue, key)]
+        return self.start + timedelta(days=self._day_for(total))
+
+    def day_plan(self, day: int) -> list[tuple[int, int]]:
+        """(task id, minutes) worked on `day` days after the start: hard work first"""
+        self.refresh()
+        plan = list(reversed(self.reserved.get(day, [])))
+        lo, hi = self._free_total(day - 1), self._free_total(day)
+        pos = bisect.bisect_right(self.totals, lo) if day else 0
+        while pos < len(self.queue):
+            total, minutes = self.totals[pos], self.minutes[pos]
+            if total - minutes >= hi and not (minutes == 0 and total == hi):
+                break
+            plan.append((self.queue[pos][-1], min(total, hi) - max(total - minutes, lo)))
+            pos += 1
+        return plan
+
+    def penalty(self) -> int:
+        """Total lateness cost of the soft tasks with due dates"""
+        self.refresh()
+        cost = 0
+        start = self.start.toordinal()
+        for (kind, slack_due, priority, _), total in zip(self.queue, self.totals):
+            if kind != 0:
+                continue
+            due = slack_due - (priority - 1)
+            late = start + self._day_for(total) - due
+            if late > 0:
+                cost += late * (6 - priority)
+        return cost
+
+# ───── overdue tracking ────────────────────────────────────────
+class OverdueTracker:
+    """Which open tasks are past their due date, kept current as days pass.
+
+    Open tasks due today or later wait in a min-heap of (due ordinal, id).
+    When the day rolls over, advance() pops the ones now behind and moves
+    them to `overdue`: O(log n) per task that turns overdue, and the rest
+    are never looked at. A changed or deleted task leaves its heap entry
+    behind; `pending` holds each waiting task's live due date, so stale
+    entries are skipped when popped, and the heap is rebuilt once they
+    outnumber the live ones.
+    """
+    def __init__(self, today: date | None = None):
+        self.today = today or date.today()
+        self.heap: list[tuple[int, int]] = []
+        self.pending: dict[int, int] = {}  # id -> due ordinal, tasks not overdue yet
+        self.overdue: set[int] = set()
+
+    def rebuild(self, tasks):
+        today = self.today.toordinal()
+        self.pending = {}
+        self.overdue = set()
+        for t in tasks:
+            if t.done or t.due is None:
+                continue
+            due = t.due.toordinal()
+            if due < today:
+                self.overdue.add(t.id)
+            else:
+                self.pending[t.id] = due
+        self.heap = [(due, task_id) for task_id, due in self.pending.items()]
+        heapq.heapify(self.heap)
+
+    def update(self, t: Task):
+        """Track a task after it was added or changed"""
+        self.remove(t.id)
+        if t.done or t.due is None:
+            return
+        due = t.due.toordinal()
+        if due < self.today.toordinal():
+            self.overdue.add(t.id)
+            return
+        self.pending[t.id] = due
+        heapq.heappush(self.heap, (due, t.id))
+        if len(self.heap) > 2 * len(self.pending) + 64:
+            self.heap = [(due, task_id) for task_id, due in self.pending.items()]
+            heapq.heapify(self.heap)
+
+    def remove(self, task_id: int):
+        self.overdue.discard(task_id)
+        self.pending.pop(task_id, None)
+
+    def advance(self, today: date) -> list[int]:
+        """Move to `today`; returns the ids that have just become overdue"""
+        self.today = today
+        today_no = today.toordinal()
+        heap, pending = self.heap, self.pending
+        newly = []
+        while heap and heap[0][0] < today_no:
+            due, task_id = heapq.heappop(heap)
+            if pending.get(task_id) == due:
+                del pending[task_id]
+                self.overdue.add(task_id)
+                newly.append(task_id)
+        return newly
+
+# ───── estimate rollups ────────────────────────────────────────
+class EstimateRollup:
+    """Estimated minutes of open work, totalled per category (lower-cased),
+    per due date (None = undated) and as overdue vs on track.
+
+    `contributions` remembers what each task last added to the totals, so a
+    change subtracts that and adds the new one: O(1) per task, never a scan.
+    Done tasks count for nothing. Totals that drop to zero are removed.
+    """
+    def __init__(self):
+        self.by_category: dict[str, int] = {}
+        self.by_due: dict[date | None, int] = {}
+        self.overdue = 0
+        self.on_track = 0
+        self.contributions: dict[int, tuple[str, date | None, int, bool]] = {}
+
+    def rebuild(self, tasks, overdue: set[int]):
+        by_category: dict[str, int] = {}
+        by_due: dict[date | None, int] = {}
+        totals = [0, 0]  # on track, overdue
+        contributions = self.contributions = {}
+        for t in tasks:
+            if t.done:
+                continue
+            category, minutes, late = t.category.lower(), t.est_min, t.id in overdue
+            contributions[t.id] = (category, t.due, minutes, late)
+            by_category[category] = by_category.get(category, 0) + minutes
+            by_due[t.due] = by_due.get(t.due, 0) + minutes
+            totals[late] += minutes
+        self.by_category = {key: total for key, total in by_category.items() if total}
+        self.by_due = {key: total for key, total in by_due.items() if total}
+        self.on_track, self.overdue = totals
+
+    @staticmethod
+    def _add(totals: dict, key, minutes: int):
+        total = totals.get(key, 0) + minutes
+        if total:
+            totals[key] = total
+        else:
+            totals.pop(key, None)
+
+    def _apply(self, entry: tuple[str, date | None, int, bool], sign: int):
+        category, due, minutes, overdue = entry
+        minutes *= sign
+        self._add(self.by_category, category, minutes)
+        self._add(self.by_due, due, minutes)
+        if overdue:
+            self.overdue += minutes
+        else:
+            self.on_track += minutes
+
+    def update(self, t: Task, overdue: bool):
+        """Count a task after it was added or changed; `overdue` as the OverdueTracker has it"""
+        self.remove(t.id)
+        if t.done:
+            return
+        entry = self.contributions[t.id] = (t.category.lower(), t.due, t.est_min, overdue)
+        self._apply(entry, 1)
+
+    def remove(self, task_id: int):
+        entry = self.contributions.pop(task_id, None)
+        if entry is not None:
+            self._apply(entry, -1)
+
+    def mark_overdue(self, task_ids):
+        """Move tasks the day roll-over made overdue from on track to overdue"""
+        for task_id in task_ids:
+            entry = self.contributions.get(task_id)
+            if entry is not None and not entry[3]:
+                self.on_track -= entry[2]
+                self.overdue += entry[2]
+                self.contributions[task_id] = entry[:3] + (True,)
+
+# ───── task list ───────────────────────────────────────────────
+class TodoList:
+    """The task list and everything done to it, without a window.
+
+    Tasks live in a SQLite TaskStore and are paged in as needed, or in
+    memory (a dict or TaskColumns), optionally with a TaskJournal or a
+    TaskAutosave behind them. Every change goes through here, so the
+    indexes, the planner, the overdue tracker, the estimate rollup and the
+    backend stay in step;
+    the GUI turns clicks into these calls and redraws. `on_change` is called
+    after each in-memory change (the GUI schedules its autosave from it).
+
+    Saved view results are memoized. Each is stamped with `version`, which
+    moves when tasks are added or removed, and with the `field_versions` of
+    the columns the view reads, which move when an edit changes that column;
+    a text edit leaves "Today" cached, a re-date does not.
+    """
+    def __init__(self, store: TaskStore | None = None, journal: TaskJournal | None = None,
+                 autosave: TaskAutosave | None = None, compact: bool = False):
+        self.store = store
+        self.journal = journal
+        self.autosave = autosave
+        self.index = TaskIndex(compact)
+        self.today = date.today()  # moved on by roll_day
+        self.planner = DayPlanner(start=self.today)
+        self.overdue = OverdueTracker(self.today)  # in-memory tasks only; store rows compare dates
+        self.rollup = EstimateRollup()  # in-memory tasks only; a store sums with SQL
+        self.plan_loaded = store is None  # a store's tasks are only read when a plan is asked for
+        self.on_change = None
+        self.version = 0
+        self.field_versions = dict.fromkeys(SORT_KEYS, 0)
+        self.changes = 0  # bumped by every change, for anything that shows all of the tasks
+        self.view_cache: dict[tuple, tuple[tuple, list[int] | PagedTaskRows]] = {}
+        self.saved: dict[int, Task] | None = None  # private Task copies for the autosave worker
+        self.unsaved: set[int] = set()  # ids changed since the last snapshot
+
+    def load(self):
+        """Read the tasks from the journal or autosave file, if there is one"""
+        if self.journal is not None:
+            self.set_tasks(self.journal.load())
+            self.journal.tasks = self.tasks  # compact from the live tasks, not a second copy
+        elif self.autosave is not None:
+            self.set_tasks(self.autosave.load())
+
+    @property
+    def tasks(self) -> dict[int, Task] | TaskColumns:
+        """id -> Task for in-memory lists (empty with a store)"""
+        return self.index.by_id
+
+    def set_tasks(self, tasks):
+        """Replace all in-memory tasks, e.g. after loading"""
+        self.index.rebuild(tasks)
+        self.planner.rebuild(self.tasks.values())
+        self.overdue.rebuild(self.tasks.values())
+        self.rollup.rebuild(self.tasks.values(), self.overdue.overdue)
+        self.saved = None
+        if self.autosave is not None:
+            self.snapshot()  # the one full copy, made while loading rather than on the first save
+        self.version += 1
+        self.changes += 1
+
+    def _changed(self, task_ids):
+        if self.autosave is not None:
+            self.unsaved.update(task_ids)
+        if self.on_change is not None:
+            self.on_change()
+
+    def snapshot(self) -> dict[int, Task] | TaskColumns:
+        """The tasks as they are now, for the autosave worker to encode.
+
+        Compact columns are copied as whole arrays. Task objects are copied
+        once, then only the ones changed since the last snapshot are copied
+        again, into new objects: the worker never sees a Task the Tk thread
+        is still editing.
+        """
+        if isinstance(self.tasks, TaskColumns):
+            return self.tasks.copy()
+        if self.saved is None:
+            self.saved = {task_id: _copy_task(t) for task_id, t in self.tasks.items()}
+        else:
+            for task_id in self.unsaved:
+                t = self.tasks.get(task_id)
+                if t is None:
+                    self.saved.pop(task_id, None)
+                else:
+                    self.saved[task_id] = _copy_task(t)
+        self.unsaved.clear()
+        return self.saved.copy()
+
+    # ── queries ───────────────────────────────────────────────
+    def rows(self, sort: str | None = None, today_only: bool = False, category: str | None = None,
+             search: str = "") -> IndexView | IdView | PagedTaskRows:
+        """Tasks matching the filters, in `sort` column order"""
+        view = SavedView("", due_from=0 if today_only else None, due_to=0 if today_only else None,
+                         category=category)
+        return self.view_rows(view.sorted_by(sort), search)
+
+    def view_rows(self, view: SavedView, search: str = "") -> IndexView | IdView | PagedTaskRows:
+        """A saved view's tasks, narrowed by a search; the view part is memoized"""
+        if self.store is None and not view.filtered and len(view.sort) <= 1 \
+                and not any(descending for _, descending in view.sort):
+            # one plain sort: the index already is the answer
+            column = view.sort[0][0] if view.sort else None
+            if tokenize(search):
+                return self._search_rows(self.index.search(search), column)
+            return self.index.column(column)
+        key = (view, search) if self.store is not None else view
+        stamp = (self.version, self.today if view.dated else None,
+                 *[self.field_versions[column] for column in sorted(view.columns)])
+        cached = self.view_cache.pop(key, None)  # re-inserted below, so the dict stays in LRU order
+        if cached is not None and cached[0] == stamp:
+            result = cached[1]
+        elif self.store is not None:
+            result = self.store.view_rows(view, self.today, search)
+        else:
+            result = self._view_ids(view)
+        self.view_cache[key] = (stamp, result)
+        if len(self.view_cache) > VIEW_CACHE_SIZE:
+            del self.view_cache[next(iter(self.view_cache))]
+        if self.store is not None:
+            return result
+        if tokenize(search):
+            matches = self.index.search(search)
+            result = [i for i in result if i in matches]
+        return IdView(self.index.by_id, result, len(result))
+
+    def _view_ids(self, view: SavedView) -> list[int]:
+        """Ids of a view's tasks in order: the narrowest index range, filtered on the rest, then sorted"""
+        index = self.index
+        keys = index.keys
+        # each filter is a key range [low, high) of one sorted column
+        ranges = []
+        if view.dated:
+            ranges.append(("Due", date.min if view.due_from is None else self.today + timedelta(days=view.due_from),
+                           date.max if view.due_to is None else self.today + timedelta(days=view.due_to + 1)))
+        if view.category is not None:
+            category = view.category.lower()
+            ranges.append(("Cat", category, category + "\0"))  # nothing sorts between the two
+        if view.max_priority is not None:
+            ranges.append(("Pr", float("-inf"), view.max_priority + 1))
+        if view.hard is not None:
+            ranges.append(("Hard", not view.hard, (not view.hard) + 1))
+        if view.done is not None:
+            ranges.append(("Status", view.done, view.done + 1))
+        if not ranges:
+            ids = [id_ for _, id_ in index.sorted[None]]
+        else:
+            spans = []
+            for column, low, high in ranges:
+                entries = index.sorted[column]
+                lo = bisect.bisect_left(entries, (low,))
+                spans.append((bisect.bisect_left(entries, (high,), lo) - lo, lo, column, low, high))
+            size, lo, source, _, _ = min(spans)
+            ids = [id_ for _, id_ in index.sorted[source][lo:lo + size]]
+            for column, low, high in ranges:
+                if column != source:
+                    column_no = COLUMN_NO[column]
+                    ids = [i for i in ids if low <= keys[i][column_no] < high]
+            if view.due_from is not None:
+                # a series due before the window may recur inside it; ask its occurrences
+                _, first, end = ranges[0]
+                last = end - timedelta(days=1) if view.due_to is not None else None
+                others = [(COLUMN_NO[column], low, high) for column, low, high in ranges[1:]]
+                ids += [i for i, repeat in index.recurring.items()
+                        if keys[i][DUE_COLUMN] < first
+                        and all(low <= keys[i][n] < high for n, low, high in others)
+                        and occurs_between(keys[i][DUE_COLUMN], repeat, first, last)]
+            ids.sort()
+        # stable sorts, least significant key first; equal keys stay in id order
+        for column, descending in reversed(view.sort):
+            ids.sort(key=lambda i, n=COLUMN_NO[column]: keys[i][n], reverse=descending)
+        return ids
+
+    def _search_rows(self, matches: set[int], sort: str | None) -> IdView:
+        """Matching tasks in view order, found lazily as the view scrolls"""
+        by_id = self.index.by_id
+        if len(matches) * 16 < len(by_id):
+            if sort is None:
+                return IdView(by_id, sorted(matches), len(matches))
+            column_no = COLUMN_NO[sort]
+            keys = self.index.keys
+            return IdView(by_id, sorted(matches, key=lambda i: (keys[i][column_no], i)), len(matches))
+        # many matches: walk the sorted index instead of sorting them
+        ordered = map(operator.itemgetter(1), self.index.sorted[sort])
+        return IdView(by_id, filter(matches.__contains__, ordered), len(matches))
+
+    def get_many(self, task_ids) -> list[Task]:
+        if self.store is not None:
+            return self.store.get_many(list(task_ids))
+        tasks = self.tasks
+        return [tasks[i] for i in task_ids if i in tasks]
+
+    def ids_in_view(self, view: SavedView, search: str, task_ids) -> set[int]:
+        """Which of `task_ids` view_rows(view, search) contains; costs O(len(task_ids)), not O(view)"""
+        task_ids = list(task_ids)
+        if self.store is not None:
+            return self.store.view_rows(view, self.today, search).ids_within(task_ids)
+        matches = self.index.search(search) if tokenize(search) else None
+        tasks = self.tasks
+        return {i for i in task_ids
+                if i in tasks and (matches is None or i in matches) and view.matches(tasks[i], self.today)}
+
+    def is_overdue(self, t: Task) -> bool:
+        if self.store is not None:
+            return t.due is not None and t.due < self.today and not t.done
+        return t.id in self.overdue.overdue
+
+    def estimates(self) -> EstimateRollup:
+        """Open estimated minutes per category, per due date and overdue vs on track"""
+        if self.store is not None:
+            return self.store.estimate_rollup(self.today)
+        return self.rollup
+
+    # ── changes ───────────────────────────────────────────────
+    def add(self, task: Task):
+        if self.store is not None:
+            self.store.add(task)
+        else:
+            self.index.add(task)
+            if self.journal is not None:
+                self.journal.add(task)
+            self.overdue.update(task)
+            self.rollup.update(task, task.id in self.overdue.overdue)
+            self._changed((task.id,))
+        self.version += 1
+        self.changes += 1
+        self.planner.update(task)
+
+    def update_many(self, tasks: list[Task]):
+        """Save tasks whose fields were changed, as one batch"""
+        if self.store is not None:
+            self.store.update_many(tasks)
+            changed = SORT_KEYS  # the rows aren't in memory to compare
+        else:
+            changed = self.index.update_many(tasks)
+            if self.journal is not None:
+                for task in tasks:
+                    self.journal.update(task)
+            for task in tasks:
+                self.overdue.update(task)
+                self.rollup.update(task, task.id in self.overdue.overdue)
+            self._changed(task.id for task in tasks)
+        for column in changed:
+            self.field_versions[column] += 1
+        self.changes += 1
+        for task in tasks:
+            self.planner.update(task)
+
+    def toggle_many(self, tasks: list[Task]) -> list[Task]:
+        """Flip done on each task. Completing a recurring task instead records
+        that occurrence as a done task and moves the series to its next date
+        after both the completed one and today; returns the recorded ones."""
+        finished = []
+        for t in tasks:
+            if t.repeat and t.due is not None and not t.done:
+                finished.append(Task(t.text, True, t.priority, t.due, t.category, t.est_min, t.hard))
+                t.due = next(occurrences(t.due, t.repeat, max(t.due, self.today) + timedelta(days=1)))
+            else:
+                t.done = not t.done
+        self.update_many(tasks)
+        for t in finished:
+            self.add(t)
+        return finished
+
+    def delete_many(self, tasks: list[Task]):
+        if self.store is not None:
+            self.store.delete_many([task.id for task in tasks])
+        else:
+            self.index.remove_many(tasks)
+            if self.journal is not None:
+                for task in tasks:
+                    self.journal.delete(task.id)
+            for task in tasks:
+                self.overdue.remove(task.id)
+                self.rollup.remove(task.id)
+            self._changed(task.id for task in tasks)
+        self.version += 1
+        self.changes += 1
+        for task in tasks:
+            self.planner.remove(task.id)
+
+    def roll_day(self, today: date) -> list[int]:
+        """Move to a new day; returns the ids that have just become overdue"""
+        self.today = today
+        self.planner.set_start(today)  # hard deadlines are now a day closer
+        newly = self.overdue.advance(today)
+        self.rollup.mark_overdue(newly)
+        return newly
+
+    # ── import & export ───────────────────────────────────────
+    def import_file(self, path: str) -> tuple[int, list[str]]:
+        """Add every valid task in a CSV/JSON Lines file: (tasks added, errors)"""
+        errors: list[str] = []
+        count = 0
+        imported: list[Task] = []
+        for batch in read_task_file(path, errors):
+            if self.store is not None:
+                self.store.add_many(batch)
+            else:
+                imported += batch
+            count += len(batch)
+        if imported:
+            if len(imported) > len(self.tasks):
+                # one rebuild beats merging many batches into every sorted column
+                self.index.rebuild(itertools.chain(self.tasks.values(), imported))
+            else:
+                self.index.add_many(imported)
+        if count:
+            self.version += 1
+            self.changes += 1
+            if self.store is not None:
+                self.plan_loaded = False
+            else:
+                self.planner.rebuild(self.tasks.values())
+                self.overdue.rebuild(self.tasks.values())
+                self.rollup.rebuild(self.tasks.values(), self.overdue.overdue)
+                if self.journal is not None:
+                    self.journal.tasks = self.tasks  # a rebuild made a new mapping
+                    self.journal.compact()  # one snapshot instead of a record per imported task
+                self._changed(task.id for task in imported)
+        return count, errors
+
+    def export_file(self, path: str) -> int:
+        """Write every task to a CSV/JSON Lines file"""
+        if self.store is not None:
+            return write_task_file(path, PagedTaskRows(self.store, "", (), "id", page_size=4096))
+        return write_task_file(path, self.tasks.values())
+
+    # ── day plan ──────────────────────────────────────────────
+    def load_plan(self) -> DayPlanner:
+        """The planner, built from the store the first time a plan is asked for"""
+        if self.plan_loaded:
+            return self.planner
+        if self.store is not None:
+            # every open task, read a page at a time
+            self.planner.rebuild(PagedTaskRows(self.store, "WHERE done = 0", (), "id", page_size=2048))
+        else:
+            self.planner.rebuild(self.tasks.values())
+        self.plan_loaded = True
+        return self.planner
@@ -0,0 +1,287 @@
+"""
+Auto-player and tournament runner for WHOMPUS HUNT 2.0
+
+The bot plays the headless rules from whompus_rules.py: it questions the
+AIs, works out who is lying from their answers, and moves to the room it
+thinks is safest. The tournament runner plays many seeded games across a
+process pool to see how winnable the current rules are.
+
+    python whompus_bot.py --games 100000 --workers 8
+"""
+from concurrent.futures import ProcessPoolExecutor
+from itertools import permutations
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Tuple
+import argparse
+import os
+import random
+import time
+
+from game_history import GameHistory, game_row
+from whompus_rules import (
+    DIRECTIONS, GameState, check_room_status, get_valid_moves, whompus_move
+)
+
+AI_NAMES = ('ALI', 'AN', 'ALE')
+OUTCOMES = ('survived', 'trap', 'whompus')
+
+# Every way the three roles can be handed out, e.g. {'ALI': 'truth', ...}
+ROLE_HYPOTHESES = [
+    dict(zip(AI_NAMES, roles))
+    for roles in permutations(('truth', 'villain', 'fifty'))
+]
+# (truth AI, villain AI, fifty AI) for each hypothesis, worked out once
+ROLE_NAMES = [
+    tuple(next(name for name, role in roles.items() if role == wanted)
+          for wanted in ('truth', 'villain', 'fifty'))
+    for roles in ROLE_HYPOTHESES
+]
+
+# Chance that any one room is dangerous: 10 traps + the whompus over 98 rooms
+DANGER_PRIOR = 11 / 98
+
+################################################################################################
+################ Answers from the AIs ######################################
+################################################################################################
+@lru_cache(maxsize=None)
+def adjacent_rooms(position: Tuple[int, int]) -> FrozenSet[Tuple[int, int]]:
+    """Rooms the player can reach in one move"""
+    row, col = position
+    return frozenset(
+        (row + DIRECTIONS[direction][0], col + DIRECTIONS[direction][1])
+        for direction in get_valid_moves(position)
+    )
+
+def ai_answer(game_state: GameState, ai_name: str, rng=random) -> FrozenSet[Tuple[int, int]]:
+    """
+    Rooms next to the player that an AI claims are dangerous. The truth AI
+    reports trap and whompus rooms, the villain reports the opposite and the
+    fifty AI picks one of the two at random.
+    """
+    adjacent = adjacent_rooms(game_state.player_position)
+    danger = frozenset(
+        room for room in adjacent
+        if check_room_status(room, game_state) != 'empty'
+    )
+    role = game_state.ai_roles[ai_name]
+    if role == 'fifty':
+        role = 'truth' if rng.random() < 0.5 else 'villain'
+    return danger if role == 'truth' else adjacent - danger
+
+################################################################################################
+################ Auto-player ######################################
+################################################################################################
+class AutoPlayer:
+    """
+    Keeps a belief over the six possible role assignments. Each round of
+    answers is scored under every hypothesis: the truth AI's claim must be
+    the exact opposite of the villain's, and the fifty AI must match one of
+    them. Once one hypothesis is certain enough, only the truth AI is asked.
+    """
+    def __init__(self, confidence: float = 0.99):
+        self.confidence = confidence
+        self.belief = [1 / len(ROLE_HYPOTHESES)] * len(ROLE_HYPOTHESES)
+        self.visited = {(9, 0)}
+
+    def best_hypothesis(self) -> Tuple[Dict[str, str], float]:
+        """Most likely role assignment and its probability"""
+        index = max(range(len(self.belief)), key=self.belief.__getitem__)
+        return ROLE_HYPOTHESES[index], self.belief[index]
+
+    def choose_ais(self) -> List[str]:
+        """Which AIs to question this turn"""
+        roles, probability = self.best_hypothesis()
+        if probability >= self.confidence:
+            return [name for name, role in roles.items() if role == 'truth']
+        return list(AI_NAMES)
+
+    def danger_map(self, adjacent: FrozenSet[Tuple[int, int]], answers: Dict[str, FrozenSet]) -> Dict[Tuple[int, int], float]:
+        """Update the belief with one round of answers and return P(danger) per room"""
+        likelihoods = []
+        claims = []
+        for truth, villain, fifty in ROLE_NAMES:
+            claimed = answers.get(truth)
+            if claimed is None and villain in answers:
+                claimed = adjacent - answers[villain]
+            claims.append(claimed)
+            if claimed is None:
+                likelihoods.append(1.0)
+                continue
+            opposite = adjacent - claimed
+            if villain in answers and answers[villain] != opposite:
+                likelihoods.append(0.0)
+                continue
+            likelihood = DANGER_PRIOR ** len(claimed) * (1 - DANGER_PRIOR) ** len(opposite)
+            if fifty in answers:
+                likelihood *= 0.5 if answers[fifty] in (claimed, opposite) else 0.0
+            likelihoods.append(likelihood)
+
+        weighted = [b * l for b, l in zip(self.belief, likelihoods)]
+        total = sum(weighted)
+        # Answers no hypothesis explains (shouldn't happen) leave the belief alone
+        if total > 0:
+            self.belief = [w / total for w in weighted]
+
+        danger = dict.fromkeys(adjacent, 0.0)
+        for claimed, weight in zip(claims, self.belief):
+            if claimed is None:
+                continue
+            for room in claimed:
+                danger[room] += weight
+        return danger
+
+    def choose_move(self, position: Tuple[int, int], danger: Dict[Tuple[int, int], float]) -> Tuple[int, int]:
+        """Pick the safest neighbour, preferring rooms we have not visited"""
+        return min(
+            danger,
+            key=lambda room: (round(danger[room], 3), room in self.visited, room)
+        )
+
+################################################################################################
+################ Headless game ######################################
+################################################################################################
+def play_headless_game(seed: int, max_moves: int = 200) -> Tuple[str, int]:
+    """Play one seeded game with the auto-player and return (outcome, player_moves)"""
+    outcome, game_state = _play_game(seed, max_moves)
+    return outcome, game_state.player_moves
+
+def _play_game(seed: int, max_moves: int) -> Tuple[str, GameState]:
+    """
+    Play one game with the auto-player. Mirrors play_round: asking an AI and
+    moving both count as moves, and the whompus only moves after the player
+    does. Returns the outcome and the final state.
+
+    The golden GPU is not placed by the current rules, so a game that lasts
+    max_moves counts as 'survived'.
+    """
+    rng = random.Random(seed)
+    game_state = GameState()
+    game_state.initialize_trap_doors(rng)
+    game_state.assign_ai_roles(rng)
+    bot = AutoPlayer()
+
+    while game_state.player_moves < max_moves:
+        adjacent = adjacent_rooms(game_state.player_position)
+        answers = {}
+        for ai_name in bot.choose_ais():
+            game_state.increment_moves('select_ai')
+            answers[ai_name] = ai_answer(game_state, ai_name, rng)
+            game_state.complete_action()
+        danger = bot.danger_map(adjacent, answers)
+
+        game_state.increment_moves('move')
+        new_position = bot.choose_move(game_state.player_position, danger)
+        game_state.player_position = new_position
+        bot.visited.add(new_position)
+
+        room_status = check_room_status(new_position, game_state)
+        if room_status != 'empty':
+            return room_status, game_state
+
+        new_whompus_position = whompus_move(game_state, new_position, rng)
+        if new_whompus_position != game_state.whompus_position:
+            game_state.whompus_position = new_whompus_position
+            game_state.whompus_moves += 1
+            if new_whompus_position == new_position:
+                return 'whompus', game_state
+        game_state.complete_action()
+
+    return 'survived', game_state
+
+################################################################################################
+################ Tournament runner ######################################
+################################################################################################
+def _play_chunk(args: Tuple[int, int, int, int, bool]) -> Dict[str, object]:
+    """
+    Play seeds [start, stop) and return only the totals, so workers send back
+    a few ints. With record set, one compact history row per game comes back too.
+    """
+    start, stop, seed, max_moves, record = args
+    totals = {outcome: 0 for outcome in OUTCOMES}
+    totals['death_moves'] = 0
+    rows = []
+    for game in range(start, stop):
+        outcome, game_state = _play_game((seed << 32) | game, max_moves)
+        totals[outcome] += 1
+        if outcome != 'survived':
+            totals['death_moves'] += game_state.player_moves
+        if record:
+            rows.append(game_row(game_state, outcome, player='bot'))
+    totals['rows'] = rows
+    return totals
+
+def _add_chunk_totals(results, totals: Dict[str, int], history):
+    """Fold each chunk's counts into `totals` as they arrive, recording its games"""
+    for chunk_totals in results:
+        rows = chunk_totals.pop('rows')
+        if history is not None:
+            history.record_rows(rows)
+        for key, value in chunk_totals.items():
+            totals[key] += value
+
+def run_tournament(games: int, workers: int = None, seed: int = 0, max_moves: int = 200,
+                   history_path: str = None) -> Dict[str, float]:
+    """
+    Play `games` seeded games across a process pool and summarise the results.
+    With history_path, every game is also written to that GameHistory database.
+    """
+    if games <= 0:
+        raise ValueError(f"games must be positive, got {games}")
+    workers = workers or os.cpu_count() or 1
+    # A few chunks per worker keeps cores busy without much pickling
+    chunk_size = max(1, games // (workers * 4))
+    chunks = [
+        (start, min(start + chunk_size, games), seed, max_moves, history_path is not None)
+        for start in range(0, games, chunk_size)
+    ]
+
+    started = time.perf_counter()
+    totals = {outcome: 0 for outcome in OUTCOMES}
+    totals['death_moves'] = 0
+    history = GameHistory(history_path, batch_size=10_000) if history_path else None
+    try:
+        if workers == 1:
+            _add_chunk_totals(map(_play_chunk, chunks), totals, history)
+        else:
+            # the with block shuts the workers down even if a game raises
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                _add_chunk_totals(pool.map(_play_chunk, chunks), totals, history)
+    finally:
+        if history is not None:
+            history.close()
+    elapsed = time.perf_counter() - started
+
+    deaths = totals['trap'] + totals['whompus']
+    return {
+        'games': games,
+        'workers': workers,
+        'win_rate': totals['survived'] / games,
+        'mean_moves_to_death': totals['death_moves'] / deaths if deaths else 0.0,
+        'trap_deaths': totals['trap'],
+        'whompus_deaths': totals['whompus'],
+        'seconds': elapsed,
+        'games_per_second': games / elapsed if elapsed else 0.0
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Balance test WHOMPUS with the auto-player")
+    parser.add_argument('--games', type=int, default=100_000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-moves', type=int, default=200)
+    parser.add_argument('--history', default=None, help="also record every game in this SQLite file")
+    args = parser.parse_args()
+
+    report = run_tournament(args.games, args.workers, args.seed, args.max_moves, args.history)
+    deaths = report['trap_deaths'] + report['whompus_deaths']
+    print(f"Games played:        {report['games']} on {report['workers']} worker(s)")
+    print(f"Win rate:            {report['win_rate']:.2%} (survived {args.max_moves} moves)")
+    print(f"Mean moves to death: {report['mean_moves_to_death']:.1f}")
+    for cause in ('trap', 'whompus'):
+        count = report[f'{cause}_deaths']
+        share = count / deaths if deaths else 0.0
+        print(f"Deaths by {cause + ':':<10} {count} ({share:.1%})")
+    print(f"Time:                {report['seconds']:.1f}s ({report['games_per_second']:.0f} games/s)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,370 @@
+"""
+Two-player WHOMPUS over TCP: a second player controls the Whompus
+
+The player's game is the host and owns the GameState. After every player
+move it sends the guest a small delta frame with only what changed (move
+counter, positions, newly lit rooms) and, when the speed rules allow it,
+waits for the guest's Whompus move. Every frame carries a turn number, so
+both sides apply turns in the same order and ignore nothing silently.
+
+    python finalproject.py --host 8765          # player, waits for a guest
+    python whompus_net.py join 127.0.0.1 8765   # Whompus, in the terminal
+    python whompus_net.py bench --turns 2000    # loopback latency and bytes
+"""
+from types import MappingProxyType
+from typing import Callable, Optional, Set, Tuple
+import argparse
+import asyncio
+import pickle
+import random
+import statistics
+import struct
+import threading
+import time
+
+from whompus_rules import (
+    DIRECTIONS, GameState, get_valid_moves, whompus_may_move, whompus_move
+)
+
+# Frame header: kind (b'D' delta from host, b'M' move from guest), turn number, field mask
+HEADER = struct.Struct('!cHB')
+
+# Bits in the field mask; fields are packed in this order after the header
+MOVES = 1          # H: player move counter
+PLAYER = 2         # B: player room as row * 10 + col
+WHOMPUS = 4        # B: whompus room
+REVEALED = 8       # B count, then one B per newly lit room
+MAY_MOVE = 16      # no payload: the whompus may move this turn
+GAME_OVER = 32     # B: 0 trap, 1 whompus
+
+OUTCOME_CODES = {'trap': 0, 'whompus': 1}
+OUTCOME_NAMES = {code: name for name, code in OUTCOME_CODES.items()}
+
+
+class ProtocolError(Exception):
+    """A frame arrived out of turn or described an impossible move"""
+
+
+def _room(code: int) -> Tuple[int, int]:
+    return divmod(code, 10)
+
+
+def _code(position: Tuple[int, int]) -> int:
+    return position[0] * 10 + position[1]
+
+
+################################################################################################
+################ What each side knows ######################################
+################################################################################################
+class SyncedView:
+    """The shared part of the game that both sides keep in step"""
+    def __init__(self):
+        self.turn = 0
+        self.player_moves = 0
+        self.player_position = (9, 0)
+        self.whompus_position = (0, 9)
+        self.revealed: Set[Tuple[int, int]] = {(9, 0)}
+        self.may_move = False
+        self.outcome: Optional[str] = None
+
+    def delta_to(self, game_state: GameState, may_move: bool, outcome: Optional[str] = None) -> bytes:
+        """Pack only what changed since this view, then update the view to match"""
+        self.turn = (self.turn + 1) % 65536
+        mask = 0
+        payload = b''
+        if game_state.player_moves != self.player_moves:
+            mask |= MOVES
+            payload += struct.pack('!H', game_state.player_moves)
+            self.player_moves = game_state.player_moves
+        if game_state.player_position != self.player_position:
+            mask |= PLAYER
+            payload += bytes([_code(game_state.player_position)])
+            self.player_position = game_state.player_position
+        if game_state.whompus_position != self.whompus_position:
+            mask |= WHOMPUS
+            payload += bytes([_code(game_state.whompus_position)])
+            self.whompus_position = game_state.whompus_position
+        if game_state.player_position not in self.revealed:
+            mask |= REVEALED
+            payload += bytes([1, _code(game_state.player_position)])
+            self.revealed.add(game_state.player_position)
+        if may_move:
+            mask |= MAY_MOVE
+        if outcome is not None:
+            mask |= GAME_OVER
+            payload += bytes([OUTCOME_CODES[outcome]])
+            self.outcome = outcome
+        self.may_move = may_move
+        return HEADER.pack(b'D', self.turn, mask) + payload
+
+    async def apply_delta(self, reader: asyncio.StreamReader) -> int:
+        """Read one delta frame, check it is the next turn and apply it; returns bytes read"""
+        header = await reader.readexactly(HEADER.size)
+        kind, turn, mask = HEADER.unpack(header)
+        size = len(header)
+        if kind != b'D' or turn != (self.turn + 1) % 65536:
+            raise ProtocolError(f"expected delta for turn {self.turn + 1}, got {kind!r} {turn}")
+        self.turn = turn
+        if mask & MOVES:
+            self.player_moves, = struct.unpack('!H', await reader.readexactly(2))
+            size += 2
+        if mask & PLAYER:
+            self.player_position = _room((await reader.readexactly(1))[0])
+            size += 1
+        if mask & WHOMPUS:
+            self.whompus_position = _room((await reader.readexactly(1))[0])
+            size += 1
+        if mask & REVEALED:
+            count = (await reader.readexactly(1))[0]
+            rooms = await reader.readexactly(count)
+            self.revealed.update(_room(code) for code in rooms)
+            size += 1 + count
+        self.may_move = bool(mask & MAY_MOVE)
+        if mask & GAME_OVER:
+            self.outcome = OUTCOME_NAMES[(await reader.readexactly(1))[0]]
+            size += 1
+        return size
+
+
+def pack_move(turn: int, position: Optional[Tuple[int, int]]) -> bytes:
+    """The guest's reply for a turn; no position means the whompus stays put"""
+    if position is None:
+        return HEADER.pack(b'M', turn, 0)
+    return HEADER.pack(b'M', turn, WHOMPUS) + bytes([_code(position)])
+
+
+################################################################################################
+################ Host: the player's game ######################################
+################################################################################################
+class WhompusHost:
+    """Accepts one guest and asks it for the whompus move each turn"""
+    def __init__(self):
+        self.view = SyncedView()
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.connected = asyncio.Event()
+        self.server = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.round_trips = []  # seconds per turn
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8765) -> int:
+        """Start listening and return the port actually used"""
+        self.server = await asyncio.start_server(self._on_connect, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def _on_connect(self, reader, writer):
+        if self.connected.is_set():
+            writer.close()
+            return
+        self.reader, self.writer = reader, writer
+        self.connected.set()
+
+    async def play_turn(self, game_state: GameState) -> Tuple[int, int]:
+        """Send this turn's delta and return where the guest moved the whompus"""
+        await self.connected.wait()
+        may_move = whompus_may_move(game_state.player_moves)
+        frame = self.view.delta_to(game_state, may_move)
+        started = time.perf_counter()
+        self.writer.write(frame)
+        await self.writer.drain()
+        self.bytes_sent += len(frame)
+
+        header = await self.reader.readexactly(HEADER.size)
+        kind, turn, mask = HEADER.unpack(header)
+        self.bytes_received += len(header)
+        if kind != b'M' or turn != self.view.turn:
+            raise ProtocolError(f"expected move for turn {self.view.turn}, got {kind!r} {turn}")
+        new_position = game_state.whompus_position
+        if mask & WHOMPUS:
+            new_position = _room((await self.reader.readexactly(1))[0])
+            self.bytes_received += 1
+            row, col = game_state.whompus_position
+            allowed = {
+                (row + DIRECTIONS[direction][0], col + DIRECTIONS[direction][1])
+                for direction in get_valid_moves(game_state.whompus_position)
+            }
+            if not may_move or new_position not in allowed:
+                raise ProtocolError(f"illegal whompus move to {new_position}")
+        # The guest already knows where it moved, so don't echo it back next turn
+        self.view.whompus_position = new_position
+        self.round_trips.append(time.perf_counter() - started)
+        return new_position
+
+    async def finish(self, game_state: GameState, outcome: str):
+        """Tell the guest how the game ended and hang up"""
+        if self.writer is None:
+            return
+        frame = self.view.delta_to(game_state, False, outcome)
+        self.writer.write(frame)
+        self.bytes_sent += len(frame)
+        await self.writer.drain()
+        self.writer.close()
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+
+class RemoteWhompusController:
+    """
+    Drop-in for whompus_move(game_state, player_position) that asks a remote
+    player instead. The asyncio loop runs on a background thread so the
+    canvas polling loop in finalproject.py stays as it is. If the guest
+    disconnects, the computer takes the whompus back.
+    """
+    def __init__(self, port: int, host: str = '0.0.0.0'):
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        self.session = self._run(self._create_host())
+        self.port = self._run(self.session.start(host, port))
+        self.remote = True
+
+    async def _create_host(self) -> WhompusHost:
+        # The host's Event must be created on the loop that uses it
+        return WhompusHost()
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def wait_for_guest(self):
+        self._run(self.session.connected.wait())
+
+    def __call__(self, game_state: GameState, player_position: Tuple[int, int]) -> Tuple[int, int]:
+        if self.remote:
+            try:
+                return self._run(self.session.play_turn(game_state))
+            except (ConnectionError, asyncio.IncompleteReadError, ProtocolError) as e:
+                print(f"\nWhompus player disconnected ({e}); the computer takes over.")
+                self.remote = False
+        return whompus_move(game_state, player_position)
+
+    def finish(self, game_state: GameState, outcome: str):
+        if self.remote:
+            try:
+                self._run(self.session.finish(game_state, outcome))
+            except ConnectionError:
+                pass
+        # One game per connection; later games go back to the computer whompus
+        self.remote = False
+        self._run(self.session.close())
+
+
+################################################################################################
+################ Guest: the whompus player ######################################
+################################################################################################
+async def run_guest(host: str, port: int,
+                    choose_move: Callable[[SyncedView], Optional[Tuple[int, int]]]) -> SyncedView:
+    """Follow the host's deltas, answering every turn with choose_move(view)"""
+    reader, writer = await asyncio.open_connection(host, port)
+    view = SyncedView()
+    try:
+        while True:
+            await view.apply_delta(reader)
+            if view.outcome is not None:
+                return view
+            move = choose_move(view) if view.may_move else None
+            if move is not None:
+                view.whompus_position = move
+            writer.write(pack_move(view.turn, move))
+            await writer.drain()
+    except asyncio.IncompleteReadError:
+        return view
+    finally:
+        writer.close()
+
+
+def terminal_whompus(view: SyncedView) -> Optional[Tuple[int, int]]:
+    """Ask the person at the terminal where to move (W/A/S/D, Enter to stay)"""
+    keys = {'w': 'UP', 's': 'DOWN', 'a': 'LEFT', 'd': 'RIGHT'}
+    valid = get_valid_moves(view.whompus_position)
+    print(f"\nTurn {view.turn}: player at {view.player_position} after {view.player_moves} moves, "
+          f"you are at {view.whompus_position}")
+    while True:
+        choice = input(f"Move ({'/'.join(k.upper() for k, d in keys.items() if d in valid)}, Enter to stay): ").strip().lower()
+        if not choice:
+            return None
+        if choice in keys and keys[choice] in valid:
+            drow, dcol = DIRECTIONS[keys[choice]]
+            return (view.whompus_position[0] + drow, view.whompus_position[1] + dcol)
+
+
+################################################################################################
+################ Loopback benchmark ######################################
+################################################################################################
+async def loopback_benchmark(turns: int = 2000, seed: int = 0) -> dict:
+    """Play scripted turns over loopback and measure round trip and bytes per turn"""
+    rng = random.Random(seed)
+    host = WhompusHost()
+    port = await host.start('127.0.0.1', 0)
+
+    def chase(view: SyncedView) -> Tuple[int, int]:
+        row, col = view.whompus_position
+        options = [
+            (row + DIRECTIONS[d][0], col + DIRECTIONS[d][1])
+            for d in get_valid_moves(view.whompus_position)
+        ]
+        target = view.player_position
+        return min(options, key=lambda p: abs(p[0] - target[0]) + abs(p[1] - target[1]))
+
+    guest = asyncio.ensure_future(run_guest('127.0.0.1', port, chase))
+    game_state = GameState()
+    for _ in range(turns):
+        game_state.increment_moves('move')
+        direction = rng.choice(get_valid_moves(game_state.player_position))
+        drow, dcol = DIRECTIONS[direction]
+        game_state.player_position = (game_state.player_position[0] + drow,
+                                      game_state.player_position[1] + dcol)
+        game_state.whompus_position = await host.play_turn(game_state)
+        game_state.complete_action()
+    await host.finish(game_state, 'whompus')
+    guest_view = await guest
+    await host.close()
+
+    trips_ms = sorted(t * 1000 for t in host.round_trips)
+    return {
+        'turns': turns,
+        'in_sync': (guest_view.player_position, guest_view.whompus_position, guest_view.player_moves)
+                   == (game_state.player_position, game_state.whompus_position, game_state.player_moves),
+        'mean_rtt_ms': statistics.mean(trips_ms),
+        'p50_rtt_ms': trips_ms[len(trips_ms) // 2],
+        'p99_rtt_ms': trips_ms[int(len(trips_ms) * 0.99)],
+        'bytes_per_turn': (host.bytes_sent + host.bytes_received) / turns,
+        'full_state_bytes': len(pickle.dumps([
+            dict(value) if isinstance(value, MappingProxyType) else value
+            for value in game_state.snapshot()
+        ]))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play the Whompus against a remote player")
+    commands = parser.add_subparsers(dest='command', required=True)
+    join = commands.add_parser('join', help="control the Whompus in someone's game")
+    join.add_argument('host')
+    join.add_argument('port', type=int)
+    bench = commands.add_parser('bench', help="measure latency and bytes per turn on loopback")
+    bench.add_argument('--turns', type=int, default=2000)
+    args = parser.parse_args()
+
+    if args.command == 'join':
+        view = asyncio.run(run_guest(args.host, args.port, terminal_whompus))
+        if view.outcome == 'whompus':
+            print("\nYou caught the player!")
+        elif view.outcome == 'trap':
+            print("\nThe player fell into a trap.")
+        else:
+            print("\nThe game ended.")
+    else:
+        report = asyncio.run(loopback_benchmark(args.turns))
+        print(f"Turns:            {report['turns']} (clients in sync: {report['in_sync']})")
+        print(f"Round trip:       mean {report['mean_rtt_ms']:.3f} ms, "
+              f"p50 {report['p50_rtt_ms']:.3f} ms, p99 {report['p99_rtt_ms']:.3f} ms")
+        print(f"Bytes per turn:   {report['bytes_per_turn']:.1f} (full GameState: {report['full_state_bytes']} bytes)")
+
+
+if __name__ == '__main__':
+    main()
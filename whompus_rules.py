@@ -0,0 +1,257 @@
+"""
+Headless rules for WHOMPUS HUNT 2.0
+
+Everything in here works without a canvas so the game rules can be used by
+finalproject.py, the auto-player and the tournament runner alike.
+"""
+from typing import Dict, List, Tuple
+from types import MappingProxyType
+import copy
+import random
+import sys
+
+
+################################################################################################
+################# Movement Directions ######################################
+################################################################################################
+DIRECTIONS = {
+    'UP': (-1, 0),
+    'DOWN': (1, 0),
+    'LEFT': (0, -1),
+    'RIGHT': (0, 1)
+}
+
+# Shared immutable defaults for a fresh GameState
+EMPTY_MAPPING = MappingProxyType({})
+EMPTY_GRID = tuple(tuple(() for _ in range(10)) for _ in range(10))
+################################################################################################
+################ Game State Classes ######################################
+################################################################################################
+class GameState:
+    """Class to manage the game state
+
+    Every field holds an immutable value (ints, tuples, frozensets, read-only
+    mappings), so a snapshot is just the tuple of field references. Changes
+    replace a value instead of mutating it (copy-on-write), which lets search
+    code branch from a state without deep copies.
+    """
+    __slots__ = (
+        'player_position', 'whompus_position', 'trap_doors',
+        'player_moves', 'whompus_moves', 'ai_roles', 'game_over',
+        'player_won', 'current_room_status', 'room_occupants',
+        'last_action', 'action_in_progress'
+    )
+
+    def __init__(self):
+        self.player_position = (9, 0)  # Starting position
+        self.whompus_position = (0, 9)  # Starting position
+        self.trap_doors = frozenset()  # Frozenset of (row, col) positions
+        self.player_moves = 0
+        self.whompus_moves = 0
+        self.ai_roles = EMPTY_MAPPING  # Will store which AI is which role
+        self.game_over = False
+        self.player_won = False
+        self.current_room_status = EMPTY_MAPPING  # Stores status of each room
+        # room_occupants is a 10x10 grid of tuples; all rows start out shared
+        self.room_occupants = EMPTY_GRID
+        self.last_action = None  # Track the last action taken
+        self.action_in_progress = False  # Flag for ongoing actions
+    
+    def increment_moves(self, action_type: str):
+        """Increment player moves and track the action type"""
+        self.player_moves += 1
+        self.last_action = action_type
+        self.action_in_progress = True
+
+    def complete_action(self):
+        """Mark the current action as complete"""
+        self.action_in_progress = False
+
+    ################################################################################################
+    ################# Snapshots for undo and lookahead ######################################
+    ################################################################################################
+    def snapshot(self) -> Tuple:
+        """Return an O(1) snapshot; fields are immutable so no copying is needed"""
+        return tuple(getattr(self, name) for name in GameState.__slots__)
+
+    def restore(self, snapshot: Tuple):
+        """Put the state back to a snapshot taken with snapshot()"""
+        for name, value in zip(GameState.__slots__, snapshot):
+            setattr(self, name, value)
+
+    def copy(self) -> 'GameState':
+        """Return a new state that shares all its data with this one"""
+        branch = GameState.__new__(GameState)
+        branch.restore(self.snapshot())
+        return branch
+
+    def move_occupant(self, occupant_id: str, old_position: Tuple[int, int], new_position: Tuple[int, int]):
+        """Move an occupant between rooms, rebuilding only the rows that changed"""
+        old_row, old_col = old_position
+        new_row, new_col = new_position
+        grid = list(self.room_occupants)
+
+        old_room = grid[old_row][old_col]
+        if occupant_id in old_room:
+            row = list(grid[old_row])
+            row[old_col] = tuple(o for o in old_room if o != occupant_id)
+            grid[old_row] = tuple(row)
+
+        new_room = grid[new_row][new_col]
+        if occupant_id not in new_room:
+            row = list(grid[new_row])
+            row[new_col] = new_room + (occupant_id,)
+            grid[new_row] = tuple(row)
+
+        self.room_occupants = tuple(grid)
+
+    ################################################################################################
+    ################# Trap door locations selected ######################################
+    ################################################################################################
+    def initialize_trap_doors(self, rng=random):
+        """Initialize 10 random trap doors"""
+        trap_doors = set(self.trap_doors)
+        while len(trap_doors) < 10:
+            row = rng.randint(0, 9)
+            col = rng.randint(0, 9)
+            # Don't place traps on player or whompus starting positions
+            if (row, col) not in [(9, 0), (0, 9)]:
+                trap_doors.add((row, col))
+        self.trap_doors = frozenset(trap_doors)
+
+    ################################################################################################
+    ################# Establish naming convention for ais ######################################
+    ################################################################################################
+    def assign_ai_roles(self, rng=random):
+        """Randomly assign roles to AIs"""
+        numbers = rng.sample(range(1, 11), 3)
+        roles = {
+            'ALI': 'villain' if numbers[0] == min(numbers) else 'truth' if numbers[0] == max(numbers) else 'fifty',
+            'AN': 'villain' if numbers[1] == min(numbers) else 'truth' if numbers[1] == max(numbers) else 'fifty',
+            'ALE': 'villain' if numbers[2] == min(numbers) else 'truth' if numbers[2] == max(numbers) else 'fifty'
+        }
+        self.ai_roles = MappingProxyType(roles)
+
+################################################################################################
+################ Game state memory report ######################################
+################################################################################################
+def _deep_sizeof(obj, seen: set) -> int:
+    """Add up sys.getsizeof for obj and everything it holds, counting shared objects once"""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (dict, MappingProxyType)):
+        size += sum(_deep_sizeof(k, seen) + _deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, '__dict__'):
+        size += _deep_sizeof(vars(obj), seen)
+    elif hasattr(obj, '__slots__'):
+        size += sum(_deep_sizeof(getattr(obj, name), seen) for name in obj.__slots__)
+    return size
+
+def state_memory_report(branches: int = 1000) -> Dict[str, float]:
+    """
+    Compare bytes per state for the old dict-backed layout (deep copied for
+    every branch) against the slotted state (branched with copy())
+    """
+    class _LegacyState:
+        pass
+
+    base = GameState()
+    base.initialize_trap_doors()
+    base.assign_ai_roles()
+
+    legacy = _LegacyState()
+    legacy.__dict__.update({name: getattr(base, name) for name in GameState.__slots__})
+    legacy.trap_doors = set(base.trap_doors)
+    legacy.ai_roles = dict(base.ai_roles)
+    legacy.current_room_status = {}
+    legacy.room_occupants = [[[] for _ in range(10)] for _ in range(10)]
+
+    # Keep every branch alive while measuring so ids are not reused
+    legacy_branches = [copy.deepcopy(legacy) for _ in range(branches)]
+    legacy_seen = set()
+    legacy_total = sum(_deep_sizeof(state, legacy_seen) for state in legacy_branches)
+
+    slotted_branches = [base] + [base.copy() for _ in range(branches - 1)]
+    slotted_seen = set()
+    slotted_total = sum(_deep_sizeof(state, slotted_seen) for state in slotted_branches)
+
+    return {
+        'legacy_bytes_per_state': legacy_total / branches,
+        'slotted_bytes_per_state': slotted_total / branches,
+        'saving_per_state': (legacy_total - slotted_total) / branches
+    }
+
+################################################################################################
+############# Whompus Movement and Game State ######################################
+################################################################################################
+def whompus_may_move(player_moves: int) -> bool:
+    """Whether the whompus gets to move after this many player moves"""
+    # Move categories
+    if player_moves < 30:  # Category A
+        return player_moves % 3 == 0
+    elif player_moves < 50:  # Category B
+        return player_moves % 2 == 0
+    # Category C - always move
+    return True
+
+def whompus_move(game_state: GameState, player_position: Tuple[int, int], rng=random) -> Tuple[int, int]:
+    #Determine whompuss next move
+    if not whompus_may_move(game_state.player_moves):
+        return game_state.whompus_position
+    
+    # Get valid moves for whompus
+    valid_moves = get_valid_moves(game_state.whompus_position)
+    if not valid_moves:
+        return game_state.whompus_position
+    
+    # Determine if whompus should chase player
+    chase_chance = 0.25
+    if game_state.player_moves >= 30:
+        chase_chance = 0.5
+    if game_state.player_moves >= 50:
+        chase_chance = 1.0
+    
+    if rng.random() < chase_chance:
+        # Try to move towards player
+        best_move = None
+        min_distance = float('inf')
+        for direction in valid_moves:
+            drow, dcol = DIRECTIONS[direction]
+            new_row = game_state.whompus_position[0] + drow
+            new_col = game_state.whompus_position[1] + dcol
+            distance = abs(new_row - player_position[0]) + abs(new_col - player_position[1])
+            if distance < min_distance:
+                min_distance = distance
+                best_move = (new_row, new_col)
+        return best_move if best_move else game_state.whompus_position
+    
+    # Random move
+    direction = rng.choice(valid_moves)
+    drow, dcol = DIRECTIONS[direction]
+    return (game_state.whompus_position[0] + drow, 
+            game_state.whompus_position[1] + dcol)
+################################################################################################
+############# Checking the rooms next to player ######################################
+################################################################################################
+def check_room_status(position: Tuple[int, int], game_state: GameState) -> str:
+
+    row, col = position
+    if position in game_state.trap_doors:
+        return 'trap'
+    elif position == game_state.whompus_position:
+        return 'whompus'
+    else:
+        return 'empty'
+################################################################################################
+########### Validation of moves ######################################
+################################################################################################
+def get_valid_moves(position: Tuple[int, int]) -> List[str]:
+    row, col = position
+    return [
+        direction for direction, (drow, dcol) in DIRECTIONS.items()
+        if 0 <= row + drow < 10 and 0 <= col + dcol < 10
+    ]